@@ -0,0 +1,231 @@
+# backend/archiver.py
+"""
+Hot/cold archiving for the Main sheet.
+
+"Done" rows older than ARCHIVE_AFTER_DAYS are copied to the archive tab in one
+append_rows call, then removed from Main with a single batchUpdate of
+deleteDimension requests, so polls and appends keep working on a small sheet.
+
+Deleting rows moves every row below them up, and pending rows are addressed
+by row number (checkpoints, trigger hints, write-backs). So the archiver only
+runs while no row is "Processing" (nothing is selected otherwise; the report
+names the blocking rows), and the status column is re-read right before the
+delete, aborting if a new intake row appeared in between. The daemon
+additionally holds its dispatch lock and waits until nothing is queued,
+hinted or in flight.
+
+The copy is idempotent: rows whose Timestamp + Meeting Audio key is already
+in the archive tab are not appended again, so a run that aborted after the
+copy is finished by the next one without duplicates.
+
+Runs from the daemon when idle (every ARCHIVE_INTERVAL_SECONDS) or by hand:
+    python -m backend.archiver [--days N] [--max-rows N] [--dry-run]
+"""
+import argparse
+import sys
+import time
+from typing import List, Optional, Set, Tuple
+
+import gspread
+
+from config.config import (
+    client,
+    sheet,
+    GOOGLE_SHEET_ID,
+    ARCHIVE_AFTER_DAYS,
+    ARCHIVE_SHEET_ID,
+    ARCHIVE_SHEET_TAB,
+    ARCHIVE_MAX_ROWS,
+)
+from backend.telemetry import parse_intake_timestamp, span
+
+
+def _archive_worksheet(headers: List[str]) -> gspread.Worksheet:
+    book = client.open_by_key(ARCHIVE_SHEET_ID or GOOGLE_SHEET_ID)
+    try:
+        return book.worksheet(ARCHIVE_SHEET_TAB)
+    except gspread.WorksheetNotFound:
+        return book.add_worksheet(title=ARCHIVE_SHEET_TAB, rows=1000, cols=max(len(headers), 1))
+
+
+def _row_ranges(row_numbers: List[int]) -> List[Tuple[int, int]]:
+    """Contiguous 1-based (first, last) runs, bottom-most first for deletion."""
+    runs: List[Tuple[int, int]] = []
+    for n in sorted(row_numbers):
+        if runs and n == runs[-1][1] + 1:
+            runs[-1] = (runs[-1][0], n)
+        else:
+            runs.append((n, n))
+    return list(reversed(runs))
+
+
+_KEY_COLUMNS = ("timestamp", "meeting audio")
+
+
+def _row_key(headers: List[str], row: List[str]) -> Tuple[str, ...]:
+    """(Timestamp, Meeting Audio) identity of a Main row, as the archive tab stores it."""
+    keys = [h.strip().lower() for h in headers]
+    out = []
+    for name in _KEY_COLUMNS:
+        i = keys.index(name) if name in keys else len(row)
+        out.append(str(row[i]).strip() if i < len(row) else "")
+    return tuple(out)
+
+
+def _archived_keys(archive_ws: gspread.Worksheet, archive_headers: List[str]) -> Set[Tuple[str, ...]]:
+    """Keys of rows already in the archive tab (two column reads)."""
+    keys = [h.strip().lower() for h in archive_headers]
+    if "timestamp" not in keys:
+        return set()
+    columns = [archive_ws.col_values(keys.index(name) + 1) if name in keys else [] for name in _KEY_COLUMNS]
+    height = max(len(c) for c in columns)
+    rows = [[c[i] if i < len(c) else "" for c in columns] for i in range(1, height)]
+    return {_row_key(list(_KEY_COLUMNS), r) for r in rows}
+
+
+def processing_rows(values: List[List[str]]) -> List[int]:
+    """1-based sheet row numbers whose Status is Processing."""
+    if not values:
+        return []
+    headers = [h.strip().lower() for h in values[0]]
+    if "status" not in headers:
+        return []
+    status_i = headers.index("status")
+    return [n for n, row in enumerate(values[1:], start=2)
+            if status_i < len(row) and row[status_i].strip().lower() == "processing"]
+
+
+def select_archivable(values: List[List[str]], older_than_days: float, now: Optional[float] = None,
+                      max_rows: int = 0) -> List[int]:
+    """
+    1-based sheet row numbers of Done rows older than `older_than_days`;
+    nothing while any row is Processing (deleting would shift it).
+    """
+    if not values:
+        return []
+    headers = [h.strip().lower() for h in values[0]]
+    if "status" not in headers or "timestamp" not in headers:
+        return []
+    if processing_rows(values):
+        return []
+    status_i, ts_i = headers.index("status"), headers.index("timestamp")
+    cutoff = (now or time.time()) - older_than_days * 86400
+
+    picked: List[int] = []
+    for row_number, row in enumerate(values[1:], start=2):
+        status = (row[status_i] if status_i < len(row) else "").strip().lower()
+        if status != "done":
+            continue
+        submitted = parse_intake_timestamp(row[ts_i] if ts_i < len(row) else "")
+        if submitted is not None and submitted <= cutoff:
+            picked.append(row_number)
+            if max_rows and len(picked) >= max_rows:
+                break
+    return picked
+
+
+def _abort(reason: str, copied: int) -> None:
+    raise RuntimeError(
+        f"Main sheet changed during archiving ({reason}); {copied} row(s) were "
+        f"copied to '{ARCHIVE_SHEET_TAB}' but not deleted from Main; the next run "
+        f"deletes them without copying them again."
+    )
+
+
+def archive_done_rows(older_than_days: Optional[float] = None, max_rows: Optional[int] = None,
+                      dry_run: bool = False) -> dict:
+    """Move old Done rows from Main to the archive tab; returns a size report."""
+    days = ARCHIVE_AFTER_DAYS if older_than_days is None else older_than_days
+    limit = ARCHIVE_MAX_ROWS if max_rows is None else max_rows
+    started = time.time()
+
+    with span("archive") as record:
+        # FORMULA keeps the HYPERLINK(...) summary cells intact in the copy;
+        # FORMATTED_STRING keeps dates as the text intake wrote (not serials)
+        values = sheet.get_all_values(
+            value_render_option="FORMULA", date_time_render_option="FORMATTED_STRING"
+        )
+        rows_before = max(len(values) - 1, 0)
+        cols = len(values[0]) if values else 0
+        picked = select_archivable(values, days, max_rows=limit)
+        pending = processing_rows(values)
+        report = {
+            "archived": len(picked),
+            "pending": len(pending),
+            "pending_rows": pending[:10],
+            "rows_before": rows_before,
+            "rows_after": rows_before - len(picked),
+            "cells_freed": len(picked) * cols,
+            "dry_run": dry_run,
+        }
+        record.update(archived=len(picked), rows_before=rows_before)
+        if not picked or dry_run:
+            report["seconds"] = round(time.time() - started, 2)
+            return report
+
+        # 1) copy (one call); a failure here leaves Main untouched. Rows an
+        #    aborted earlier run already copied are not appended again.
+        headers = values[0]
+        archive_ws = _archive_worksheet(headers)
+        archive_headers = archive_ws.row_values(1)
+        archived = _archived_keys(archive_ws, archive_headers) if archive_headers else set()
+        batch = [values[n - 1] for n in picked if _row_key(headers, values[n - 1]) not in archived]
+        report["already_archived"] = len(picked) - len(batch)
+        if not archive_headers:
+            batch = [headers] + batch
+        if batch:
+            archive_ws.append_rows(batch, value_input_option="USER_ENTERED")
+
+        # 2) make sure the rows didn't move and nothing became pending since
+        #    the read (two cheap one-column reads)
+        keys = [h.strip().lower() for h in headers]
+        ts_i, status_i = keys.index("timestamp"), keys.index("status")
+        current = sheet.col_values(ts_i + 1)
+        statuses = sheet.col_values(status_i + 1)
+        for n in range(2, len(statuses) + 1):
+            if statuses[n - 1].strip().lower() == "processing":
+                _abort(f"row {n} is now Processing", len(picked))
+        for n in picked:
+            expected = values[n - 1][ts_i] if ts_i < len(values[n - 1]) else ""
+            if n > len(current) or current[n - 1] != expected:
+                _abort(f"row {n} moved", len(picked))
+
+        # 3) delete (one batchUpdate, bottom-up so indices stay valid)
+        requests = [
+            {"deleteDimension": {"range": {
+                "sheetId": sheet.id, "dimension": "ROWS",
+                "startIndex": first - 1, "endIndex": last,
+            }}}
+            for first, last in _row_ranges(picked)
+        ]
+        sheet.spreadsheet.batch_update({"requests": requests})
+
+    report["seconds"] = round(time.time() - started, 2)
+    return report
+
+
+def format_report(report: dict) -> str:
+    before, after = report["rows_before"], report["rows_after"]
+    shrink = (1 - after / before) * 100 if before else 0.0
+    if report.get("pending"):
+        blocking = ", ".join(str(n) for n in report.get("pending_rows", []))
+        more = "…" if report["pending"] > len(report.get("pending_rows", [])) else ""
+        return (f"🗄️ Archiving skipped: {report['pending']} row(s) still Processing "
+                f"(rows {blocking}{more}; Main {before} rows)")
+    verb = "Would archive" if report.get("dry_run") else "Archived"
+    reused = f", {report['already_archived']} already in the archive" if report.get("already_archived") else ""
+    return (f"🗄️ {verb} {report['archived']} Done row(s){reused}: Main {before} → {after} rows "
+            f"(-{shrink:.0f}%, {report['cells_freed']} cells freed) in {report['seconds']}s")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Move old Done rows from Main to the archive tab.")
+    parser.add_argument("--days", type=float, default=None, help="minimum age (default ARCHIVE_AFTER_DAYS)")
+    parser.add_argument("--max-rows", type=int, default=None, help="cap per run (0 = no cap)")
+    parser.add_argument("--dry-run", action="store_true")
+    args = parser.parse_args()
+    try:
+        print(format_report(archive_done_rows(args.days, args.max_rows, args.dry_run)))
+    except Exception as e:
+        print(f"❌ Archiving failed: {e}")
+        sys.exit(1)
@@ -1,60 +1,73 @@
 from typing import Dict, Any
-from datetime import date
-from docx import Document
 import io
 
+from backend.docx_render import render_block, emit_variants, add_title, add_bullets
 
-def generate_docx(summary_data: Dict[str, Any], company_name: str, meeting_date, mode: str = "full") -> io.BytesIO:
-    doc = Document()
+ACTION_SECTION_TITLES = {
+    "decision_made": "Key Decisions Made",
+    "key_services_to_promote": "Key Services to Promote",
+    "target_geography": "Target Geography",
+    "budget_and_timeline": "Budget and Timeline",
+    "lead_management_strategy": "Lead Management Strategy",
+    "next_steps_and_ownership": "Next Steps and Ownership",
+}
 
-    if isinstance(meeting_date, date):
-        meeting_date = meeting_date.strftime("%d-%m-%Y")
+MODES = ("full", "mom", "action")
 
-    # Title
-    if mode == "full":
-        doc.add_heading(f"{company_name} Meeting Notes", level=0)
-        p = doc.add_paragraph(f"Date: {meeting_date}")
-        p.alignment = 2
-    elif mode == "mom":
-        doc.add_heading(f"{company_name} - MoM", level=0)
-    elif mode == "action":
-        doc.add_heading(f"{company_name} - Action Points", level=0)
-
-    # 1) MoM
-    if mode in ["full", "mom"]:
+
+def _mom_section(summary_data: Dict[str, Any]):
+    def build(doc):
         doc.add_heading("1. Minutes of the Meeting (MoM)", level=1)
-        for point in summary_data.get("mom", []):
-            if point and str(point).strip():
-                doc.add_paragraph(str(point).strip(), style="List Bullet")
+        add_bullets(doc, summary_data.get("mom", []))
+    return render_block(build)
 
-    # 2) To-Do (only in full)
-    if mode == "full":
+
+def _todo_section(summary_data: Dict[str, Any]):
+    def build(doc):
         doc.add_heading("2. To-Do List", level=1)
-        for task in summary_data.get("todo_list", []):
-            if task and str(task).strip():
-                doc.add_paragraph(str(task).strip(), style="List Bullet")
+        add_bullets(doc, summary_data.get("todo_list", []))
+    return render_block(build)
+
 
-    # 3) Action Points
-    if mode in ["full", "action"]:
+def _action_section(summary_data: Dict[str, Any]):
+    def build(doc):
         doc.add_heading("3. Action Points / Action Plan", level=1)
-        section_titles = {
-            "decision_made": "Key Decisions Made",
-            "key_services_to_promote": "Key Services to Promote",
-            "target_geography": "Target Geography",
-            "budget_and_timeline": "Budget and Timeline",
-            "lead_management_strategy": "Lead Management Strategy",
-            "next_steps_and_ownership": "Next Steps and Ownership",
-        }
         action_plan = summary_data.get("action_plan", {}) or {}
-        for key, title in section_titles.items():
+        for key, title in ACTION_SECTION_TITLES.items():
             items = action_plan.get(key, [])
             if items:
                 doc.add_heading(title, level=2)
-                for item in items:
-                    if item and str(item).strip():
-                        doc.add_paragraph(str(item).strip(), style="List Bullet")
-
-    out = io.BytesIO()
-    doc.save(out)
-    out.seek(0)
-    return out
\ No newline at end of file
+                add_bullets(doc, items)
+    return render_block(build)
+
+
+def _title(company_name: str, meeting_date, mode: str):
+    if mode == "full":
+        return render_block(lambda doc: add_title(doc, f"{company_name} Meeting Notes", meeting_date))
+    if mode == "mom":
+        return render_block(lambda doc: add_title(doc, f"{company_name} - MoM"))
+    return render_block(lambda doc: add_title(doc, f"{company_name} - Action Points"))
+
+
+def generate_docx_variants(
+    summary_data: Dict[str, Any], company_name: str, meeting_date, modes=MODES
+) -> Dict[str, io.BytesIO]:
+    """
+    Render the "full", "mom" and "action" documents in one pass: each section
+    is built once and shared by every variant that includes it.
+    """
+    mom = _mom_section(summary_data) if {"full", "mom"} & set(modes) else []
+    todo = _todo_section(summary_data) if "full" in modes else []
+    action = _action_section(summary_data) if {"full", "action"} & set(modes) else []
+    layout = {
+        "full": [mom, todo, action],
+        "mom": [mom],
+        "action": [action],
+    }
+    return emit_variants({
+        mode: [_title(company_name, meeting_date, mode)] + layout[mode] for mode in modes
+    })
+
+
+def generate_docx(summary_data: Dict[str, Any], company_name: str, meeting_date, mode: str = "full") -> io.BytesIO:
+    return generate_docx_variants(summary_data, company_name, meeting_date, modes=(mode,))[mode]
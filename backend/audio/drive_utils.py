@@ -4,18 +4,24 @@ from typing import Optional
 
 from google.oauth2.service_account import Credentials
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaIoBaseDownload, MediaIoBaseUpload
+from googleapiclient.http import MediaIoBaseDownload
 
 from config.config import GOOGLE_SA_FILE, SCOPES
+from backend.upload_engine import upload_stream
 
+DOCX_MIMETYPE = "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
 
-def get_drive_service():
+
+def get_credentials() -> Credentials:
     if not GOOGLE_SA_FILE:
         raise ValueError("❌ GOOGLE_SA_FILE not set in .env")
-    creds = Credentials.from_service_account_file(
+    return Credentials.from_service_account_file(
         GOOGLE_SA_FILE, scopes=SCOPES
     )
-    return build("drive", "v3", credentials=creds)
+
+
+def get_drive_service():
+    return build("drive", "v3", credentials=get_credentials())
 
 
 def download_audio_from_drive(file_id: str) -> str:
@@ -35,33 +41,16 @@ def download_audio_from_drive(file_id: str) -> str:
 
 
 def upload_file_to_drive_in_memory(file_data: io.BytesIO | bytes, folder_id: str, final_name: str = "Summary.docx") -> str:
-    service = get_drive_service()
     file_metadata = {"name": final_name, "parents": [folder_id]}
 
     if isinstance(file_data, bytes):
         file_stream = io.BytesIO(file_data)
     elif isinstance(file_data, io.BytesIO):
         file_stream = file_data
-        file_stream.seek(0)
     else:
         raise TypeError("❌ file_data must be bytes or BytesIO")
 
-    media = MediaIoBaseUpload(
-        file_stream,
-        mimetype="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        resumable=True,
-    )
-
-    file = (
-        service.files()
-        .create(
-            body=file_metadata,
-            media_body=media,
-            fields="id",
-            supportsAllDrives=True,
-        )
-        .execute()
-    )
+    file = upload_stream(file_stream, file_metadata, DOCX_MIMETYPE, credentials=get_credentials())
 
     print(f"📤 File uploaded: {file.get('id')}")
     return file.get("id")
@@ -0,0 +1,253 @@
+# backend/audio/engines.py
+"""
+Transcription engines behind one interface, each with its own concurrency cap.
+
+- "openai": the Whisper API (WHISPER_MODEL) — the default.
+- "local":  faster-whisper on this machine's CPU (optional dependency).
+- "fake":   deterministic text derived from the file bytes, for tests/benchmarks.
+
+`transcribe_chunk()` routes each chunk: short audio can prefer the local
+engine (TRANSCRIBE_LOCAL_MAX_SECONDS), and when the primary engine is
+saturated (all slots busy and TRANSCRIBE_OVERFLOW_QUEUE callers waiting) or
+cooling down after a 429, the overflow engine takes the chunk instead.
+"""
+import abc
+import hashlib
+import os
+import threading
+import time
+import wave
+from typing import Dict, List, Optional
+
+import openai
+
+from config.config import (
+    OPENAI_KEY,
+    WHISPER_MODEL,
+    TRANSCRIBE_ENGINE,
+    TRANSCRIBE_OVERFLOW_ENGINE,
+    TRANSCRIBE_CONCURRENCY,
+    TRANSCRIBE_OVERFLOW_QUEUE,
+    TRANSCRIBE_LOCAL_MAX_SECONDS,
+    TRANSCRIBE_COOLDOWN_SECONDS,
+    LOCAL_WHISPER_MODEL,
+    LOCAL_WHISPER_COMPUTE_TYPE,
+)
+from backend.ledger import record as record_usage
+
+openai.api_key = OPENAI_KEY
+
+COMPRESSED_BYTES_PER_SECOND = 16 * 1024  # ~128 kbps for m4a/mp3 estimates
+
+
+def estimate_audio_seconds(path: str) -> float:
+    """Exact for WAV, bitrate-based estimate for compressed formats."""
+    if path.lower().endswith(".wav"):
+        try:
+            with wave.open(path, "rb") as w:
+                return w.getnframes() / float(w.getframerate() or 1)
+        except (wave.Error, EOFError):
+            pass
+    return os.path.getsize(path) / COMPRESSED_BYTES_PER_SECOND
+
+
+class TranscriptionEngine(abc.ABC):
+    name = "base"
+
+    @property
+    def model(self) -> str:
+        return self.name
+
+    def __init__(self, max_concurrency: int = 1):
+        self.max_concurrency = max(1, int(max_concurrency))
+        self._slots = threading.BoundedSemaphore(self.max_concurrency)
+        self._lock = threading.Lock()
+        self.active = 0
+        self.waiting = 0
+        self.cooldown_until = 0.0
+
+    # --- engine-specific ---
+    def available(self) -> bool:
+        return True
+
+    @abc.abstractmethod
+    def _transcribe(self, path: str) -> str:
+        """Engine-specific call; raise openai.error.RateLimitError on a 429."""
+
+    # --- shared ---
+    def cooling_down(self) -> bool:
+        return time.monotonic() < self.cooldown_until
+
+    def saturated(self, queue_limit: int = 0) -> bool:
+        with self._lock:
+            full = self.active >= self.max_concurrency and self.waiting >= queue_limit
+        return full or self.cooling_down()
+
+    def cool_down(self, seconds: float) -> None:
+        self.cooldown_until = max(self.cooldown_until, time.monotonic() + seconds)
+
+    def transcribe(self, path: str) -> str:
+        with self._lock:
+            self.waiting += 1
+        self._slots.acquire()
+        with self._lock:
+            self.waiting -= 1
+            self.active += 1
+        started = time.monotonic()
+        ok = False
+        try:
+            text = self._transcribe(path)
+            ok = True
+            return text
+        except openai.error.RateLimitError:
+            self.cool_down(TRANSCRIBE_COOLDOWN_SECONDS)
+            raise
+        finally:
+            with self._lock:
+                self.active -= 1
+            self._slots.release()
+            record_usage("transcribe", self.model, audio_seconds=estimate_audio_seconds(path),
+                         latency_s=time.monotonic() - started, ok=ok)
+
+
+class OpenAIEngine(TranscriptionEngine):
+    name = "openai"
+
+    @property
+    def model(self) -> str:
+        return WHISPER_MODEL
+
+    def _transcribe(self, path: str) -> str:
+        with open(path, "rb") as audio_file:
+            transcript = openai.Audio.transcribe(model=WHISPER_MODEL, file=audio_file)
+        return transcript["text"].strip()
+
+
+class LocalWhisperEngine(TranscriptionEngine):
+    """faster-whisper on CPU; the model loads once per process on first use."""
+
+    name = "local"
+    _model = None
+    _model_lock = threading.Lock()
+    _installed: Optional[bool] = None
+
+    @property
+    def model(self) -> str:
+        return f"local:{LOCAL_WHISPER_MODEL}"
+
+    def available(self) -> bool:
+        if LocalWhisperEngine._installed is None:
+            try:
+                import faster_whisper  # noqa: F401
+                LocalWhisperEngine._installed = True
+            except ImportError:
+                LocalWhisperEngine._installed = False
+        return LocalWhisperEngine._installed
+
+    def _get_model(self):
+        with self._model_lock:
+            if LocalWhisperEngine._model is None:
+                from faster_whisper import WhisperModel
+
+                print(f"🖥️ Loading local Whisper model '{LOCAL_WHISPER_MODEL}'...")
+                LocalWhisperEngine._model = WhisperModel(
+                    LOCAL_WHISPER_MODEL, device="cpu", compute_type=LOCAL_WHISPER_COMPUTE_TYPE
+                )
+            return LocalWhisperEngine._model
+
+    def _transcribe(self, path: str) -> str:
+        segments, _info = self._get_model().transcribe(path)
+        return " ".join(seg.text.strip() for seg in segments).strip()
+
+
+class FakeEngine(TranscriptionEngine):
+    """
+    Same bytes in, same text out — no network, no model. `rate_limited_calls`
+    makes the first N calls raise a 429, to exercise overflow routing.
+    """
+
+    name = "fake"
+
+    def __init__(self, max_concurrency: int = 1, delay_s: float = 0.0, name: str = "", rate_limited_calls: int = 0):
+        super().__init__(max_concurrency)
+        if name:
+            self.name = name
+        self.delay_s = delay_s
+        self.rate_limited_calls = rate_limited_calls
+        self.calls = 0
+        self.peak_active = 0
+
+    def _transcribe(self, path: str) -> str:
+        with open(path, "rb") as f:
+            data = f.read()
+        with self._lock:
+            self.calls += 1
+            self.peak_active = max(self.peak_active, self.active)
+            limited = self.calls <= self.rate_limited_calls
+        if limited:
+            raise openai.error.RateLimitError(f"fake 429 from '{self.name}'")
+        if self.delay_s:
+            time.sleep(self.delay_s)
+        digest = hashlib.sha256(data).hexdigest()[:12]
+        words = max(1, len(data) // 2048)
+        return f"[{digest}] " + " ".join(f"word{i % 97}" for i in range(words))
+
+
+ENGINE_TYPES = {
+    "openai": OpenAIEngine,
+    "local": LocalWhisperEngine,
+    "fake": FakeEngine,
+}
+
+_engines: Dict[str, TranscriptionEngine] = {}
+_engines_lock = threading.Lock()
+
+
+def get_engine(name: str) -> Optional[TranscriptionEngine]:
+    """Process-wide engine instance, or None if unknown / not installed."""
+    name = (name or "").strip().lower()
+    with _engines_lock:
+        if name not in _engines:
+            if name not in ENGINE_TYPES:
+                return None
+            _engines[name] = ENGINE_TYPES[name](TRANSCRIBE_CONCURRENCY.get(name, 1))
+        engine = _engines[name]
+    return engine if engine.available() else None
+
+
+def register_engine(engine: TranscriptionEngine) -> None:
+    """Install a pre-built engine (e.g. a FakeEngine in benchmarks) under its name."""
+    with _engines_lock:
+        _engines[engine.name.lower()] = engine
+
+
+def _candidates(duration_s: float) -> List[TranscriptionEngine]:
+    primary = get_engine(TRANSCRIBE_ENGINE)
+    overflow = get_engine(TRANSCRIBE_OVERFLOW_ENGINE)
+    if primary is None:
+        raise RuntimeError(f"Transcription engine '{TRANSCRIBE_ENGINE}' is not available")
+    if overflow is None or overflow is primary:
+        return [primary]
+    if overflow.name == "local" and duration_s <= TRANSCRIBE_LOCAL_MAX_SECONDS:
+        return [overflow, primary]
+    if primary.saturated(TRANSCRIBE_OVERFLOW_QUEUE) and not overflow.saturated():
+        return [overflow, primary]
+    return [primary, overflow]
+
+
+def transcribe_chunk(path: str) -> str:
+    """
+    Transcribe one chunk on the best engine; a rate-limited engine hands the
+    chunk to the next candidate (and stays out of the rotation while cooling down).
+    """
+    engines = _candidates(estimate_audio_seconds(path))
+    for i, engine in enumerate(engines):
+        try:
+            if i == 0 and engine.name != TRANSCRIBE_ENGINE:
+                print(f"↪️ Routing chunk to '{engine.name}' transcription engine")
+            return engine.transcribe(path)
+        except openai.error.RateLimitError as e:
+            if i == len(engines) - 1:
+                raise
+            print(f"⚠️ '{engine.name}' engine rate-limited ({e}); overflowing to '{engines[i + 1].name}'")
+    raise RuntimeError("no transcription engine available")
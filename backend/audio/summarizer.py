@@ -1,11 +1,18 @@
+import json
 import openai
-from config.config import OPENAI_KEY, OPENAI_MODEL
+from config.config import OPENAI_KEY, OPENAI_STREAMING
 from audio.utils import extract_json_block
+from backend.llm_stream import stream_json_completion
+from backend.model_router import run_routed
+from backend.ledger import chat_usage
 
 openai.api_key = OPENAI_KEY
 
+SUMMARY_KEYS = ("mom", "todo_list", "action_plan")
 
-def generate_summary(transcript_text: str):
+
+def generate_summary(transcript_text: str, on_section=None):
+    """`on_section(key, value)` fires as each top-level section finishes streaming."""
     system_prompt = """
 You are an expert business analyst. You will be given a raw transcript from a client-agency meeting.
 
@@ -34,12 +41,31 @@ Schema:
   }
 }
 """
-    chat_response = openai.ChatCompletion.create(
-        model=OPENAI_MODEL,
-        messages=[
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": transcript_text},
-        ],
-    )
-
-    return extract_json_block(chat_response.choices[0].message.content)
\ No newline at end of file
+    messages = [
+        {"role": "system", "content": system_prompt},
+        {"role": "user", "content": transcript_text},
+    ]
+
+    def _call(model, timeout):
+        with chat_usage("meeting_summary", model, messages) as usage:
+            if OPENAI_STREAMING:
+                result = stream_json_completion(
+                    model,
+                    messages,
+                    expected_keys=SUMMARY_KEYS,
+                    on_member=on_section,
+                    deadline_s=timeout,
+                    request_timeout=timeout,
+                )
+                usage["completion_text"] = json.dumps(result)
+                return result
+
+            chat_response = openai.ChatCompletion.create(
+                model=model,
+                messages=messages,
+                request_timeout=timeout,
+            )
+            usage.update(chat_response.get("usage") or {})
+            return extract_json_block(chat_response.choices[0].message.content)
+
+    return run_routed("meeting", transcript_text, _call)
\ No newline at end of file
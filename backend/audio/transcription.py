@@ -1,44 +1,31 @@
 import os
-import tempfile
-from pydub import AudioSegment
-import openai
-from config.config import OPENAI_KEY, WHISPER_MODEL
-
-openai.api_key = OPENAI_KEY
+from backend.cpu_pool import run_cpu
+from backend.cpu_tasks import split_audio
+from backend.audio.engines import transcribe_chunk
 
 MAX_FILE_MB = 25
 CHUNK_LENGTH_MS = 15 * 60 * 1000 
 
 
-def split_audio_if_needed(file_path):
+def split_audio_if_needed(file_path, work_dir: str = ""):
     file_size_mb = os.path.getsize(file_path) / (1024 * 1024)
     if file_size_mb <= MAX_FILE_MB:
         return [file_path]  
 
     print(f"⚠️ Audio is {file_size_mb:.2f} MB — splitting into 15 min chunks...")
-    audio = AudioSegment.from_file(file_path)
-    chunks = []
-    for i in range(0, len(audio), CHUNK_LENGTH_MS):
-        chunk = audio[i : i + CHUNK_LENGTH_MS]
-        tmp_chunk_path = tempfile.NamedTemporaryFile(suffix=".mp3", delete=False).name
-        chunk.export(tmp_chunk_path, format="mp3")
-        chunks.append(tmp_chunk_path)
-    return chunks
-
-
-def transcribe_audio(file_path):
-    all_chunks = split_audio_if_needed(file_path)
+    return run_cpu(split_audio, file_path, CHUNK_LENGTH_MS, work_dir)
+
+
+def transcribe_audio(file_path, work_dir: str = ""):
+    """`work_dir` receives the MP3 chunks of oversized files (caller cleans it up)."""
+    all_chunks = split_audio_if_needed(file_path, work_dir)
     full_transcript = ""
 
     for idx, chunk_path in enumerate(all_chunks, start=1):
         print(f"🎙️ Transcribing chunk {idx}/{len(all_chunks)}...")
-        with open(chunk_path, "rb") as audio_file:
-            try:
-                transcript = openai.Audio.transcribe(
-                    model=WHISPER_MODEL, file=audio_file
-                )
-                full_transcript += transcript["text"].strip() + "\n\n"
-            except Exception as e:
-                raise RuntimeError(f"❌ Whisper API failed for chunk {idx}: {e}")
+        try:
+            full_transcript += transcribe_chunk(chunk_path) + "\n\n"
+        except Exception as e:
+            raise RuntimeError(f"❌ Whisper API failed for chunk {idx}: {e}")
 
     return full_transcript.strip()
\ No newline at end of file
@@ -0,0 +1,89 @@
+# backend/checkpoints.py
+"""
+Per-row stage checkpoints.
+
+A checkpoint is keyed by the row number plus its input links, so editing a
+row's audio/website cell starts fresh. Each finished stage stores its
+artifact (transcript, summary JSON, uploaded doc URL, ...) in one JSON file
+under CHECKPOINT_DIR; a retried row resumes at the first unfinished stage.
+The file is removed once the row is written back as Done.
+"""
+import hashlib
+import json
+import os
+import threading
+from typing import Any, List
+
+from config.config import CHECKPOINT_DIR, GOOGLE_SHEET_ID
+
+_MISSING = object()
+
+
+def checkpoint_key(row_idx: int, *inputs: str) -> str:
+    raw = "|".join([GOOGLE_SHEET_ID, str(row_idx)] + [str(x or "").strip() for x in inputs])
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()[:20]
+
+
+def deterministic_task_ids(key: str, todos: List[str]) -> List[str]:
+    """Stable To-Do task IDs: a resumed row re-derives the same IDs."""
+    return [
+        hashlib.sha1(f"{key}|{i}|{str(todo).strip()}".encode("utf-8")).hexdigest()[:8]
+        for i, todo in enumerate(todos)
+    ]
+
+
+class RowCheckpoint:
+    def __init__(self, key: str, directory: str = CHECKPOINT_DIR):
+        self.key = key
+        self._path = os.path.join(directory, f"{key}.json") if directory else ""
+        self._lock = threading.Lock()
+        self._data: dict = {}
+        if self._path and os.path.exists(self._path):
+            try:
+                with open(self._path, "r", encoding="utf-8") as f:
+                    self._data = json.load(f)
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"⚠️ Ignoring unreadable checkpoint {self._path}: {e}")
+                self._data = {}
+
+    def stages(self) -> List[str]:
+        with self._lock:
+            return list(self._data)
+
+    def done(self, stage: str) -> bool:
+        with self._lock:
+            return stage in self._data
+
+    def get(self, stage: str, default: Any = None) -> Any:
+        with self._lock:
+            return self._data.get(stage, default)
+
+    def save(self, stage: str, value: Any = True) -> Any:
+        with self._lock:
+            self._data[stage] = value
+            self._write()
+        return value
+
+    def stage(self, stage: str, fn, *args, **kwargs) -> Any:
+        """Return the stored artifact for `stage`, or run `fn` and store it."""
+        value = self.get(stage, _MISSING)
+        if value is not _MISSING:
+            return value
+        return self.save(stage, fn(*args, **kwargs))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data = {}
+            if self._path and os.path.exists(self._path):
+                os.remove(self._path)
+
+    def _write(self) -> None:
+        if not self._path:
+            return
+        os.makedirs(os.path.dirname(self._path), exist_ok=True)
+        tmp = self._path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._data, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self._path)
@@ -0,0 +1,91 @@
+# backend/cpu_pool.py
+"""
+Process pool for CPU-bound stages (pydub decode/export and python-docx
+rendering), so concurrent rows don't serialize on the GIL.
+
+Workers are forked and warmed by `warm_up()`; call it early (before worker
+threads start) so every process is forked from a quiet parent. If a worker
+dies later, the replacement pool uses forkserver (spawn where unavailable):
+by then the parent runs threads, and a forked child could inherit a held
+lock (the entry script is re-imported there, so keep its __main__ guard).
+Tasks live in backend/cpu_tasks.py and exchange bytes / file paths only.
+CPU_POOL_WORKERS=0 runs everything inline.
+"""
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Optional
+
+from config.config import CPU_POOL_WORKERS, CPU_POOL_START_METHOD
+from backend import cpu_tasks
+
+_pool: Optional[ProcessPoolExecutor] = None
+_rebuilt = False  # after the first BrokenProcessPool, never fork again
+_lock = threading.Lock()
+
+
+def _start_method() -> str:
+    if not _rebuilt:
+        return CPU_POOL_START_METHOD
+    return "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+
+
+def _get_pool() -> Optional[ProcessPoolExecutor]:
+    global _pool
+    if CPU_POOL_WORKERS <= 0:
+        return None
+    with _lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=CPU_POOL_WORKERS,
+                mp_context=multiprocessing.get_context(_start_method()),
+                initializer=cpu_tasks.warm_up,
+            )
+        return _pool
+
+
+def _reset_pool(broken: ProcessPoolExecutor) -> None:
+    global _pool, _rebuilt
+    with _lock:
+        if _pool is broken:
+            _pool = None
+            _rebuilt = True
+    broken.shutdown(wait=False, cancel_futures=True)
+
+
+def warm_up() -> None:
+    """Fork and initialise all workers now instead of on the first task."""
+    pool = _get_pool()
+    if pool is None:
+        return
+    pids = set(pool.map(_pid, range(CPU_POOL_WORKERS * 2)))
+    print(f"🔥 CPU pool ready: {len(pids)} worker process(es)")
+
+
+def _pid(_: int) -> int:
+    import os
+
+    return os.getpid()
+
+
+def run_cpu(fn: Callable, *args, **kwargs) -> Any:
+    """Run `fn` in the pool and wait for it (inline when the pool is off)."""
+    pool = _get_pool()
+    if pool is None:
+        return fn(*args, **kwargs)
+    try:
+        return pool.submit(fn, *args, **kwargs).result()
+    except BrokenProcessPool:
+        # a worker died (e.g. OOM on a huge file): rebuild once, then retry
+        _reset_pool(pool)
+        pool = _get_pool()
+        return pool.submit(fn, *args, **kwargs).result()
+
+
+def shutdown() -> None:
+    global _pool
+    with _lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=True)
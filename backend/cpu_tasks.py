@@ -0,0 +1,49 @@
+# backend/cpu_tasks.py
+"""
+CPU-bound work that runs inside the process pool (backend/cpu_pool.py).
+
+Everything here must be a picklable top-level function that takes and
+returns plain data (bytes, str, file paths, dicts) and must not import
+config.config — pool workers never open Google/OpenAI clients.
+"""
+import os
+import tempfile
+from typing import Any, Dict, List, Sequence
+
+
+def warm_up() -> int:
+    """Pool initializer: pay the heavy imports and template parse up front."""
+    import pydub  # noqa: F401
+    from backend.docx_render import render_block
+
+    render_block(lambda doc: doc.add_paragraph("warm-up"))
+    return os.getpid()
+
+
+def split_audio(file_path: str, chunk_length_ms: int, out_dir: str = "") -> List[str]:
+    """Decode once and export fixed-length MP3 chunks; returns chunk paths."""
+    from pydub import AudioSegment
+
+    audio = AudioSegment.from_file(file_path)
+    chunks = []
+    for i in range(0, len(audio), chunk_length_ms):
+        chunk = audio[i : i + chunk_length_ms]
+        tmp_chunk_path = tempfile.NamedTemporaryFile(suffix=".mp3", delete=False, dir=out_dir or None).name
+        chunk.export(tmp_chunk_path, format="mp3")
+        chunks.append(tmp_chunk_path)
+    return chunks
+
+
+def render_meeting_docx(
+    summary_data: Dict[str, Any], company_name: str, meeting_date, modes: Sequence[str]
+) -> Dict[str, bytes]:
+    from backend.audio.doc_generator import generate_docx_variants
+
+    docs = generate_docx_variants(summary_data, company_name, meeting_date, modes=tuple(modes))
+    return {mode: stream.getvalue() for mode, stream in docs.items()}
+
+
+def render_website_docx(summary_json: Dict[str, Any], company_name: str, meeting_date) -> bytes:
+    from backend.website.document import generate_website_docx
+
+    return generate_website_docx(summary_json, company_name, meeting_date).getvalue()
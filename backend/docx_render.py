@@ -0,0 +1,118 @@
+# backend/docx_render.py
+"""
+Shared python-docx rendering.
+
+`Document()` unzips and parses the default template on every call. Here each
+thread parses it once and keeps that document as a reusable canvas: sections
+are rendered onto it once, detached as XML blocks, and any number of variants
+are emitted by re-attaching copies of the blocks and saving.
+"""
+import copy
+import io
+import re
+import threading
+from datetime import date
+from typing import Callable, Dict, List, Sequence
+
+from docx import Document
+
+Block = List  # detached body elements (lxml)
+
+_local = threading.local()
+_BOLD_RE = re.compile(r"(\*\*.*?\*\*)")
+
+
+def _canvas():
+    doc = getattr(_local, "doc", None)
+    if doc is None:
+        doc = Document()
+        _local.doc = doc
+    return doc
+
+
+def _detach_body(doc) -> Block:
+    body = doc.element.body
+    sect = body.sectPr
+    elements = [el for el in body if el is not sect]
+    for el in elements:
+        body.remove(el)
+    return elements
+
+
+def render_block(build: Callable) -> Block:
+    """Run `build(doc)` on the canvas and return what it added, detached."""
+    doc = _canvas()
+    _detach_body(doc)
+    build(doc)
+    return _detach_body(doc)
+
+
+def emit(blocks: Sequence[Block]) -> io.BytesIO:
+    """Save one .docx made of copies of `blocks`, in order."""
+    doc = _canvas()
+    body = doc.element.body
+    sect = body.sectPr
+    _detach_body(doc)
+    for block in blocks:
+        for el in block:
+            if sect is not None:
+                sect.addprevious(copy.deepcopy(el))
+            else:
+                body.append(copy.deepcopy(el))
+    out = io.BytesIO()
+    doc.save(out)
+    _detach_body(doc)
+    out.seek(0)
+    return out
+
+
+def emit_variants(variants: Dict[str, Sequence[Block]]) -> Dict[str, io.BytesIO]:
+    return {name: emit(blocks) for name, blocks in variants.items()}
+
+
+# ------------------------------------------------------------------------------
+# Styling helpers (website summary look, shared by every document)
+# ------------------------------------------------------------------------------
+def format_date(meeting_date) -> str:
+    if isinstance(meeting_date, date):
+        return meeting_date.strftime("%d-%m-%Y")
+    return meeting_date
+
+
+def add_title(doc, title: str, meeting_date=None) -> None:
+    doc.add_heading(title, level=0)
+    if meeting_date is not None:
+        p = doc.add_paragraph(f"Date: {format_date(meeting_date)}")
+        p.alignment = 2
+
+
+def add_rich_bullet(doc, text: str) -> None:
+    """Bullet paragraph; `**bold**` spans become bold runs."""
+    para = doc.add_paragraph(style="List Bullet")
+    for part in _BOLD_RE.split(text):
+        if not part:
+            continue
+        run = para.add_run()
+        if part.startswith("**") and part.endswith("**"):
+            run.text = part[2:-2]
+            run.bold = True
+        else:
+            run.text = part
+
+
+def add_bullets(doc, items) -> None:
+    for item in items or []:
+        if item and str(item).strip():
+            add_rich_bullet(doc, str(item).strip())
+
+
+def add_content_lines(doc, content: str) -> None:
+    """Multi-line content: "- " lines become bullets, others plain paragraphs."""
+    for line in (content or "").split("\n"):
+        line = line.strip()
+        if not line:
+            continue
+        if line.startswith("- "):
+            add_rich_bullet(doc, line[2:].strip())
+        else:
+            doc.add_paragraph(line)
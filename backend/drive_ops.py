@@ -3,9 +3,10 @@ import os
 import re
 import time
 from typing import Optional
-from googleapiclient.http import MediaIoBaseDownload, MediaFileUpload
+from googleapiclient.http import MediaIoBaseDownload
 from googleapiclient.errors import HttpError
 from config.config import drive_service
+from backend.upload_engine import upload_path
 
 _FILE_ID_RE = re.compile(r"/file/d/([^/]+)/")
 
@@ -46,12 +47,5 @@ def download_file_from_drive_url(drive_url: str, dest_path: str, max_retries: in
                 time.sleep(wait)
 
 def upload_file_to_drive(file_path: str, parent_folder_id: str) -> str:
-    file_metadata = {"name": os.path.basename(file_path), "parents": [parent_folder_id]}
-    media = MediaFileUpload(file_path, resumable=True)
-    file = (
-        drive_service.files()
-        .create(body=file_metadata, media_body=media, fields="id", supportsAllDrives=True)
-        .execute()
-    )
-    file_id = file.get("id")
+    file_id = upload_path(file_path, parent_folder_id)["id"]
     return f"https://drive.google.com/file/d/{file_id}/view"
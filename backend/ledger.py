@@ -0,0 +1,165 @@
+# backend/ledger.py
+"""
+Append-only usage ledger: one JSON line per OpenAI (or local engine) call
+with audio seconds, prompt / completion tokens and latency, keyed by day,
+row, client and stage.
+
+Row and client come from context variables set around each row
+(`row_context` in telemetry, `client_context` here); code that hands work to
+another thread must run it under `contextvars.copy_context()` to keep them.
+Streaming completions carry no usage block, so their token counts are
+estimated with model_router.estimate_tokens and flagged `"estimated": true`.
+
+Report:
+    python -m backend.ledger [--by day,client,stage] [--since YYYY-MM-DD] [--path FILE]
+"""
+import argparse
+import contextvars
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+from pytz import timezone
+
+from config.config import (
+    LEDGER_PATH,
+    PRICE_PER_1K_PROMPT_TOKENS,
+    PRICE_PER_1K_COMPLETION_TOKENS,
+    PRICE_PER_AUDIO_MINUTE,
+)
+from backend.model_router import estimate_tokens
+from backend.telemetry import current_row
+
+_client: contextvars.ContextVar[str] = contextvars.ContextVar("fms_client", default="")
+_write_lock = threading.Lock()
+_IST = timezone("Asia/Kolkata")
+
+
+@contextmanager
+def client_context(client: str) -> Iterator[None]:
+    """Attach `client` to every ledger entry recorded in this context."""
+    token = _client.set(str(client or "").strip())
+    try:
+        yield
+    finally:
+        _client.reset(token)
+
+
+def record(stage: str, model: str, *, audio_seconds: float = 0.0, prompt_tokens: int = 0,
+           completion_tokens: int = 0, latency_s: float = 0.0, estimated: bool = False,
+           ok: bool = True) -> None:
+    if not LEDGER_PATH:
+        return
+    now = time.time()
+    entry = {
+        "ts": round(now, 3),
+        "day": datetime.fromtimestamp(now, _IST).strftime("%Y-%m-%d"),
+        "row": current_row(),
+        "client": _client.get() or "unknown",
+        "stage": stage,
+        "model": model,
+        "audio_s": round(audio_seconds, 2),
+        "prompt_tokens": int(prompt_tokens),
+        "completion_tokens": int(completion_tokens),
+        "latency_s": round(latency_s, 3),
+        "estimated": estimated,
+        "ok": ok,
+    }
+    line = json.dumps(entry, ensure_ascii=False)
+    try:
+        with _write_lock, open(LEDGER_PATH, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+    except OSError as e:
+        print(f"⚠️ Could not write ledger entry to {LEDGER_PATH}: {e}")
+
+
+def estimate_message_tokens(messages: List[dict]) -> int:
+    return sum(estimate_tokens(str(m.get("content", ""))) + 4 for m in messages)
+
+
+@contextmanager
+def chat_usage(stage: str, model: str, messages: List[dict]) -> Iterator[dict]:
+    """
+    Record one chat completion. The caller fills the yielded dict with the
+    response's `usage` (prompt_tokens / completion_tokens) when there is one,
+    or with `completion_text` (streaming) so tokens can be estimated.
+    """
+    usage: dict = {}
+    started = time.monotonic()
+    ok = False
+    try:
+        yield usage
+        ok = True
+    finally:
+        estimated = "prompt_tokens" not in usage
+        record(
+            stage,
+            model,
+            prompt_tokens=usage.get("prompt_tokens") or estimate_message_tokens(messages),
+            completion_tokens=usage.get("completion_tokens")
+            or estimate_tokens(usage.get("completion_text", "")),
+            latency_s=time.monotonic() - started,
+            estimated=estimated,
+            ok=ok,
+        )
+
+
+# ------------------------------------------------------------------------------
+# Report
+# ------------------------------------------------------------------------------
+def _cost(entry: dict) -> float:
+    model = entry.get("model", "")
+    return (
+        entry.get("prompt_tokens", 0) / 1000 * PRICE_PER_1K_PROMPT_TOKENS.get(model, 0.0)
+        + entry.get("completion_tokens", 0) / 1000 * PRICE_PER_1K_COMPLETION_TOKENS.get(model, 0.0)
+        + entry.get("audio_s", 0) / 60 * PRICE_PER_AUDIO_MINUTE.get(model, 0.0)
+    )
+
+
+def aggregate(path: str, by: List[str], since: Optional[str] = None) -> Dict[tuple, dict]:
+    totals: Dict[tuple, dict] = defaultdict(lambda: defaultdict(float))
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except ValueError:
+                continue  # torn last line after a crash
+            if since and entry.get("day", "") < since:
+                continue
+            t = totals[tuple(str(entry.get(k, "")) for k in by)]
+            t["calls"] += 1
+            t["errors"] += 0 if entry.get("ok", True) else 1
+            t["audio_min"] += entry.get("audio_s", 0) / 60
+            t["prompt_tok"] += entry.get("prompt_tokens", 0)
+            t["completion_tok"] += entry.get("completion_tokens", 0)
+            t["latency_s"] += entry.get("latency_s", 0)
+            t["cost_usd"] += _cost(entry)
+    return totals
+
+
+def print_report(totals: Dict[tuple, dict], by: List[str]) -> None:
+    metrics = ["calls", "errors", "audio_min", "prompt_tok", "completion_tok", "latency_s", "cost_usd"]
+    print(" | ".join(f"{c:>14}" for c in by + metrics))
+    rows = sorted(totals.items(), key=lambda kv: (-kv[1]["cost_usd"], -kv[1]["latency_s"]))
+    for key, t in rows:
+        cells = list(key) + [f"{t[m]:.0f}" if m.endswith(("calls", "errors", "_tok")) else f"{t[m]:.2f}"
+                             for m in metrics]
+        print(" | ".join(f"{c:>14}" for c in cells))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Aggregate the OpenAI usage ledger.")
+    parser.add_argument("--path", default=LEDGER_PATH)
+    parser.add_argument("--by", default="day,client,stage", help="comma list of day,client,stage,model,row")
+    parser.add_argument("--since", default=None, help="YYYY-MM-DD (IST)")
+    args = parser.parse_args()
+    if not args.path or not os.path.exists(args.path):
+        print(f"No ledger found at '{args.path}'.")
+    else:
+        keys = [k.strip() for k in args.by.split(",") if k.strip()]
+        print_report(aggregate(args.path, keys, args.since), keys)
@@ -0,0 +1,186 @@
+# backend/llm_stream.py
+"""
+Streaming chat completions with incremental JSON parsing.
+
+The model's reply is parsed while tokens arrive: each completed top-level
+member of the JSON object ("mom", "todo_list", "sections", ...) is decoded
+and handed to `on_member(key, value)` immediately. If the stream goes
+malformed (no object start, unknown key, undecodable member) it is abandoned
+at once and retried, instead of waiting for the full completion first.
+JSON mode (`response_format={"type": "json_object"}`) is requested unless
+the model rejects it.
+"""
+import json
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+import openai
+
+from config.config import OPENAI_JSON_MODE
+
+OnMember = Callable[[str, Any], None]
+
+_PREFIX_LIMIT = 200  # chars tolerated before "{" (e.g. a ```json fence)
+_no_json_mode: set = set()
+_no_json_mode_lock = threading.Lock()
+
+
+class MalformedStream(ValueError):
+    pass
+
+
+def _loads(text: str) -> Any:
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        from json_repair import repair_json
+
+        return json.loads(repair_json(text))
+
+
+class IncrementalJSONObject:
+    """
+    Feed text chunks of a single JSON object; `feed()` returns the top-level
+    (key, value) members completed by that chunk.
+    """
+
+    def __init__(self, expected_keys: Optional[Iterable[str]] = None):
+        self.expected_keys = set(expected_keys or [])
+        self.result: Dict[str, Any] = {}
+        self.closed = False
+        self._buf: List[str] = []
+        self._pos = 0            # chars consumed so far
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._member: List[str] = []
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        done: List[Tuple[str, Any]] = []
+        for ch in chunk:
+            self._pos += 1
+            if self.closed:
+                if not ch.isspace() and ch != "`":
+                    raise MalformedStream(f"Unexpected text after the JSON object: {ch!r}")
+                continue
+            if not self._started:
+                if ch == "{":
+                    self._started = True
+                    self._depth = 1
+                elif self._pos > _PREFIX_LIMIT:
+                    raise MalformedStream("No JSON object in the first %d chars" % _PREFIX_LIMIT)
+                continue
+
+            if self._in_string:
+                self._member.append(ch)
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                continue
+
+            if ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+
+            if self._depth == 1 and ch == ",":
+                done.append(self._finish_member())
+                continue
+            if self._depth == 0:
+                if "".join(self._member).strip():
+                    done.append(self._finish_member())
+                self.closed = True
+                continue
+            self._member.append(ch)
+        return done
+
+    def _finish_member(self) -> Tuple[str, Any]:
+        text = "".join(self._member).strip()
+        self._member = []
+        try:
+            parsed = _loads("{" + text + "}")
+        except Exception as e:
+            raise MalformedStream(f"Undecodable member: {text[:80]!r} ({e})")
+        if not isinstance(parsed, dict) or len(parsed) != 1:
+            raise MalformedStream(f"Bad member: {text[:80]!r}")
+        key, value = next(iter(parsed.items()))
+        if self.expected_keys and key not in self.expected_keys:
+            raise MalformedStream(f"Unexpected key {key!r}")
+        self.result[key] = value
+        return key, value
+
+
+def _supports_json_mode(model: str) -> bool:
+    with _no_json_mode_lock:
+        return OPENAI_JSON_MODE and model not in _no_json_mode
+
+
+def _create_stream(model: str, messages: List[dict], **kwargs):
+    if _supports_json_mode(model):
+        try:
+            return openai.ChatCompletion.create(
+                model=model,
+                messages=messages,
+                stream=True,
+                response_format={"type": "json_object"},
+                **kwargs,
+            )
+        except openai.error.InvalidRequestError as e:
+            if "response_format" not in str(e):
+                raise
+            with _no_json_mode_lock:
+                _no_json_mode.add(model)
+    return openai.ChatCompletion.create(model=model, messages=messages, stream=True, **kwargs)
+
+
+def stream_json_completion(
+    model: str,
+    messages: List[dict],
+    expected_keys: Optional[Iterable[str]] = None,
+    on_member: Optional[OnMember] = None,
+    max_attempts: int = 2,
+    deadline_s: Optional[float] = None,
+    **kwargs,
+) -> Dict[str, Any]:
+    """
+    Stream a completion and return the parsed JSON object. `on_member` fires
+    once per top-level key as soon as its value is complete (only for the
+    attempt that succeeds from that point on — keys are never re-sent).
+    `deadline_s` bounds the whole call; exceeding it raises openai.error.Timeout.
+    """
+    started = time.monotonic()
+    delivered: set = set()
+    last_error: Optional[Exception] = None
+    for attempt in range(1, max_attempts + 1):
+        parser = IncrementalJSONObject(expected_keys)
+        stream = _create_stream(model, messages, **kwargs)
+        try:
+            for chunk in stream:
+                choices = chunk.get("choices") or [{}]
+                delta = (choices[0].get("delta") or {}).get("content")
+                if not delta:
+                    continue
+                if deadline_s and time.monotonic() - started > deadline_s:
+                    raise openai.error.Timeout(f"Completion exceeded {deadline_s:.0f}s deadline")
+                for key, value in parser.feed(delta):
+                    if on_member and key not in delivered:
+                        delivered.add(key)
+                        on_member(key, value)
+            if not parser.closed:
+                raise MalformedStream("Stream ended before the JSON object closed")
+            return parser.result
+        except MalformedStream as e:
+            last_error = e
+            print(f"⚠️ Malformed JSON stream (attempt {attempt}/{max_attempts}): {e}")
+        finally:
+            close = getattr(stream, "close", None)
+            if close:
+                close()
+    raise last_error or MalformedStream("No attempts made")
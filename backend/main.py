@@ -1,10 +1,40 @@
 import sys, os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
-from config.config import sheet
-from backend.processor import process_row
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from config.config import (
+    sheet,
+    GOOGLE_SHEET_ID,
+    BACKEND_DAEMON,
+    BACKEND_ROW_CONCURRENCY,
+    RECONCILE_INTERVAL_SECONDS,
+    DAEMON_POLL_MIN_SECONDS,
+    DAEMON_POLL_MAX_SECONDS,
+    TRIGGER_PORT,
+    PREFETCH_AUDIO,
+    ARCHIVE_INTERVAL_SECONDS,
+)
+from backend.processor import process_row, prefetch_audio
+from backend.prefetch import Prefetcher
+from backend.trigger import start_trigger_server, wait_for_trigger, set_queue_provider, pending_hints
+from backend.telemetry import mean_stage_seconds
+from backend.sheet_watch import SheetChangeWatcher, PollBackoff
+from backend import cpu_pool
+from backend.scratch import sweep_stale
+from backend import scheduler
+from backend.archiver import archive_done_rows, format_report
 import time
 
+# Live queue state for GET /queue (admission control at intake)
+_queue_lock = threading.Lock()
+_queued: set = set()
+_in_flight: set = set()
+DEFAULT_ROW_SECONDS = 300.0
+# Held while rows are dispatched; the archiver (which shifts row numbers)
+# only runs when it can take it
+_dispatch_lock = threading.Lock()
 
 
 def get_processing_rows():
@@ -16,26 +46,165 @@ def get_processing_rows():
     return rows
 
 
-if __name__ == "__main__":
+def get_row_if_processing(row_idx: int):
+    """Cheap single-row read for trigger hints (no full-sheet scan)."""
+    headers = sheet.row_values(1)
+    values = sheet.row_values(row_idx)
+    values += [""] * (len(headers) - len(values))
+    row = dict(zip(headers, values))
+    if str(row.get("Status", "")).strip().lower() == "processing":
+        return row
+    return None
+
+
+def _process_one(idx, row_data) -> bool:
+    with _queue_lock:
+        _in_flight.add(idx)
+    scheduler.observe_dispatch(idx, row_data)
+    try:
+        process_row(idx, list(row_data.values()))
+        return True
+    except Exception as e:
+        print(f"❌ Error processing row {idx}: {e}")
+        # optional: update status to "Error" here
+        return False
+    finally:
+        with _queue_lock:
+            _in_flight.discard(idx)
+            _queued.discard(idx)
+
+
+def queue_status() -> dict:
+    """
+    Rows waiting + running, and a rough ETA for a new submission. Waiting
+    rows are the batch being dispatched, rows the last reconcile saw as
+    Processing but has not started, and trigger hints not yet picked up.
+    """
+    with _queue_lock:
+        depth = len(_queued | scheduler.unstarted_rows()) + pending_hints()
+        running = len(_in_flight)
+    row_s = mean_stage_seconds("row") or DEFAULT_ROW_SECONDS
+    workers = max(1, BACKEND_ROW_CONCURRENCY)
+    return {
+        "depth": depth,
+        "in_flight": running,
+        "avg_row_s": round(row_s, 1),
+        "eta_s": round((depth + 1) * row_s / workers, 1),
+        "scheduler": scheduler.queue_snapshot(),
+    }
+
+
+def process_rows(rows, concurrency=None):
+    """Process rows in order, up to `concurrency` (BACKEND_ROW_CONCURRENCY) at a time."""
+    with _queue_lock:
+        _queued.update(idx for idx, _ in rows)
+    workers = max(1, concurrency or BACKEND_ROW_CONCURRENCY)
+    with _dispatch_lock:
+        if workers == 1 or len(rows) <= 1:
+            return [_process_one(idx, row_data) for idx, row_data in rows]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="row") as pool:
+            return list(pool.map(lambda r: _process_one(*r), rows))
+
+
+def _maybe_archive(last: float) -> float:
+    """
+    Idle-cycle hook: run the Main-sheet archiver once ARCHIVE_INTERVAL_SECONDS
+    have passed (0 disables it) and no row is queued, hinted or running.
+    Archiving deletes rows, so it holds the dispatch lock throughout.
+    Returns the time of the last attempt.
+    """
+    if ARCHIVE_INTERVAL_SECONDS <= 0 or time.monotonic() - last < ARCHIVE_INTERVAL_SECONDS:
+        return last
+    if not _dispatch_lock.acquire(blocking=False):
+        return last
+    try:
+        with _queue_lock:
+            busy = bool(_queued or _in_flight)
+        if busy or pending_hints():
+            return last
+        try:
+            print(format_report(archive_done_rows()))
+        except Exception as e:
+            print(f"⚠️ Archiving failed: {e}")
+        return time.monotonic()
+    finally:
+        _dispatch_lock.release()
+
+
+def run_once():
+    first = True
     while True:
+        # one sheet read per cycle
         rows = get_processing_rows()
         if not rows:
-            print("✅ No rows with Status = 'Processing'. Processes Ended.")
+            if first:
+                print("✅ No rows with Status = 'Processing'. Processes Ended.")
+            else:
+                print("✅ All rows processed. Stopping backend.")
             break  # Exit script
+        first = False
 
         print(f"🔍 Found {len(rows)} row(s) with Status = 'Processing'")
-        for idx, row_data in rows:
-            try:
-                process_row(idx, list(row_data.values()))
-            except Exception as e:
-                print(f"❌ Error processing row {idx}: {e}")
-                # optional: update status to "Error" here
-
-        # After processing current batch, check again before deciding to sleep
-        rows_left = get_processing_rows()
-        if not rows_left:
-            print("✅ All rows processed. Stopping backend.")
-            break
-
-        print("⏳ Waiting 10 seconds before checking again...")
-        time.sleep(10)
+        results = process_rows(scheduler.order(rows))
+
+        # Only pause before retrying rows that just failed
+        if not all(results):
+            print("⏳ Waiting 10 seconds before checking again...")
+            time.sleep(10)
+
+
+def run_daemon():
+    """
+    Long-running worker: wakes on frontend triggers and starts on the hinted
+    row at once. Between triggers it probes the spreadsheet's Drive version
+    and reads the sheet only when it changed (or every
+    RECONCILE_INTERVAL_SECONDS, to retry failed rows). The probe interval
+    backs off exponentially while idle and resets when rows show up; idle
+    cycles also run the Main-sheet archiver on its own schedule. With
+    PREFETCH_AUDIO, new intake audio is transcribed ahead of its row.
+    """
+    set_queue_provider(queue_status)
+    start_trigger_server(TRIGGER_PORT)
+    if PREFETCH_AUDIO:
+        Prefetcher(prefetch_audio).start()
+    watcher = SheetChangeWatcher(GOOGLE_SHEET_ID)
+    backoff = PollBackoff(DAEMON_POLL_MIN_SECONDS, DAEMON_POLL_MAX_SECONDS)
+    last_full_read = float("-inf")
+    last_archive = time.monotonic()
+    hinted = None
+    while True:
+        busy = False
+        if hinted:
+            for idx in hinted:
+                row = get_row_if_processing(idx)
+                if row is not None:
+                    print(f"⚡ Triggered: processing row {idx}")
+                    process_rows([(idx, row)])
+                    busy = True
+        else:
+            # `hinted == []` is a trigger without a row number: read regardless
+            due = time.monotonic() - last_full_read >= RECONCILE_INTERVAL_SECONDS
+            if hinted is not None or due or watcher.changed():
+                last_full_read = time.monotonic()
+                rows = get_processing_rows()
+                if rows:
+                    print(f"🔍 Reconcile found {len(rows)} row(s) with Status = 'Processing'")
+                    process_rows(scheduler.order(rows))
+                    busy = True
+
+        if not busy:
+            last_archive = _maybe_archive(last_archive)
+        delay = backoff.reset() if busy else backoff.next()
+        hinted = wait_for_trigger(delay)
+
+
+if __name__ == "__main__":
+    # fork CPU workers before any worker threads exist
+    cpu_pool.warm_up()
+    removed = sweep_stale()
+    if removed:
+        print(f"🧹 Removed {removed} stale scratch workspace(s)")
+    if BACKEND_DAEMON or "--daemon" in sys.argv:
+        run_daemon()
+    else:
+        run_once()
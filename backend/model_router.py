@@ -0,0 +1,227 @@
+# backend/model_router.py
+"""
+Latency-aware model routing for summaries.
+
+Each request is routed from its task ("meeting" / "website") and estimated
+input tokens: short inputs go to OPENAI_MODEL_FAST, very long ones to
+OPENAI_MODEL_LONG, everything else to OPENAI_MODEL. If the observed
+seconds-per-token of the chosen model predicts a miss of the task's latency
+budget, a faster model that fits is preferred. A call that times out is
+retried once on OPENAI_FALLBACK_MODEL.
+
+Per-route latency statistics are exported on /metrics as `fms_route_seconds`
+and saved to ROUTER_STATS_PATH after every call, including the recent sample
+windows; they are loaded back at import so routing keeps adapting across
+restarts and one-shot runs (`python -m backend.model_router` prints them).
+"""
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Optional, Tuple
+
+import openai
+
+from config.config import (
+    OPENAI_MODEL,
+    OPENAI_MODEL_FAST,
+    OPENAI_MODEL_LONG,
+    OPENAI_FALLBACK_MODEL,
+    ROUTER_FAST_MAX_TOKENS,
+    ROUTER_LONG_MIN_TOKENS,
+    ROUTER_BUDGET_SECONDS,
+    ROUTER_STATS_PATH,
+)
+from backend.telemetry import LATENCY_BUCKETS, Histogram, register_histogram
+
+ROUTE_SECONDS = register_histogram(
+    Histogram("fms_route_seconds", "Chat completion latency per route.", LATENCY_BUCKETS)
+)
+
+_TIMEOUT_ERRORS = (openai.error.Timeout, openai.error.APIConnectionError, TimeoutError)
+
+try:  # optional: exact counts when tiktoken is installed
+    import tiktoken  # type: ignore
+
+    _ENC = tiktoken.get_encoding("cl100k_base")
+except Exception:
+    _ENC = None
+
+
+def estimate_tokens(text: str) -> int:
+    if not text:
+        return 0
+    if _ENC is not None:
+        return len(_ENC.encode(text, disallowed_special=()))
+    return max(1, len(text) // 4)
+
+
+class RouteStats:
+    """Latency samples for one task+model route."""
+
+    def __init__(self):
+        self.calls = 0
+        self.timeouts = 0
+        self.errors = 0
+        self.samples = deque(maxlen=200)          # seconds
+        self.sec_per_ktok = deque(maxlen=200)     # seconds per 1k input tokens
+
+    def record(self, seconds: float, tokens: int, outcome: str) -> None:
+        self.calls += 1
+        if outcome == "timeout":
+            self.timeouts += 1
+        elif outcome == "error":
+            self.errors += 1
+        else:
+            self.samples.append(seconds)
+            if tokens:
+                self.sec_per_ktok.append(seconds / max(tokens / 1000, 0.1))
+
+    def predict(self, tokens: int) -> Optional[float]:
+        if len(self.sec_per_ktok) < 5:
+            return None
+        ordered = sorted(self.sec_per_ktok)
+        return ordered[len(ordered) // 2] * max(tokens / 1000, 0.1)
+
+    def summary(self) -> dict:
+        ordered = sorted(self.samples)
+
+        def pct(q: float) -> Optional[float]:
+            return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 3) if ordered else None
+
+        return {
+            "calls": self.calls,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "p50_s": pct(0.5),
+            "p95_s": pct(0.95),
+        }
+
+    def to_dict(self) -> dict:
+        return dict(self.summary(), samples=list(self.samples), sec_per_ktok=list(self.sec_per_ktok))
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "RouteStats":
+        stats = cls()
+        stats.calls = int(data.get("calls", 0))
+        stats.timeouts = int(data.get("timeouts", 0))
+        stats.errors = int(data.get("errors", 0))
+        stats.samples.extend(float(x) for x in data.get("samples", []))
+        stats.sec_per_ktok.extend(float(x) for x in data.get("sec_per_ktok", []))
+        return stats
+
+
+_stats: Dict[Tuple[str, str], RouteStats] = {}
+_lock = threading.Lock()
+_save_lock = threading.Lock()
+
+
+def _route_stats(task: str, model: str) -> RouteStats:
+    with _lock:
+        return _stats.setdefault((task, model), RouteStats())
+
+
+def choose_model(task: str, tokens: int) -> str:
+    if tokens <= ROUTER_FAST_MAX_TOKENS:
+        model = OPENAI_MODEL_FAST
+    elif tokens >= ROUTER_LONG_MIN_TOKENS:
+        model = OPENAI_MODEL_LONG
+    else:
+        model = OPENAI_MODEL
+
+    budget = ROUTER_BUDGET_SECONDS.get(task)
+    if budget:
+        predicted = _route_stats(task, model).predict(tokens)
+        if predicted is not None and predicted > budget and model != OPENAI_MODEL_FAST:
+            fast = _route_stats(task, OPENAI_MODEL_FAST).predict(tokens)
+            if fast is not None and fast < predicted and tokens < ROUTER_LONG_MIN_TOKENS:
+                model = OPENAI_MODEL_FAST
+    return model
+
+
+def _timed(task: str, model: str, tokens: int, fn: Callable, timeout: Optional[float]):
+    t0 = time.perf_counter()
+    outcome = "ok"
+    try:
+        return fn(model, timeout)
+    except _TIMEOUT_ERRORS:
+        outcome = "timeout"
+        raise
+    except Exception:
+        outcome = "error"
+        raise
+    finally:
+        elapsed = time.perf_counter() - t0
+        _route_stats(task, model).record(elapsed, tokens, outcome)
+        ROUTE_SECONDS.observe(elapsed, task=task, model=model, outcome=outcome)
+        save_stats()
+
+
+def run_routed(task: str, input_text: str, fn: Callable[[str, Optional[float]], object]):
+    """
+    Call `fn(model, timeout_s)` on the routed model; on timeout, retry once
+    on OPENAI_FALLBACK_MODEL. The timeout is twice the task's budget.
+    """
+    tokens = estimate_tokens(input_text)
+    model = choose_model(task, tokens)
+    budget = ROUTER_BUDGET_SECONDS.get(task)
+    timeout = budget * 2 if budget else None
+    print(f"🧭 Routing {task} summary (~{tokens} tokens) to {model}")
+    try:
+        return _timed(task, model, tokens, fn, timeout)
+    except _TIMEOUT_ERRORS as e:
+        if not OPENAI_FALLBACK_MODEL or OPENAI_FALLBACK_MODEL == model:
+            raise
+        print(f"⏱️ {model} timed out ({e}); falling back to {OPENAI_FALLBACK_MODEL}")
+        return _timed(task, OPENAI_FALLBACK_MODEL, tokens, fn, None)
+
+
+def stats_snapshot() -> dict:
+    with _lock:
+        items = list(_stats.items())
+    return {f"{task}:{model}": s.summary() for (task, model), s in items}
+
+
+def save_stats() -> None:
+    if not ROUTER_STATS_PATH:
+        return
+    tmp = ROUTER_STATS_PATH + ".tmp"
+    with _lock:
+        data = {f"{task}:{model}": s.to_dict() for (task, model), s in _stats.items()}
+    try:
+        with _save_lock:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp, ROUTER_STATS_PATH)
+    except OSError as e:
+        print(f"⚠️ Could not save router stats: {e}")
+
+
+def load_stats() -> int:
+    """Restore saved route statistics; returns how many routes were loaded."""
+    if not ROUTER_STATS_PATH or not os.path.exists(ROUTER_STATS_PATH):
+        return 0
+    try:
+        with open(ROUTER_STATS_PATH, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        loaded = {}
+        for key, entry in data.items():
+            task, _, model = key.partition(":")
+            loaded[(task, model)] = RouteStats.from_dict(entry)
+    except (OSError, ValueError, TypeError, AttributeError) as e:
+        print(f"⚠️ Could not load router stats: {e}")
+        return 0
+    with _lock:
+        _stats.update(loaded)
+    return len(loaded)
+
+
+load_stats()
+
+
+if __name__ == "__main__":
+    if _stats:
+        print(json.dumps(stats_snapshot(), indent=2))
+    else:
+        print("No router stats recorded yet.")
@@ -0,0 +1,177 @@
+# backend/output_writer.py
+"""
+Coalescing writer for the Output (To-Do) sheet.
+
+Rows from many processed meetings are buffered and written with a single
+`append_rows` per flush (every OUTPUT_FLUSH_INTERVAL_SECONDS or once
+OUTPUT_FLUSH_MAX_ROWS are pending). Every buffered row is first appended to a
+spill file and fsync'ed, so a crash between buffering and flushing loses
+nothing: the spill is replayed on the next start. Delivery is at-least-once.
+"""
+import atexit
+import json
+import os
+import threading
+from typing import Dict, List, Optional
+
+from config.config import (
+    client,
+    output_sheet,
+    OUTPUT_SHEET_ID,
+    OUTPUT_SHEET_TAB,
+    OUTPUT_FLUSH_INTERVAL_SECONDS,
+    OUTPUT_FLUSH_MAX_ROWS,
+    OUTPUT_SPILL_PATH,
+)
+from backend.sheet_ops import _ensure_headers, _hdr_first_idx, build_todo_rows
+from backend.telemetry import span
+
+
+class OutputSheetWriter:
+    def __init__(
+        self,
+        worksheet=None,
+        spill_path: str = OUTPUT_SPILL_PATH,
+        flush_interval: float = OUTPUT_FLUSH_INTERVAL_SECONDS,
+        max_rows: int = OUTPUT_FLUSH_MAX_ROWS,
+    ):
+        self._ws = worksheet
+        self._headers: Optional[List[str]] = None
+        self._spill_path = spill_path
+        self._flush_interval = flush_interval
+        self._max_rows = max(1, max_rows)
+        self._buffer: List[List[str]] = []
+        self._lock = threading.Lock()        # guards _buffer + spill file
+        self._flush_lock = threading.Lock()  # one append_rows at a time
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._replay_spill()
+
+    # ---- worksheet / headers (opened once, reused) ----
+    def _worksheet(self):
+        if self._ws is None:
+            if not OUTPUT_SHEET_ID:
+                return None
+            self._ws = client.open_by_key(OUTPUT_SHEET_ID).worksheet(OUTPUT_SHEET_TAB)
+        return self._ws
+
+    def _get_headers(self, ws) -> List[str]:
+        if self._headers is None:
+            self._headers = _ensure_headers(ws)
+        return self._headers
+
+    # ---- spill file ----
+    def _replay_spill(self) -> None:
+        if not self._spill_path or not os.path.exists(self._spill_path):
+            return
+        with open(self._spill_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    self._buffer.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue  # torn final line from a crash mid-write
+        if self._buffer:
+            print(f"♻️ Replaying {len(self._buffer)} buffered To-Do row(s) from {self._spill_path}")
+
+    def _spill_append(self, rows: List[List[str]]) -> None:
+        if not self._spill_path:
+            return
+        with open(self._spill_path, "a", encoding="utf-8") as f:
+            for row in rows:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _spill_rewrite(self) -> None:
+        if not self._spill_path:
+            return
+        tmp = self._spill_path + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            for row in self._buffer:
+                f.write(json.dumps(row, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self._spill_path)
+
+    # ---- public API ----
+    def add(self, todos: List[str], meta: Dict[str, str], task_ids: Optional[List[str]] = None) -> int:
+        """Buffer one row per To-Do; returns how many rows were queued."""
+        ws = self._worksheet()
+        if ws is None:
+            print("⚠️ Output sheet not configured (OUTPUT_SHEET_ID); skipping To-Dos.")
+            return 0
+        headers = self._get_headers(ws)
+        rows = build_todo_rows(headers, todos, meta, task_ids)
+        idx_task_id = _hdr_first_idx(headers, "Task ID")
+        with self._lock:
+            if task_ids and idx_task_id >= 0:
+                # a resumed row re-queues the same deterministic IDs
+                queued = {r[idx_task_id] for r in self._buffer if len(r) > idx_task_id}
+                rows = [r for r in rows if r[idx_task_id] not in queued]
+            if not rows:
+                return 0
+            self._spill_append(rows)
+            self._buffer.extend(rows)
+            pending = len(self._buffer)
+        if pending >= self._max_rows:
+            self.flush()
+        return len(rows)
+
+    def flush(self) -> int:
+        """Write all buffered rows with one append_rows call."""
+        with self._flush_lock:
+            with self._lock:
+                batch = list(self._buffer)
+            if not batch:
+                return 0
+            ws = self._worksheet()
+            if ws is None:
+                return 0
+            try:
+                with span("sheet_write", target="todos_output", items=len(batch)):
+                    ws.append_rows(batch, value_input_option="USER_ENTERED")
+            except Exception as e:
+                print(f"❌ Failed to flush {len(batch)} To-Do row(s); kept for retry: {e}")
+                return 0
+            with self._lock:
+                del self._buffer[: len(batch)]
+                self._spill_rewrite()
+            print(f"✅ Appended {len(batch)} To-Do rows to Output sheet.")
+            return len(batch)
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._buffer)
+
+    def start(self) -> None:
+        """Start the periodic flusher (idempotent) and flush again at exit."""
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._run, name="output-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self._flush_interval):
+            self.flush()
+
+    def close(self) -> None:
+        self._stop.set()
+        self.flush()
+
+
+_writer: Optional[OutputSheetWriter] = None
+_writer_lock = threading.Lock()
+
+
+def get_output_writer() -> OutputSheetWriter:
+    """Process-wide writer sharing the config client's Output worksheet."""
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = OutputSheetWriter(worksheet=output_sheet)
+            _writer.start()
+        return _writer
@@ -0,0 +1,266 @@
+# backend/prefetch.py
+"""
+Speculative audio prefetch.
+
+The frontend uploads audio to REGULAR_FOLDER_ID / KICKSTART_FOLDER_ID before
+it appends the Main-sheet row. The daemon follows those folders through the
+Drive Changes API (the page token survives restarts in PREFETCH_STATE_PATH)
+and, for every new audio file, runs the download + normalise + transcribe
+stage straight away. Transcripts land in a small on-disk cache keyed by Drive
+file ID, which the processor consults before downloading anything. The cache
+is only written once a Prefetcher exists, and expired entries are pruned
+on every poll.
+
+Prefetch is best-effort: errors are logged and the row simply does the work
+itself later. The handler is passed in by the caller (processor's
+`prefetch_audio`) so this module does not import the pipeline.
+"""
+import json
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Set
+
+from config.config import (
+    drive_service,
+    REGULAR_FOLDER_ID,
+    KICKSTART_FOLDER_ID,
+    PREFETCH_POLL_SECONDS,
+    PREFETCH_CONCURRENCY,
+    PREFETCH_STATE_PATH,
+    PREFETCH_CACHE_DIR,
+    PREFETCH_CACHE_TTL_HOURS,
+)
+
+AUDIO_EXTENSIONS = {"m4a", "mp3", "wav", "ogg", "oga", "webm", "mp4", "aac", "flac", "mpeg", "mpga"}
+_CHANGE_FIELDS = "nextPageToken, newStartPageToken, changes(fileId, removed, file(id, name, mimeType, parents, trashed))"
+
+
+def is_audio(file: dict) -> bool:
+    mime = (file.get("mimeType") or "").lower()
+    ext = (file.get("name") or "").rsplit(".", 1)[-1].lower()
+    return mime.startswith(("audio/", "video/")) or ext in AUDIO_EXTENSIONS
+
+
+class TranscriptCache:
+    """Transcript text per Drive file ID, one JSON file each, expired after a TTL."""
+
+    def __init__(self, directory: str = PREFETCH_CACHE_DIR, ttl_hours: float = PREFETCH_CACHE_TTL_HOURS):
+        self.directory = directory
+        self.ttl_s = ttl_hours * 3600
+
+    def _path(self, file_id: str) -> str:
+        return os.path.join(self.directory, re.sub(r"[^A-Za-z0-9_-]", "_", file_id) + ".json")
+
+    def get(self, file_id: str) -> Optional[str]:
+        if not self.directory or not file_id:
+            return None
+        try:
+            with open(self._path(file_id), "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if self.ttl_s and time.time() - entry.get("ts", 0) > self.ttl_s:
+            return None
+        return entry.get("transcript")
+
+    def put(self, file_id: str, transcript: str) -> None:
+        if not self.directory or not file_id:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path(file_id)
+        tmp = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"file_id": file_id, "ts": time.time(), "transcript": transcript}, f, ensure_ascii=False)
+            os.replace(tmp, path)
+        except OSError as e:
+            print(f"⚠️ Could not cache transcript for {file_id}: {e}")
+
+    def prune(self) -> int:
+        """Delete expired entries; returns how many were removed."""
+        if not self.directory or not self.ttl_s or not os.path.isdir(self.directory):
+            return 0
+        removed = 0
+        cutoff = time.time() - self.ttl_s
+        for name in os.listdir(self.directory):
+            path = os.path.join(self.directory, name)
+            try:
+                if os.path.getmtime(path) < cutoff:
+                    os.remove(path)
+                    removed += 1
+            except OSError:
+                pass
+        return removed
+
+
+# Disabled (no directory) until a Prefetcher is created: without prefetch nothing
+# reads the cache, so rows must not leave transcripts on disk.
+_cache = TranscriptCache(directory="")
+_cache_lock = threading.Lock()
+
+
+def get_transcript_cache() -> TranscriptCache:
+    with _cache_lock:
+        return _cache
+
+
+def _enable_transcript_cache() -> TranscriptCache:
+    global _cache
+    with _cache_lock:
+        if not _cache.directory:
+            _cache = TranscriptCache()
+        return _cache
+
+
+class ChangesFeed:
+    """
+    Drive Changes API cursor. The first run starts at "now" (older files are
+    not prefetched); the token is saved after every page it has handed out.
+    """
+
+    def __init__(self, state_path: str = PREFETCH_STATE_PATH, service=None):
+        self.state_path = state_path
+        self._service = service
+        self.token: Optional[str] = self._load()
+
+    def _load(self) -> Optional[str]:
+        if not self.state_path or not os.path.exists(self.state_path):
+            return None
+        try:
+            with open(self.state_path, "r", encoding="utf-8") as f:
+                return json.load(f).get("page_token") or None
+        except (OSError, ValueError):
+            return None
+
+    def _save(self) -> None:
+        if not self.state_path:
+            return
+        tmp = f"{self.state_path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"page_token": self.token}, f)
+        os.replace(tmp, self.state_path)
+
+    def poll(self) -> List[dict]:
+        """File resources changed since the saved token (across all pages)."""
+        service = self._service or drive_service
+        if self.token is None:
+            self.token = service.changes().getStartPageToken(supportsAllDrives=True).execute()["startPageToken"]
+            self._save()
+            return []
+        files: List[dict] = []
+        while True:
+            resp = service.changes().list(
+                pageToken=self.token,
+                fields=_CHANGE_FIELDS,
+                pageSize=1000,
+                spaces="drive",
+                includeItemsFromAllDrives=True,
+                supportsAllDrives=True,
+            ).execute()
+            files.extend(c["file"] for c in resp.get("changes", []) if not c.get("removed") and c.get("file"))
+            self.token = resp.get("nextPageToken") or resp.get("newStartPageToken") or self.token
+            self._save()
+            if "nextPageToken" not in resp:
+                return files
+
+
+class Prefetcher:
+    """
+    Background thread: poll the changes feed every `poll_s` and hand new audio
+    files in `folder_ids` to `handler(file)` on a small worker pool. A file ID
+    is handled at most once per process.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[dict], None],
+        folder_ids: Iterable[str] = (REGULAR_FOLDER_ID, KICKSTART_FOLDER_ID),
+        feed: Optional[ChangesFeed] = None,
+        poll_s: float = PREFETCH_POLL_SECONDS,
+        workers: int = PREFETCH_CONCURRENCY,
+    ):
+        _enable_transcript_cache()
+        self.handler = handler
+        self.folder_ids: Set[str] = {f for f in folder_ids if f}
+        self.feed = feed or ChangesFeed()
+        self.poll_s = poll_s
+        self._pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="prefetch")
+        self._seen: Set[str] = set()
+        self._pending: Dict[str, object] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def wanted(self, file: dict) -> bool:
+        return (
+            not file.get("trashed")
+            and bool(self.folder_ids.intersection(file.get("parents") or []))
+            and is_audio(file)
+        )
+
+    def poll_once(self) -> int:
+        """One feed read; returns how many files were queued."""
+        try:
+            files = self.feed.poll()
+        except Exception as e:
+            print(f"⚠️ Drive changes poll failed: {e}")
+            return 0
+        queued = 0
+        for file in files:
+            file_id = file.get("id")
+            if not file_id or not self.wanted(file):
+                continue
+            with self._lock:
+                if file_id in self._seen:
+                    continue
+                self._seen.add(file_id)
+                self._pending[file_id] = self._pool.submit(self._run, file)
+            queued += 1
+        if queued:
+            print(f"🔮 Prefetching {queued} new audio file(s) from the intake folders")
+        return queued
+
+    def _run(self, file: dict) -> None:
+        try:
+            self.handler(file)
+        except Exception as e:
+            print(f"⚠️ Prefetch of {file.get('name') or file.get('id')} failed (the row will redo it): {e}")
+        finally:
+            with self._lock:
+                self._pending.pop(file.get("id"), None)
+
+    def pending(self) -> int:
+        with self._lock:
+            return len(self._pending)
+
+    def drain(self, timeout_s: float) -> bool:
+        """Wait until queued prefetches finish; False on timeout."""
+        deadline = time.monotonic() + timeout_s
+        while self.pending():
+            if time.monotonic() >= deadline:
+                return False
+            time.sleep(0.05)
+        return True
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            removed = get_transcript_cache().prune()
+            if removed:
+                print(f"🧹 Pruned {removed} expired transcript(s) from the prefetch cache")
+            self.poll_once()
+            self._stop.wait(self.poll_s)
+
+    def start(self) -> "Prefetcher":
+        if not self.folder_ids:
+            print("ℹ️ Prefetch disabled: no intake folder IDs configured.")
+            return self
+        self._thread = threading.Thread(target=self._loop, name="prefetch-feed", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -1,8 +1,12 @@
 # backend/processor.py
-import os
-import tempfile
 import re
-from typing import List
+import time
+import hashlib
+import threading
+import contextvars
+from urllib.parse import urlsplit, urlunsplit
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Dict, List
 
 from config.config import (
     sheet,
@@ -10,22 +14,78 @@ from config.config import (
     WEBSITE_DRIVE_FOLDER_ID,
     MOM_FOLDER_ID,
     ACTION_POINT_FOLDER_ID,
-    output_sheet,
-    OUTPUT_SHEET_ID,  
-    OUTPUT_SHEET_TAB,  
 )
 from backend.audio.transcription import transcribe_audio
 from backend.audio.summarizer import generate_summary
-from backend.audio.doc_generator import generate_docx
 
-from backend.website.extract import extract_text_from_url
+from backend.website.extract import fetch_page, UnsupportedContentError
+from backend.website.shaping import shape_page_text
 from backend.website.summarize import summarize_with_openai
-from backend.website.document import generate_website_docx
 
-from backend.drive_ops import upload_file_to_drive, download_file_from_drive_url
-from backend.sheet_ops import update_row_values, append_todos_to_output
+from backend.drive_ops import upload_file_to_drive, download_file_from_drive_url, extract_file_id_from_url
+from backend.sheet_ops import update_row_values
+from backend.output_writer import get_output_writer
+from backend.telemetry import span, row_context, record_queue_wait
+from backend.ledger import client_context
+from backend.profiling import profiled
+from backend.checkpoints import RowCheckpoint, checkpoint_key, deterministic_task_ids
+from backend.cpu_pool import run_cpu
+from backend.cpu_tasks import render_meeting_docx, render_website_docx
+from backend.scratch import Workspace
+from backend.prefetch import get_transcript_cache
 
 _HTTP_LINK_RE = re.compile(r"https?://[^\s,]+", re.IGNORECASE)
+_INTAKE_NAME_RE = re.compile(r"^(.+)_\d{2}-\d{2}-\d{4}(?:_\d+)?\.\w+$")
+
+
+class _SingleFlight:
+    """
+    Collapse concurrent calls for the same key into one: the first caller
+    runs `fn`, later callers wait on its future and share the result (or
+    exception). Nothing is cached once the call completes.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._inflight: Dict[str, Future] = {}
+
+    def do(self, key: str, fn: Callable, *args, **kwargs):
+        with self._lock:
+            fut = self._inflight.get(key)
+            leader = fut is None
+            if leader:
+                fut = Future()
+                self._inflight[key] = fut
+        if not leader:
+            print(f"🔗 Joining in-flight work for {key}")
+            return fut.result()
+        try:
+            fut.set_result(fn(*args, **kwargs))
+        except BaseException as e:
+            fut.set_exception(e)
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+        return fut.result()
+
+
+_flight = _SingleFlight()
+
+
+def _url_key(link: str) -> str:
+    """Single-flight key for a website: scheme and host are case-insensitive, the path and query are not."""
+    parts = urlsplit(link.strip())
+    return "url:" + urlunsplit(
+        (parts.scheme.lower(), parts.netloc.lower(), parts.path.rstrip("/"), parts.query, "")
+    )
+
+
+def _file_sha256(path: str) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(block)
+    return h.hexdigest()
 
 
 def _parse_audio_links(cell_value: str) -> List[str]:
@@ -40,12 +100,6 @@ def _parse_audio_links(cell_value: str) -> List[str]:
     return links
 
 
-def _save_stream_to_path(stream, path: str):
-    stream.seek(0)
-    with open(path, "wb") as f:
-        f.write(stream.read())
-
-
 def _gs_hyperlink(url: str, text: str) -> str:
     if not url:
         return text or ""
@@ -54,7 +108,100 @@ def _gs_hyperlink(url: str, text: str) -> str:
     return f'=HYPERLINK("{safe_url}","{safe_text}")'
 
 
+def _upload_doc(ws: Workspace, data: bytes, filename: str, folder_id: str) -> str:
+    # The row's own workspace keeps concurrent rows for the same client/date
+    # apart (the Drive name comes from the basename).
+    path = ws.write_bytes(filename, data)
+    try:
+        with span("drive_upload", file=filename) as s:
+            s["bytes"] = len(data)
+            return upload_file_to_drive(path, folder_id)
+    finally:
+        ws.remove(path)
+
+
+def _first_section_timer(record: dict):
+    """on_section callback: note time-to-first-section on the enclosing span."""
+    t0 = time.perf_counter()
+
+    def _on_section(key, _value):
+        record.setdefault("first_section_s", round(time.perf_counter() - t0, 3))
+        record.setdefault("sections", []).append(key)
+    return _on_section
+
+
+def _download_and_transcribe(ws: Workspace, link: str, i: int, total: int) -> str:
+    file_id = extract_file_id_from_url(link) or link.strip()
+    cached = get_transcript_cache().get(file_id)
+    if cached is not None:
+        print(f"🔮 Using prefetched transcript for audio {i}/{total}")
+        return cached
+    # Same Drive file attached to concurrent rows (or still being prefetched):
+    # download/transcribe once
+    transcript = _flight.do(f"drive:{file_id}", _download_and_transcribe_once, ws, link, i, total)
+    if transcript is None:
+        # joined a prefetch that failed; prefetch is best-effort, so redo it here
+        transcript = _download_and_transcribe_once(ws, link, i, total)
+    return transcript
+
+
+def prefetch_audio(file: dict) -> None:
+    """Prefetcher handler: transcribe a freshly uploaded intake file into the cache."""
+    file_id = file["id"]
+    if get_transcript_cache().get(file_id) is not None:
+        return
+    # Intake names files "<client>_<dd-mm-yyyy>[_n].<ext>"
+    m = _INTAKE_NAME_RE.match(file.get("name") or "")
+    with client_context(m.group(1) if m else ""), span("prefetch", file=file_id), \
+            Workspace(f"prefetch-{file_id}") as ws:
+        link = f"https://drive.google.com/file/d/{file_id}/view"
+        errors = []
+
+        def _attempt():
+            try:
+                return _download_and_transcribe_once(ws, link, 1, 1)
+            except Exception as e:
+                errors.append(e)
+                return None  # rows that joined this call must not inherit the error
+
+        _flight.do(f"drive:{file_id}", _attempt)
+        if errors:
+            raise errors[0]
+
+
+def _download_and_transcribe_once(ws: Workspace, link: str, i: int, total: int) -> str:
+    audio_path = ws.path(f"audio_{i}.m4a")
+    chunk_dir = ws.subdir(f"chunks_{i}")
+    try:
+        print(f"🎧 Downloading audio {i}/{total}...")
+        with span("drive_download", audio=i) as s:
+            download_file_from_drive_url(link, audio_path)
+            s["bytes"] = ws.track(audio_path)
+        # Same recording uploaded twice (different IDs): transcribe once
+        digest = _file_sha256(audio_path)
+        print(f"📝 Transcribing audio {i}/{total}...")
+        with span("transcribe", audio=i):
+            transcript = _flight.do(f"sha256:{digest}", transcribe_audio, audio_path, chunk_dir)
+        get_transcript_cache().put(extract_file_id_from_url(link) or link.strip(), transcript)
+        return transcript
+    finally:
+        # no quota check here: it would mask the real download/transcribe error
+        ws.discard(chunk_dir)
+        ws.remove(audio_path)
+
+
 def process_row(row_idx: int, row_data: list):
+    client = row_data[2] if len(row_data) > 2 else ""
+    with row_context(row_idx), client_context(client), profiled("row", f"row{row_idx}"), \
+            span("row") as s, Workspace(f"row{row_idx}") as ws:
+        try:
+            _process_row(row_idx, row_data, ws)
+        finally:
+            s["scratch_bytes"] = ws.bytes_written
+
+
+def _process_row(row_idx: int, row_data: list, ws: Workspace):
+    record_queue_wait(row_data[0], row_data[3] if len(row_data) > 3 else "")
     meeting_date = row_data[1]
     client_name = row_data[2]
     employee_name = row_data[4] if len(row_data) > 4 else ""
@@ -62,105 +209,146 @@ def process_row(row_idx: int, row_data: list):
     meeting_audio_cell = row_data[6]
     website_link = row_data[7]
 
-    # Prepare output cells for Main sheet
-    meeting_summary_cell = ""
-    mom_summary_cell = ""
-    action_points_cell = ""
-    website_summary_cell = ""
+    # Finished stages are checkpointed; a retried row resumes where it failed
+    ckpt = RowCheckpoint(checkpoint_key(row_idx, meeting_audio_cell, website_link))
+    if ckpt.stages():
+        print(f"♻️ Resuming row {row_idx} after: {', '.join(ckpt.stages())}")
+
+    # ---------- Audio and website branches run concurrently ----------
+    # The website branch gets its own thread (with this row's context vars);
+    # the audio branch stays on the row thread.
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix=f"row{row_idx}-web") as pool:
+        website_future = pool.submit(
+            contextvars.copy_context().run,
+            _website_branch, ws, ckpt, website_link, client_name, meeting_date,
+        )
+        audio_cells, audio_error = {}, None
+        try:
+            audio_cells = _audio_branch(
+                ws, ckpt, meeting_audio_cell, client_name, meeting_date, employee_name, employee_email
+            )
+        except Exception as e:
+            audio_error = e
+        website_cells, website_error = {}, None
+        try:
+            website_cells = website_future.result()
+        except Exception as e:
+            website_error = e
+
+    # ---------- Write back to the Main sheet ----------
+    # A failed branch keeps its checkpoints: write what succeeded, leave the
+    # row in "Processing" and re-raise so the retry only redoes that branch.
+    failed = [(name, err) for name, err in (("audio", audio_error), ("website", website_error)) if err]
+    updates = {**audio_cells, **website_cells}
+    if not failed:
+        updates["Status"] = "Done"
+    if updates:
+        with span("sheet_write", target="main"):
+            update_row_values(sheet, row_idx, updates)
+    if failed:
+        for name, err in failed:
+            print(f"❌ Row {row_idx} {name} branch failed: {err}")
+        raise failed[0][1]
+    ckpt.clear()
+    print(f"✅ Row {row_idx} processed for client {client_name}")
+
 
+def _audio_branch(ws: Workspace, ckpt: RowCheckpoint, meeting_audio_cell, client_name, meeting_date,
+                  employee_name, employee_email) -> Dict[str, str]:
+    """Transcribe -> summarise -> render -> upload; returns the Main-sheet cells."""
     # ---------- AUDIO PIPELINE (merge multiple files) ----------
     audio_links = _parse_audio_links(meeting_audio_cell)
-    combined_transcript = ""
-
-    if audio_links:
-        for i, link in enumerate(audio_links, start=1):
-            with tempfile.NamedTemporaryFile(suffix=".m4a", delete=False) as tmp_audio:
-                print(f"🎧 Downloading audio {i}/{len(audio_links)}...")
-                download_file_from_drive_url(link, tmp_audio.name)
-                print(f"📝 Transcribing audio {i}/{len(audio_links)}...")
-                transcript = transcribe_audio(tmp_audio.name)
-                combined_transcript += (transcript.strip() + "\n\n")
-
-        # Summarize ONCE for the combined transcript
+    if not audio_links:
+        return {}
+
+    transcripts = []
+    for i, link in enumerate(audio_links, start=1):
+        transcripts.append(ckpt.stage(f"transcript_{i}", _download_and_transcribe, ws, link, i, len(audio_links)))
+    combined_transcript = "".join(t.strip() + "\n\n" for t in transcripts)
+
+    # Summarize ONCE for the combined transcript
+    def _summarize():
         print("🧠 Generating unified summary from combined transcript...")
-        meeting_summary = generate_summary(combined_transcript)
+        with span("summarize", chars=len(combined_transcript)) as s:
+            return generate_summary(combined_transcript, on_section=_first_section_timer(s))
 
-        base = f"{client_name}_{meeting_date}"
+    meeting_summary = ckpt.stage("summary", _summarize)
 
-        # Full "Meeting Notes"
-        meeting_notes_stream = generate_docx(meeting_summary, client_name, meeting_date, mode="full")
-        meeting_filename = f"{base}_Meeting Notes.docx"
-        meeting_path = os.path.join(tempfile.gettempdir(), meeting_filename)
-        _save_stream_to_path(meeting_notes_stream, meeting_path)
-        meeting_url = upload_file_to_drive(meeting_path, AUDIO_DRIVE_FOLDER_ID)
-        meeting_summary_cell = _gs_hyperlink(meeting_url, meeting_filename)
+    base = f"{client_name}_{meeting_date}"
+    meeting_filename = f"{base}_Meeting Notes.docx"
+    mom_filename = f"{base}_MoM Summary.docx"
+    action_filename = f"{base}_Action Points Summary.docx"
 
-        # ---- Push To-Dos to Output sheet (one row per item) ----
-        try:
-            todos = (meeting_summary or {}).get("todo_list") or []
-            if todos:
-                # Old: append_todos_to_output(output_sheet, todos, meta)
-                from backend.sheet_ops import append_todos_simple
-                append_todos_simple(todos)
-            print(
-                f"🧪 OUTPUT_SHEET_ID={OUTPUT_SHEET_ID} tab={OUTPUT_SHEET_TAB} "
-                f"has_output_sheet={'yes' if output_sheet else 'no'} todos={len(todos)}"
-            )
-            if isinstance(todos, list) and len(todos) > 0 and output_sheet is not None:
-                meta = {
-                    "employee_name": employee_name,
-                    "employee_email": employee_email,
-                    "client_name": client_name,
-                    "source_link": meeting_url,  # goes to 'Source Link' column in Output sheet
-                }
-                append_todos_to_output(output_sheet, todos, meta)
-                print(f"🧾 Pushed {len(todos)} To-Do item(s) to Output sheet.")
-            elif not todos:
-                print("ℹ️ No To-Do items found in summary; skipping Output sheet append.")
-            elif output_sheet is None:
-                print("⚠️ Output sheet handle is None (bad ID/tab or no access); skipping append.")
-        except Exception as e:
-            print(f"⚠️ Failed to append To-Dos to Output sheet: {e}")
-
-        # MoM Summary
-        mom_stream = generate_docx(meeting_summary, client_name, meeting_date, mode="mom")
-        mom_filename = f"{base}_MoM Summary.docx"
-        mom_path = os.path.join(tempfile.gettempdir(), mom_filename)
-        _save_stream_to_path(mom_stream, mom_path)
-        mom_url = upload_file_to_drive(mom_path, MOM_FOLDER_ID)
-        mom_summary_cell = _gs_hyperlink(mom_url, mom_filename)
-
-        # Action Points Summary
-        action_stream = generate_docx(meeting_summary, client_name, meeting_date, mode="action")
-        action_filename = f"{base}_Action Points Summary.docx"
-        action_path = os.path.join(tempfile.gettempdir(), action_filename)
-        _save_stream_to_path(action_stream, action_path)
-        action_url = upload_file_to_drive(action_path, ACTION_POINT_FOLDER_ID)
-        action_points_cell = _gs_hyperlink(action_url, action_filename)
+    # Full "Meeting Notes", MoM and Action Points rendered in one pass
+    docs = {}
+    if not all(ckpt.done(k) for k in ("meeting_url", "mom_url", "action_url")):
+        with span("docx_render", mode="full+mom+action"):
+            docs = run_cpu(render_meeting_docx, meeting_summary, client_name, meeting_date, ("full", "mom", "action"))
+
+    meeting_url = ckpt.stage("meeting_url", _upload_doc, ws, docs.get("full"), meeting_filename, AUDIO_DRIVE_FOLDER_ID)
+
+    # ---- Queue To-Dos for the Output sheet (one row per item) ----
+    try:
+        todos = (meeting_summary or {}).get("todo_list") or []
+        if ckpt.done("todos_pushed"):
+            pass
+        elif isinstance(todos, list) and todos:
+            meta = {
+                "employee_name": employee_name,
+                "employee_email": employee_email,
+                "client_name": client_name,
+                "source_link": meeting_url,  # goes to 'Source Link' column in Output sheet
+            }
+            task_ids = deterministic_task_ids(ckpt.key, todos)
+            queued = get_output_writer().add(todos, meta, task_ids)
+            ckpt.save("todos_pushed")
+            print(f"🧾 Queued {queued} To-Do item(s) for the Output sheet.")
+        else:
+            print("ℹ️ No To-Do items found in summary; skipping Output sheet append.")
+    except Exception as e:
+        print(f"⚠️ Failed to queue To-Dos for Output sheet: {e}")
+
+    # MoM Summary
+    mom_url = ckpt.stage("mom_url", _upload_doc, ws, docs.get("mom"), mom_filename, MOM_FOLDER_ID)
+
+    # Action Points Summary
+    action_url = ckpt.stage("action_url", _upload_doc, ws, docs.get("action"), action_filename, ACTION_POINT_FOLDER_ID)
+
+    return {
+        "Meeting Summary": _gs_hyperlink(meeting_url, meeting_filename),
+        "MoM Summary": _gs_hyperlink(mom_url, mom_filename),
+        "Action Points Summary": _gs_hyperlink(action_url, action_filename),
+    }
 
+
+def _website_branch(ws: Workspace, ckpt: RowCheckpoint, website_link, client_name, meeting_date) -> Dict[str, str]:
+    """Fetch -> shape -> summarise -> render -> upload; returns the Main-sheet cell."""
     # ---------- WEBSITE PIPELINE ----------
-    if website_link and str(website_link).strip():
-        page_text = extract_text_from_url(website_link.strip())
-        website_summary = summarize_with_openai(page_text)
-        website_stream = generate_website_docx(website_summary, client_name, meeting_date)
-        website_filename = f"{client_name}_{meeting_date}_Website Summary.docx"
-        website_path = os.path.join(tempfile.gettempdir(), website_filename)
-        _save_stream_to_path(website_stream, website_path)
-        website_url = upload_file_to_drive(website_path, WEBSITE_DRIVE_FOLDER_ID)
-        website_summary_cell = _gs_hyperlink(website_url, website_filename)
-    else:
-        website_summary_cell = "NA"
+    if not (website_link and str(website_link).strip()):
+        return {"Website Summary": "NA"}
 
-    # ---------- Write back to the Main sheet ----------
-    update_row_values(
-        sheet,
-        row_idx,
-        {
-            "Meeting Summary": meeting_summary_cell,
-            "Website Summary": website_summary_cell,
-            "MoM Summary": mom_summary_cell,
-            "Action Points Summary": action_points_cell,
-            "Status": "Done",
-        },
-    )
-    print(f"✅ Row {row_idx} processed for client {client_name}")
+    def _website_summary():
+        with span("website_fetch") as s:
+            page = fetch_page(website_link.strip())
+            page_text = shape_page_text(page.blocks)
+            s.update(bytes=page.bytes_read, truncated=page.truncated,
+                     raw_chars=len(page.text), chars=len(page_text))
+        with span("website_summarize") as s:
+            return summarize_with_openai(page_text, on_section=_first_section_timer(s))
+
+    website_filename = f"{client_name}_{meeting_date}_Website Summary.docx"
+
+    def _website_doc_url():
+        # Same website on concurrent rows: scrape and summarise once
+        website_summary = ckpt.stage("website_summary", _flight.do, _url_key(website_link), _website_summary)
+        with span("docx_render", mode="website"):
+            website_doc = run_cpu(render_website_docx, website_summary, client_name, meeting_date)
+        return _upload_doc(ws, website_doc, website_filename, WEBSITE_DRIVE_FOLDER_ID)
+
+    try:
+        website_url = ckpt.stage("website_url", _website_doc_url)
+    except UnsupportedContentError as e:
+        # PDF / video / binary link: retrying can't help, so finish the row
+        print(f"⚠️ Website summary skipped: {e}")
+        return {"Website Summary": f"Unsupported content ({e.content_type})"}
+    return {"Website Summary": _gs_hyperlink(website_url, website_filename)}
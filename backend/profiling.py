@@ -0,0 +1,107 @@
+# backend/profiling.py
+"""
+On-demand profiling, switched on from the environment (no code edits):
+
+    PROFILE_MODE=cpu|mem|all   PROFILE_EVERY_N=10   PROFILE_DIR=profiles
+
+`profiled(stage, key)` wraps one unit of work (a row in process_row, a file in
+the intake upload). Every PROFILE_EVERY_N-th call per stage is profiled:
+- cpu: cProfile stats -> <stage>_<key>_<ts>.pstats (load with pstats/snakeviz)
+  plus a .txt with the top PROFILE_TOP_N functions by cumulative time;
+- mem: tracemalloc diff -> <stage>_<key>_<ts>.mem.txt with the top
+  allocation sites and the traced peak.
+
+Only one block is profiled at a time (cProfile and tracemalloc are effectively
+process-wide); a sampled call that finds the profiler busy just runs
+unprofiled. cProfile sees the calling thread only, while tracemalloc counts
+every thread — concurrent rows show up in the memory diff.
+"""
+import cProfile
+import io
+import os
+import pstats
+import re
+import threading
+import time
+import tracemalloc
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, Iterator
+
+from config.config import PROFILE_MODE, PROFILE_DIR, PROFILE_EVERY_N, PROFILE_TOP_N
+
+_busy = threading.Lock()
+_counts: Dict[str, int] = defaultdict(int)
+_counts_lock = threading.Lock()
+
+
+def _sampled(stage: str) -> bool:
+    with _counts_lock:
+        _counts[stage] += 1
+        return (_counts[stage] - 1) % max(1, PROFILE_EVERY_N) == 0
+
+
+def _base_path(stage: str, key: str) -> str:
+    safe = re.sub(r"[^A-Za-z0-9_.-]+", "-", f"{stage}_{key}").strip("-")
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    return os.path.join(PROFILE_DIR, f"{safe}_{time.strftime('%Y%m%d-%H%M%S')}")
+
+
+def _write_cpu(profiler: cProfile.Profile, base: str) -> None:
+    profiler.dump_stats(base + ".pstats")
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(PROFILE_TOP_N)
+    with open(base + ".txt", "w", encoding="utf-8") as f:
+        f.write(out.getvalue())
+
+
+def _write_mem(before: tracemalloc.Snapshot, after: tracemalloc.Snapshot, peak: int, base: str) -> None:
+    lines = [f"traced peak: {peak / (1024 * 1024):.1f} MiB", ""]
+    own = [tracemalloc.Filter(False, m.__file__) for m in (tracemalloc, cProfile)]
+    diff = after.filter_traces(own).compare_to(before.filter_traces(own), "lineno")
+    for stat in diff[:PROFILE_TOP_N]:
+        lines.append(str(stat))
+    with open(base + ".mem.txt", "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+@contextmanager
+def profiled(stage: str, key: str = "") -> Iterator[None]:
+    mode = PROFILE_MODE
+    if mode not in ("cpu", "mem", "all") or not _sampled(stage) or not _busy.acquire(blocking=False):
+        yield
+        return
+
+    cpu = mode in ("cpu", "all")
+    mem = mode in ("mem", "all")
+    profiler = cProfile.Profile() if cpu else None
+    started_tracing = False
+    try:
+        if mem:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(10)
+                started_tracing = True
+            tracemalloc.reset_peak()
+            before = tracemalloc.take_snapshot()
+        if profiler:
+            profiler.enable()
+        try:
+            yield
+        finally:
+            if profiler:
+                profiler.disable()
+            if mem:  # snapshot before writing anything, so the report stays clean
+                after, peak = tracemalloc.take_snapshot(), tracemalloc.get_traced_memory()[1]
+            try:
+                base = _base_path(stage, key)
+                if profiler:
+                    _write_cpu(profiler, base)
+                if mem:
+                    _write_mem(before, after, peak, base)
+                print(f"🔬 Profile for {stage} {key} written to {base}.*")
+            except OSError as e:
+                print(f"⚠️ Could not write profile for {stage} {key}: {e}")
+    finally:
+        if started_tracing:
+            tracemalloc.stop()
+        _busy.release()
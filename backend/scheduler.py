@@ -0,0 +1,181 @@
+# backend/scheduler.py
+"""
+Priority and fair-share ordering of pending Main-sheet rows.
+
+Each row's priority grows with how much of its meeting type's SLA
+(SLA_TARGETS_SECONDS, column D) it has already waited since its Timestamp,
+scaled by MEETING_TYPE_WEIGHTS, and shrinks with its estimated cost (audio
+bytes from Drive metadata). Rows are then picked greedily with a per-client
+penalty, so one client's backlog cannot starve everyone else. Rows past
+their SLA always come first.
+"""
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Set, Tuple
+
+from config.config import (
+    drive_service,
+    SLA_TARGETS_SECONDS,
+    MEETING_TYPE_WEIGHTS,
+    SCHEDULER_COST_MB_SCALE,
+    SCHEDULER_FAIRNESS_PENALTY,
+)
+from backend.drive_ops import extract_file_id_from_url
+from backend.telemetry import Histogram, parse_intake_timestamp, register_histogram
+
+DEFAULT_SLA_SECONDS = 4 * 3600
+
+SLA_RATIO = register_histogram(
+    Histogram(
+        "fms_queue_sla_ratio",
+        "Queue wait as a fraction of the meeting type's SLA, at dispatch.",
+        (0.1, 0.25, 0.5, 0.75, 1, 1.5, 2, 4, 8),
+    )
+)
+
+
+@dataclass
+class PendingRow:
+    idx: int
+    row: dict
+    meeting_type: str
+    client: str
+    waited_s: float
+    cost_bytes: int
+    score: float = field(default=0.0)
+
+    @property
+    def sla_s(self) -> float:
+        return SLA_TARGETS_SECONDS.get(self.meeting_type, DEFAULT_SLA_SECONDS)
+
+    @property
+    def sla_ratio(self) -> float:
+        return self.waited_s / max(self.sla_s, 1.0)
+
+
+_size_cache: Dict[str, int] = {}
+_size_lock = threading.Lock()
+_last_snapshot: dict = {}
+_dispatched: Dict[Tuple[int, str], None] = {}  # rows already counted in SLA_RATIO
+_dispatched_lock = threading.Lock()
+_DISPATCHED_MAX = 10000
+_unstarted: Set[int] = set()  # rows of the last ordering not yet dispatched
+
+
+def _col(row: dict, i: int) -> str:
+    # positional, like process_row: C=client, D=meeting type, G=audio links
+    values = list(row.values())
+    return str(values[i]).strip() if len(values) > i else ""
+
+
+def _audio_links(row: dict) -> List[str]:
+    from backend.processor import _parse_audio_links
+
+    return _parse_audio_links(_col(row, 6))
+
+
+def _drive_size(file_id: str) -> int:
+    with _size_lock:
+        if file_id in _size_cache:
+            return _size_cache[file_id]
+    try:
+        meta = drive_service.files().get(fileId=file_id, fields="size", supportsAllDrives=True).execute()
+        size = int(meta.get("size") or 0)
+    except Exception:
+        size = 0  # unknown cost: neither favoured nor penalised much
+    with _size_lock:
+        _size_cache[file_id] = size
+    return size
+
+
+def estimate_cost(row: dict) -> int:
+    total = 0
+    for link in _audio_links(row):
+        file_id = extract_file_id_from_url(link)
+        if file_id:
+            total += _drive_size(file_id)
+    return total
+
+
+def _pending(idx: int, row: dict, now: float, with_cost: bool = True) -> PendingRow:
+    meeting_type = _col(row, 3).title()
+    client = _col(row, 2)
+    submitted = parse_intake_timestamp(_col(row, 0))
+    waited = max(0.0, now - submitted) if submitted else 0.0
+    return PendingRow(idx, row, meeting_type, client, waited, estimate_cost(row) if with_cost else 0)
+
+
+def _base_score(p: PendingRow) -> float:
+    weight = MEETING_TYPE_WEIGHTS.get(p.meeting_type, 1.0)
+    cost_factor = 1.0 + (p.cost_bytes / (1024 * 1024)) / max(SCHEDULER_COST_MB_SCALE, 1.0)
+    score = weight * (1.0 + p.sla_ratio) / cost_factor
+    if p.sla_ratio >= 1.0:
+        score += 1000.0 * p.sla_ratio  # SLA already missed: go now
+    return score
+
+
+def order(rows: List[Tuple[int, dict]], now: Optional[float] = None) -> List[Tuple[int, dict]]:
+    """Return `rows` ((idx, record) pairs) in dispatch order."""
+    now = now or time.time()
+    pending = [_pending(idx, row, now) for idx, row in rows]
+    for p in pending:
+        p.score = _base_score(p)
+
+    served: Dict[str, int] = {}
+    ordered: List[PendingRow] = []
+    remaining = list(pending)
+    while remaining:
+        best = max(
+            remaining,
+            key=lambda p: (p.score / (1.0 + SCHEDULER_FAIRNESS_PENALTY * served.get(p.client, 0)), -p.idx),
+        )
+        remaining.remove(best)
+        served[best.client] = served.get(best.client, 0) + 1
+        ordered.append(best)
+
+    _record_snapshot(ordered, now)
+    return [(p.idx, p.row) for p in ordered]
+
+
+def observe_dispatch(idx: int, row: dict, now: Optional[float] = None) -> None:
+    """Record the row's SLA ratio as it starts; retries of the same row are not re-counted."""
+    key = (idx, _col(row, 0))
+    with _dispatched_lock:
+        _unstarted.discard(idx)
+        if key in _dispatched:
+            return
+        _dispatched[key] = None
+        if len(_dispatched) > _DISPATCHED_MAX:
+            del _dispatched[next(iter(_dispatched))]
+    p = _pending(idx, row, now or time.time(), with_cost=False)
+    SLA_RATIO.observe(p.sla_ratio, meeting_type=p.meeting_type or "unknown")
+
+
+def _record_snapshot(ordered: List[PendingRow], now: float) -> None:
+    global _last_snapshot
+    by_type: Dict[str, int] = {}
+    for p in ordered:
+        by_type[p.meeting_type or "unknown"] = by_type.get(p.meeting_type or "unknown", 0) + 1
+    with _dispatched_lock:
+        _unstarted.clear()
+        _unstarted.update(p.idx for p in ordered)
+    _last_snapshot = {
+        "at": now,
+        "depth": len(ordered),
+        "by_type": by_type,
+        "oldest_wait_s": round(max((p.waited_s for p in ordered), default=0.0), 1),
+        "sla_breaches": sum(1 for p in ordered if p.sla_ratio >= 1.0),
+        "next": [p.idx for p in ordered[:10]],
+    }
+
+
+def queue_snapshot() -> dict:
+    """Last ordering's queue depth / wait summary (served under "scheduler" on /queue)."""
+    return dict(_last_snapshot, unstarted=len(unstarted_rows()))
+
+
+def unstarted_rows() -> Set[int]:
+    """Rows from the last ordering that have not been dispatched yet."""
+    with _dispatched_lock:
+        return set(_unstarted)
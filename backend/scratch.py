@@ -0,0 +1,160 @@
+# backend/scratch.py
+"""
+Per-row scratch workspaces.
+
+Every row gets its own directory under SCRATCH_DIR (downloads, audio chunks,
+rendered docs) with a size quota, and the whole tree is removed when the row
+finishes — success or failure. Small artifacts (rendered .docx) can go to a
+RAM-backed directory (SCRATCH_RAM_DIR, e.g. /dev/shm) instead of disk.
+"""
+import os
+import shutil
+import tempfile
+import threading
+import time
+from typing import Optional
+
+from config.config import (
+    SCRATCH_DIR,
+    SCRATCH_QUOTA_MB,
+    SCRATCH_RAM_DIR,
+    SCRATCH_RAM_MAX_MB,
+)
+from backend.telemetry import BYTES_BUCKETS, Histogram, register_histogram
+
+MB = 1024 * 1024
+
+SCRATCH_BYTES = register_histogram(
+    Histogram("fms_scratch_bytes", "Bytes written to scratch space per row.", BYTES_BUCKETS)
+)
+
+
+class ScratchQuotaExceeded(RuntimeError):
+    pass
+
+
+def _dir_usage(path: str) -> int:
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total
+
+
+class Workspace:
+    def __init__(
+        self,
+        name: str,
+        root: str = SCRATCH_DIR,
+        quota_bytes: int = SCRATCH_QUOTA_MB * MB,
+        ram_root: str = SCRATCH_RAM_DIR,
+        ram_max_bytes: int = SCRATCH_RAM_MAX_MB * MB,
+    ):
+        os.makedirs(root, exist_ok=True)
+        self.dir = tempfile.mkdtemp(prefix=f"{name}_", dir=root)
+        self.ram_dir: Optional[str] = None
+        if ram_root:
+            try:
+                os.makedirs(ram_root, exist_ok=True)
+                self.ram_dir = tempfile.mkdtemp(prefix=f"{name}_", dir=ram_root)
+            except OSError:
+                self.ram_dir = None
+        self.quota_bytes = quota_bytes
+        self.ram_max_bytes = ram_max_bytes
+        self.bytes_written = 0
+        self._lock = threading.Lock()
+
+    # ---- paths ----
+    def path(self, name: str, small: bool = False) -> str:
+        """Path for a new artifact; `small` ones prefer the RAM directory."""
+        base = self.ram_dir if (small and self.ram_dir) else self.dir
+        return os.path.join(base, os.path.basename(name))
+
+    def subdir(self, name: str) -> str:
+        path = os.path.join(self.dir, name)
+        os.makedirs(path, exist_ok=True)
+        return path
+
+    # ---- accounting ----
+    def usage(self) -> int:
+        used = _dir_usage(self.dir)
+        if self.ram_dir:
+            used += _dir_usage(self.ram_dir)
+        return used
+
+    def track(self, path: str) -> int:
+        """Count a file written by someone else (download, pool worker) against the quota."""
+        size = os.path.getsize(path) if os.path.isfile(path) else _dir_usage(path)
+        with self._lock:
+            self.bytes_written += size
+        self._check()
+        return size
+
+    def _check(self) -> None:
+        used = self.usage()
+        if used > self.quota_bytes:
+            raise ScratchQuotaExceeded(
+                f"Scratch quota exceeded in {self.dir}: {used / MB:.1f} MB > {self.quota_bytes / MB:.0f} MB"
+            )
+
+    def write_bytes(self, name: str, data: bytes) -> str:
+        """Write `data`; artifacts up to SCRATCH_RAM_MAX_MB go to the RAM dir."""
+        path = self.path(name, small=len(data) <= self.ram_max_bytes)
+        if self.usage() + len(data) > self.quota_bytes:
+            raise ScratchQuotaExceeded(f"Writing {name} ({len(data) / MB:.1f} MB) would exceed scratch quota")
+        with open(path, "wb") as f:
+            f.write(data)
+        with self._lock:
+            self.bytes_written += len(data)
+        return path
+
+    def discard(self, path: str) -> None:
+        """Count a finished file or directory in the row's bytes, then delete it (no quota check)."""
+        size = os.path.getsize(path) if os.path.isfile(path) else _dir_usage(path)
+        with self._lock:
+            self.bytes_written += size
+        if os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            self.remove(path)
+
+    @staticmethod
+    def remove(path: str) -> None:
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    # ---- lifecycle ----
+    def cleanup(self) -> None:
+        for d in (self.dir, self.ram_dir):
+            if d:
+                shutil.rmtree(d, ignore_errors=True)
+        SCRATCH_BYTES.observe(self.bytes_written)
+
+    def __enter__(self) -> "Workspace":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.cleanup()
+
+
+def sweep_stale(max_age_seconds: float = 24 * 3600) -> int:
+    """Remove workspaces left behind by a crashed process; returns dirs removed."""
+    removed = 0
+    cutoff = time.time() - max_age_seconds
+    for root in (SCRATCH_DIR, SCRATCH_RAM_DIR):
+        if not root or not os.path.isdir(root):
+            continue
+        for name in os.listdir(root):
+            path = os.path.join(root, name)
+            try:
+                if os.path.isdir(path) and os.path.getmtime(path) < cutoff:
+                    shutil.rmtree(path, ignore_errors=True)
+                    removed += 1
+            except OSError:
+                continue
+    return removed
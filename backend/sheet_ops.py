@@ -1,9 +1,8 @@
-from typing import List, Dict
+from typing import List, Dict, Optional
 from datetime import datetime
 from pytz import timezone
 import uuid
 import gspread
-from config.config import OUTPUT_SHEET_ID
 
 def update_row_values(sheet_obj, row_number: int, updates: dict):
     """Update specific columns in a row by header name."""
@@ -40,19 +39,13 @@ def _ensure_headers(ws: gspread.Worksheet) -> List[str]:
         return expected
     return headers
 
-def append_todos_to_output(
-    output_ws,
+def build_todo_rows(
+    headers: List[str],
     todos: List[str],
     meta: Dict[str, str],
-):
-    if output_ws is None:
-        print("⚠️ Output worksheet handle is None.")
-        return
-    if not todos:
-        print("ℹ️ No To-Do items to append.")
-        return
-
-    headers: List[str] = _ensure_headers(output_ws)
+    task_ids: Optional[List[str]] = None,
+) -> List[List[str]]:
+    """One Output-sheet row per non-empty To-Do, laid out by header name."""
     ncols = max(len(headers), 17)
 
     # Column indices (0-based)
@@ -71,19 +64,35 @@ def append_todos_to_output(
     ist_now = datetime.now(timezone("Asia/Kolkata")).strftime("%d/%m/%Y %H:%M:%S")
 
     rows: List[List[str]] = []
-    for todo in todos:
+    for i, todo in enumerate(todos):
         if not todo or not str(todo).strip():
             continue
+        task_id = task_ids[i] if task_ids and i < len(task_ids) else uuid.uuid4().hex[:8]
         row = [""] * ncols
         if idx_created_ts >= 0: row[idx_created_ts] = ist_now
-        if idx_task_id   >= 0: row[idx_task_id]     = uuid.uuid4().hex[:8]
+        if idx_task_id   >= 0: row[idx_task_id]     = task_id
         if idx_desc      >= 0: row[idx_desc]        = str(todo).strip()
         if idx_emp_name  >= 0: row[idx_emp_name]    = meta.get("employee_name", "")
         if idx_emp_email >= 0: row[idx_emp_email]   = meta.get("employee_email", "")
         if idx_client    >= 0: row[idx_client]      = meta.get("client_name", "")
         if idx_src       >= 0: row[idx_src]         = meta.get("source_link", "")
         rows.append(row)
+    return rows
 
+def append_todos_to_output(
+    output_ws,
+    todos: List[str],
+    meta: Dict[str, str],
+):
+    """Direct (unbuffered) append; the pipeline uses backend.output_writer."""
+    if output_ws is None:
+        print("⚠️ Output worksheet handle is None.")
+        return
+    if not todos:
+        print("ℹ️ No To-Do items to append.")
+        return
+
+    rows = build_todo_rows(_ensure_headers(output_ws), todos, meta)
     if not rows:
         print("ℹ️ All To-Do items were empty after trimming; nothing to append.")
         return
@@ -93,23 +102,3 @@ def append_todos_to_output(
         print(f"✅ Appended {len(rows)} To-Do rows to Output sheet.")
     except Exception as e:
         print(f"❌ Failed to append To-Do rows: {e}")
-
-def append_todos_simple(todos: list):
-    """Append To-Dos into the Output sheet, each in column C (Task Description)."""
-    if not todos:
-        print("ℹ️ No To-Do items to append.")
-        return
-
-    try:
-        gc = gspread.service_account(filename="service_account.json")  # adjust path if needed
-        sh = gc.open_by_key(OUTPUT_SHEET_ID)
-        ws = sh.sheet1  # first sheet/tab
-
-        # Prepare rows: empty cols A, B, D… only C gets filled
-        rows = [["", "", str(todo)] for todo in todos if str(todo).strip()]
-
-        if rows:
-            ws.append_rows(rows, value_input_option="USER_ENTERED")
-            print(f"✅ Appended {len(rows)} To-Do rows into column C of output sheet.")
-    except Exception as e:
-        print(f"❌ Failed to append To-Dos: {e}")
\ No newline at end of file
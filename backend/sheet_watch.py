@@ -0,0 +1,60 @@
+# backend/sheet_watch.py
+"""
+Cheap change detection for the daemon's poll loop.
+
+Instead of a full Main-sheet read every cycle, the daemon asks Drive for the
+spreadsheet's `version` / `modifiedTime` (one small metadata call) and only
+reads the sheet when those moved. `PollBackoff` stretches the wait between
+probes while the queue stays empty and snaps back when work shows up.
+"""
+from typing import Optional, Tuple
+
+from config.config import drive_service
+
+
+class SheetChangeWatcher:
+    def __init__(self, spreadsheet_id: str, service=None):
+        self.spreadsheet_id = spreadsheet_id
+        self._service = service
+        self._last: Optional[Tuple[str, str]] = None
+
+    def changed(self) -> bool:
+        """
+        True if the spreadsheet changed since the last probe (always True on
+        the first call, and on probe errors so a failure never hides work).
+        """
+        service = self._service or drive_service
+        try:
+            meta = service.files().get(
+                fileId=self.spreadsheet_id,
+                fields="version,modifiedTime",
+                supportsAllDrives=True,
+            ).execute()
+        except Exception as e:
+            print(f"⚠️ Change probe failed, falling back to a sheet read: {e}")
+            return True
+        stamp = (str(meta.get("version", "")), str(meta.get("modifiedTime", "")))
+        if stamp == self._last:
+            return False
+        self._last = stamp
+        return True
+
+
+class PollBackoff:
+    """Exponential idle backoff between `min_s` and `max_s`."""
+
+    def __init__(self, min_s: float, max_s: float, factor: float = 2.0):
+        self.min_s = max(0.1, min_s)
+        self.max_s = max(self.min_s, max_s)
+        self.factor = max(1.0, factor)
+        self._current = self.min_s
+
+    def reset(self) -> float:
+        self._current = self.min_s
+        return self._current
+
+    def next(self) -> float:
+        """Current delay, then grow it for the following idle cycle."""
+        delay = self._current
+        self._current = min(self.max_s, self._current * self.factor)
+        return delay
@@ -0,0 +1,170 @@
+# backend/telemetry.py
+"""
+Per-row timing spans and in-process metrics.
+
+`span(stage, ...)` times one pipeline stage: every span is appended as a JSON
+line to SPANS_JSONL_PATH and observed into the `fms_stage_seconds` histogram.
+`render_prometheus()` returns all histograms in Prometheus text format; the
+daemon serves it on /metrics (see backend/trigger.py).
+"""
+import bisect
+import contextvars
+import json
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from pytz import timezone
+
+from config.config import SPANS_JSONL_PATH
+
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800)
+BYTES_BUCKETS = tuple(2 ** p for p in range(10, 34, 2))  # 1 KiB .. 8 GiB
+QUEUE_WAIT_BUCKETS = (1, 5, 15, 30, 60, 120, 300, 600, 1800, 3600, 4 * 3600, 24 * 3600)
+
+_current_row: contextvars.ContextVar[Optional[int]] = contextvars.ContextVar("fms_row", default=None)
+_write_lock = threading.Lock()
+
+
+class Histogram:
+    """Cumulative-bucket histogram keyed by a sorted label tuple."""
+
+    def __init__(self, name: str, help_text: str, buckets: Tuple[float, ...]):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._series: Dict[Tuple[Tuple[str, str], ...], List[float]] = {}
+
+    def observe(self, value: float, **labels) -> None:
+        key = tuple(sorted((k, str(v)) for k, v in labels.items()))
+        with self._lock:
+            # layout: [bucket counts..., +Inf count, sum]
+            series = self._series.setdefault(key, [0.0] * (len(self.buckets) + 2))
+            series[bisect.bisect_left(self.buckets, value)] += 1
+            series[-1] += value
+
+    def snapshot(self) -> Dict[Tuple[Tuple[str, str], ...], List[float]]:
+        with self._lock:
+            return {k: list(v) for k, v in self._series.items()}
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        for key, series in sorted(self.snapshot().items()):
+            base = ",".join(f'{k}="{v}"' for k, v in key)
+            sep = "," if base else ""
+            cumulative = 0.0
+            for bound, count in zip(self.buckets, series):
+                cumulative += count
+                lines.append(f'{self.name}_bucket{{{base}{sep}le="{bound:g}"}} {cumulative:g}')
+            cumulative += series[len(self.buckets)]
+            lines.append(f'{self.name}_bucket{{{base}{sep}le="+Inf"}} {cumulative:g}')
+            lines.append(f"{self.name}_sum{{{base}}} {series[-1]:g}")
+            lines.append(f"{self.name}_count{{{base}}} {cumulative:g}")
+        return lines
+
+
+STAGE_SECONDS = Histogram("fms_stage_seconds", "Pipeline stage latency in seconds.", LATENCY_BUCKETS)
+TRANSFER_BYTES = Histogram("fms_transfer_bytes", "Bytes transferred per stage.", BYTES_BUCKETS)
+QUEUE_WAIT_SECONDS = Histogram(
+    "fms_queue_wait_seconds", "Time from intake Timestamp to processing start.", QUEUE_WAIT_BUCKETS
+)
+
+_HISTOGRAMS: List[Histogram] = [STAGE_SECONDS, TRANSFER_BYTES, QUEUE_WAIT_SECONDS]
+
+
+def register_histogram(hist: Histogram) -> Histogram:
+    """Expose an extra histogram on /metrics."""
+    _HISTOGRAMS.append(hist)
+    return hist
+
+
+def _emit(record: dict) -> None:
+    if not SPANS_JSONL_PATH:
+        return
+    line = json.dumps(record, default=str, ensure_ascii=False)
+    try:
+        with _write_lock, open(SPANS_JSONL_PATH, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+    except OSError as e:
+        print(f"⚠️ Could not write span to {SPANS_JSONL_PATH}: {e}")
+
+
+def current_row() -> Optional[int]:
+    return _current_row.get()
+
+
+@contextmanager
+def row_context(row_idx: Optional[int]) -> Iterator[None]:
+    """Attach `row_idx` to every span opened in this context."""
+    token = _current_row.set(row_idx)
+    try:
+        yield
+    finally:
+        _current_row.reset(token)
+
+
+@contextmanager
+def span(stage: str, **attrs) -> Iterator[dict]:
+    """
+    Time a stage. Yields a dict the caller may enrich (e.g. `s["bytes"] = n`);
+    a "bytes" attribute is also observed into `fms_transfer_bytes`.
+    """
+    started = time.time()
+    t0 = time.perf_counter()
+    record = {"row": _current_row.get(), "stage": stage, **attrs}
+    ok = True
+    try:
+        yield record
+    except BaseException as e:
+        ok = False
+        record["error"] = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        duration = time.perf_counter() - t0
+        record.update({"ts": started, "duration_s": round(duration, 6), "ok": ok})
+        STAGE_SECONDS.observe(duration, stage=stage, ok=str(ok).lower())
+        if record.get("bytes"):
+            TRANSFER_BYTES.observe(float(record["bytes"]), stage=stage)
+        _emit(record)
+
+
+def parse_intake_timestamp(timestamp_cell) -> Optional[float]:
+    """Epoch seconds of an intake Timestamp cell (IST, "%Y-%m-%d %H:%M:%S")."""
+    try:
+        ist = timezone("Asia/Kolkata")
+        return ist.localize(datetime.strptime(str(timestamp_cell).strip(), "%Y-%m-%d %H:%M:%S")).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def record_queue_wait(timestamp_cell: str, meeting_type: str = "") -> Optional[float]:
+    """Observe the wait since the intake Timestamp."""
+    submitted = parse_intake_timestamp(timestamp_cell)
+    if submitted is None:
+        return None
+    waited = max(0.0, time.time() - submitted)
+    QUEUE_WAIT_SECONDS.observe(waited, meeting_type=meeting_type or "unknown")
+    _emit({"row": _current_row.get(), "stage": "queue_wait", "ts": time.time(),
+           "duration_s": round(waited, 3), "meeting_type": meeting_type, "ok": True})
+    return waited
+
+
+def mean_stage_seconds(stage: str) -> Optional[float]:
+    """Mean latency of successful `stage` spans so far (None if none yet)."""
+    total = count = 0.0
+    for key, series in STAGE_SECONDS.snapshot().items():
+        labels = dict(key)
+        if labels.get("stage") == stage and labels.get("ok") == "true":
+            count += sum(series[:-1])
+            total += series[-1]
+    return total / count if count else None
+
+
+def render_prometheus() -> str:
+    lines: List[str] = []
+    for hist in _HISTOGRAMS:
+        lines.extend(hist.render())
+    return "\n".join(lines) + "\n"
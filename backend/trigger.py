@@ -0,0 +1,126 @@
+# backend/trigger.py
+"""
+Push-based wake-up channel for the backend worker.
+
+The frontend POSTs {"row": <sheet row>} to /trigger right after appending a
+Main-sheet row; the daemon loop in backend/main.py blocks on
+`wait_for_trigger()` and starts on the hinted row immediately. The periodic
+sheet poll stays as a reconciliation fallback. The same server exposes
+Prometheus metrics on /metrics and queue depth / ETA on /queue (used by the
+intake form for admission control). When TRIGGER_TOKEN is set, every route
+except /healthz needs it in the X-Trigger-Token header; without it the server
+only binds to 127.0.0.1.
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, List, Optional
+
+from config.config import TRIGGER_TOKEN
+from backend.telemetry import render_prometheus
+
+_wake = threading.Event()
+_lock = threading.Lock()
+_hinted_rows: List[int] = []
+_queue_provider: Optional[Callable[[], dict]] = None
+
+
+def set_queue_provider(fn: Callable[[], dict]) -> None:
+    """Register the callable that answers GET /queue (depth / ETA)."""
+    global _queue_provider
+    _queue_provider = fn
+
+
+def notify(row_idx: Optional[int] = None) -> None:
+    """Wake the worker; `row_idx` (if known) is processed before a full poll."""
+    with _lock:
+        if row_idx and row_idx not in _hinted_rows:
+            _hinted_rows.append(row_idx)
+    _wake.set()
+
+
+def pending_hints() -> int:
+    """Hinted rows not yet picked up by the worker."""
+    with _lock:
+        return len(_hinted_rows)
+
+
+def wait_for_trigger(timeout: float) -> Optional[List[int]]:
+    """
+    Block until a trigger arrives or `timeout` elapses.
+    Returns hinted row numbers (possibly empty) on trigger, None on timeout.
+    """
+    if not _wake.wait(timeout):
+        return None
+    with _lock:
+        _wake.clear()
+        rows = list(_hinted_rows)
+        _hinted_rows.clear()
+    return rows
+
+
+class _TriggerHandler(BaseHTTPRequestHandler):
+    def _reply(self, code: int, payload: dict) -> None:
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _authorized(self) -> bool:
+        if TRIGGER_TOKEN and self.headers.get("X-Trigger-Token", "") != TRIGGER_TOKEN:
+            self._reply(403, {"error": "bad token"})
+            return False
+        return True
+
+    def do_GET(self):
+        if self.path == "/healthz":
+            self._reply(200, {"ok": True})
+        elif self.path in ("/queue", "/metrics") and not self._authorized():
+            return
+        elif self.path == "/queue":
+            self._reply(200, _queue_provider() if _queue_provider else {})
+        elif self.path == "/metrics":
+            body = render_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+        else:
+            self._reply(404, {"error": "not found"})
+
+    def do_POST(self):
+        if self.path != "/trigger":
+            self._reply(404, {"error": "not found"})
+            return
+        if not self._authorized():
+            return
+        try:
+            length = int(self.headers.get("Content-Length") or 0)
+            payload = json.loads(self.rfile.read(length) or b"{}") if length else {}
+            row_idx = int(payload.get("row") or 0) or None
+        except (ValueError, TypeError, AttributeError):
+            self._reply(400, {"error": "bad payload"})
+            return
+        notify(row_idx)
+        self._reply(202, {"queued": row_idx})
+
+    def log_message(self, fmt, *args):  # keep stdout for pipeline logs
+        pass
+
+
+def start_trigger_server(port: int) -> ThreadingHTTPServer:
+    """
+    Serve the endpoints on all interfaces when TRIGGER_TOKEN is set; without
+    a token only on 127.0.0.1, so an unconfigured daemon is not open to the
+    network.
+    """
+    host = "0.0.0.0" if TRIGGER_TOKEN else "127.0.0.1"
+    if not TRIGGER_TOKEN:
+        print("⚠️ TRIGGER_TOKEN is not set: trigger endpoint only reachable from this machine")
+    server = ThreadingHTTPServer((host, port), _TriggerHandler)
+    threading.Thread(target=server.serve_forever, name="trigger-http", daemon=True).start()
+    print(f"📡 Trigger endpoint listening on {host}:{server.server_address[1]}/trigger")
+    return server
@@ -0,0 +1,235 @@
+# backend/upload_engine.py
+"""
+One resumable Drive upload path for the frontend intake and the backend's
+document uploads.
+
+Speaks the Drive v3 resumable protocol directly over an AuthorizedSession:
+- one POST opens the session, then the bytes go up in PUT chunks;
+- after a network error, timeout, 429 or 5xx the session is asked how much
+  it has committed (`Content-Range: bytes */size`) and the upload continues
+  from there instead of starting over; only an expired session (404/410)
+  restarts from byte 0;
+- chunk sizes follow the observed throughput (about
+  UPLOAD_TARGET_CHUNK_SECONDS per chunk, in 256 KiB multiples as the protocol
+  requires, capped at UPLOAD_MAX_CHUNK_MB) and halve after a failed chunk.
+
+`on_progress(bytes_committed)` is called after every committed chunk, and
+after a resume with the server's offset.
+"""
+import io
+import mimetypes
+import os
+import threading
+import time
+from typing import BinaryIO, Callable, Optional, Tuple
+
+import requests
+from google.auth.transport.requests import AuthorizedSession
+
+from config.config import (
+    creds,
+    UPLOAD_CHUNK_MB,
+    UPLOAD_MAX_CHUNK_MB,
+    UPLOAD_TARGET_CHUNK_SECONDS,
+    UPLOAD_RETRIES,
+)
+
+UPLOAD_URL = "https://www.googleapis.com/upload/drive/v3/files"
+CHUNK_UNIT = 256 * 1024  # resumable chunks must be multiples of 256 KiB
+_RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+_EXPIRED_STATUSES = {404, 410}
+_TIMEOUT = (10, 300)
+_MAX_BACKOFF_SECONDS = 32
+
+_thread_local = threading.local()
+
+
+class UploadSessionExpired(Exception):
+    """The resumable session is gone; the upload has to restart from 0."""
+
+
+class _RetryableUploadError(Exception):
+    """Transient failure; query the committed offset and carry on."""
+
+
+class ChunkSizer:
+    """
+    Picks the next chunk size from an EWMA of observed bytes/second so each
+    chunk takes about `target_s`. Shared by all uploads in the process: they
+    share the same uplink, and a new upload starts from what is already known.
+    """
+
+    def __init__(self, initial: int, maximum: int, target_s: float, alpha: float = 0.3):
+        self.maximum = max(CHUNK_UNIT, maximum - maximum % CHUNK_UNIT)
+        self.target_s = target_s
+        self.alpha = alpha
+        self._size = self._clamp(initial)
+        self._rate: Optional[float] = None
+        self._lock = threading.Lock()
+
+    def _clamp(self, n: float) -> int:
+        n = int(n) - int(n) % CHUNK_UNIT
+        return min(self.maximum, max(CHUNK_UNIT, n))
+
+    def next_size(self) -> int:
+        with self._lock:
+            return self._size
+
+    def observe(self, nbytes: int, seconds: float) -> None:
+        if nbytes < CHUNK_UNIT or seconds <= 0:
+            return  # the last short chunk says little about throughput
+        with self._lock:
+            rate = nbytes / seconds
+            self._rate = rate if self._rate is None else self.alpha * rate + (1 - self.alpha) * self._rate
+            self._size = self._clamp(self._rate * self.target_s)
+
+    def backoff(self) -> None:
+        with self._lock:
+            self._size = self._clamp(self._size // 2)
+
+
+_sizer = ChunkSizer(UPLOAD_CHUNK_MB * 1024 * 1024, UPLOAD_MAX_CHUNK_MB * 1024 * 1024, UPLOAD_TARGET_CHUNK_SECONDS)
+
+
+def _session(credentials=None) -> AuthorizedSession:
+    """One AuthorizedSession per thread (and per non-default credentials)."""
+    if credentials is not None:
+        return AuthorizedSession(credentials)
+    session = getattr(_thread_local, "session", None)
+    if session is None:
+        session = AuthorizedSession(creds)
+        _thread_local.session = session
+    return session
+
+
+def _stream_size(stream: BinaryIO) -> int:
+    stream.seek(0, io.SEEK_END)
+    size = stream.tell()
+    stream.seek(0)
+    return size
+
+
+def _check(response, context: str) -> None:
+    if response.status_code in _EXPIRED_STATUSES:
+        raise UploadSessionExpired(f"{context}: session expired ({response.status_code})")
+    if response.status_code in _RETRY_STATUSES:
+        raise _RetryableUploadError(f"{context}: HTTP {response.status_code}")
+    if response.status_code >= 400:
+        raise RuntimeError(f"❌ {context} failed: HTTP {response.status_code} {response.text[:300]}")
+
+
+def _committed(response) -> int:
+    """Bytes the server holds, from a 308's `Range: bytes=0-N` header."""
+    rng = response.headers.get("Range", "")
+    return int(rng.rsplit("-", 1)[1]) + 1 if "-" in rng else 0
+
+
+def _open_session(session, metadata: dict, size: int, mimetype: str, fields: str) -> str:
+    response = session.post(
+        UPLOAD_URL,
+        params={"uploadType": "resumable", "supportsAllDrives": "true", "fields": fields},
+        json=metadata,
+        headers={"X-Upload-Content-Type": mimetype, "X-Upload-Content-Length": str(size)},
+        timeout=_TIMEOUT,
+    )
+    _check(response, "Opening upload session")
+    return response.headers["Location"]
+
+
+def _query_offset(session, uri: str, size: int) -> Tuple[int, Optional[dict]]:
+    """(committed bytes, file resource if the upload already completed)."""
+    response = session.put(uri, data=b"", headers={"Content-Range": f"bytes */{size}"}, timeout=_TIMEOUT)
+    if response.status_code in (200, 201):
+        return size, response.json()
+    if response.status_code == 308:
+        return _committed(response), None
+    _check(response, "Querying upload offset")
+    return 0, None
+
+
+def _send_chunk(session, uri: str, stream: BinaryIO, offset: int, size: int) -> Tuple[int, Optional[dict]]:
+    stream.seek(offset)
+    chunk = stream.read(_sizer.next_size())
+    if size == 0:
+        content_range = "bytes */0"
+    else:
+        content_range = f"bytes {offset}-{offset + len(chunk) - 1}/{size}"
+    started = time.monotonic()
+    response = session.put(uri, data=chunk, headers={"Content-Range": content_range}, timeout=_TIMEOUT)
+    if response.status_code in (200, 201):
+        _sizer.observe(len(chunk), time.monotonic() - started)
+        return size, response.json()
+    if response.status_code == 308:
+        committed = _committed(response)
+        _sizer.observe(committed - offset, time.monotonic() - started)
+        return committed, None
+    _check(response, "Uploading chunk")
+    return offset, None
+
+
+def upload_stream(
+    stream: BinaryIO,
+    metadata: dict,
+    mimetype: str = "application/octet-stream",
+    on_progress: Optional[Callable[[int], None]] = None,
+    retries: int = UPLOAD_RETRIES,
+    fields: str = "id",
+    credentials=None,
+) -> dict:
+    """
+    Upload a seekable stream as a new Drive file described by `metadata`
+    (name, parents, optional mimeType for conversion). Only one chunk is held
+    in memory at a time. Returns the created file resource (`fields`).
+    """
+    name = metadata.get("name", "file")
+    size = _stream_size(stream)
+    session = _session(credentials)
+    uri: Optional[str] = None
+    offset = 0
+    failures = 0
+
+    while True:
+        try:
+            if uri is None:
+                uri, offset = _open_session(session, metadata, size, mimetype, fields), 0
+            elif failures:
+                offset, done = _query_offset(session, uri, size)
+                if on_progress:
+                    on_progress(offset)
+                if done is not None:
+                    return done
+            committed, done = _send_chunk(session, uri, stream, offset, size)
+            if committed > offset:
+                failures = 0
+            offset = committed
+            if on_progress:
+                on_progress(offset)
+            if done is not None:
+                return done
+
+        except UploadSessionExpired as e:
+            uri, offset = None, 0
+            error = e
+        except (_RetryableUploadError, requests.exceptions.ConnectionError, requests.exceptions.Timeout) as e:
+            error = e
+        else:
+            continue
+
+        failures += 1
+        _sizer.backoff()
+        if failures > retries:
+            raise RuntimeError(f"❌ Upload of {name} failed after {retries} retries: {error}")
+        wait = min(_MAX_BACKOFF_SECONDS, 2 ** failures)
+        print(f"⚠️ Upload of {name} interrupted at {offset}/{size} bytes ({error}); resuming in {wait}s...")
+        time.sleep(wait)
+
+
+def upload_bytes(data: bytes, metadata: dict, mimetype: str = "application/octet-stream", **kwargs) -> dict:
+    return upload_stream(io.BytesIO(data), metadata, mimetype, **kwargs)
+
+
+def upload_path(file_path: str, parent_folder_id: str, mimetype: Optional[str] = None, **kwargs) -> dict:
+    metadata = {"name": os.path.basename(file_path), "parents": [parent_folder_id]}
+    mimetype = mimetype or mimetypes.guess_type(file_path)[0] or "application/octet-stream"
+    with open(file_path, "rb") as fh:
+        return upload_stream(fh, metadata, mimetype, **kwargs)
@@ -1,44 +1,33 @@
 from google.oauth2.service_account import Credentials
 from googleapiclient.discovery import build
-from googleapiclient.http import MediaInMemoryUpload
 
 from config.config import GOOGLE_SA_FILE, GOOGLE_DRIVE_SCOPES, WEBSITE_DRIVE_FOLDER_ID
+from backend.upload_engine import upload_stream
 
 
-def authenticate_google_drive():
+def _credentials():
     if not GOOGLE_SA_FILE:
         raise ValueError("⚠️ GOOGLE_SA_FILE not set in .env")
-    creds = Credentials.from_service_account_file(GOOGLE_SA_FILE, scopes=GOOGLE_DRIVE_SCOPES)
-    return build("drive", "v3", credentials=creds)
+    return Credentials.from_service_account_file(GOOGLE_SA_FILE, scopes=GOOGLE_DRIVE_SCOPES)
 
-def upload_docx_to_gdrive(docx_stream, filename):
-    service = authenticate_google_drive()
 
+def authenticate_google_drive():
+    return build("drive", "v3", credentials=_credentials())
+
+def upload_docx_to_gdrive(docx_stream, filename):
     file_metadata = {
         "name": filename,
         "parents": [WEBSITE_DRIVE_FOLDER_ID],
         "mimeType": "application/vnd.google-apps.document",  # convert to Google Doc
     }
 
-    docx_stream.seek(0)
-    docx_content = docx_stream.read()
-
-    media = MediaInMemoryUpload(
-        docx_content,
-        mimetype="application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        resumable=True,
-    )
-
-    uploaded = (
-        service.files()
-        .create(
-            body=file_metadata,
-            media_body=media,
-            fields="id, name",
-            supportsAllDrives=True,
-        )
-        .execute()
+    uploaded = upload_stream(
+        docx_stream,
+        file_metadata,
+        "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+        fields="id, name",
+        credentials=_credentials(),
     )
 
     print(f"✅ Uploaded to Google Drive as: {uploaded['name']} (ID: {uploaded['id']})")
-    return uploaded["id"]
\ No newline at end of file
+    return uploaded["id"]
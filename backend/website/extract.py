@@ -1,21 +1,233 @@
+# backend/website/extract.py
+"""
+Bounded, streaming website text extraction.
+
+The page is read with `stream=True` in small chunks and fed straight into an
+incremental stdlib HTMLParser, so nothing beyond one chunk plus the collected
+text is held in memory. Reading stops at whichever comes first: WEB_MAX_BYTES
+downloaded, WEB_MAX_CHARS of text collected (enough for summarisation), or
+WEB_FETCH_TIMEOUT_SECONDS elapsed. Non-page responses (PDF, video, images,
+other binaries) are rejected from the Content-Type header / first bytes
+before any parsing.
+"""
+import codecs
+import re
+import time
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from itertools import chain
+from typing import List, Optional
+
 import requests
-from bs4 import BeautifulSoup
 
+from config.config import WEB_MAX_BYTES, WEB_MAX_CHARS, WEB_FETCH_TIMEOUT_SECONDS
 
-def extract_text_from_url(url):
-    response = requests.get(url)
-    response.raise_for_status()
+CHUNK_BYTES = 16 * 1024
+SNIFF_BYTES = 4096
+
+_SKIP_TAGS = {"script", "style", "noscript", "template", "svg", "iframe", "object", "canvas"}
+_BLOCK_TAGS = {
+    "title", "p", "div", "br", "hr", "li", "ul", "ol", "dl", "dt", "dd",
+    "h1", "h2", "h3", "h4", "h5", "h6", "table", "tr", "td", "th",
+    "section", "article", "header", "footer", "nav", "aside", "main",
+    "blockquote", "pre", "form", "label", "button", "option", "figcaption",
+}
+_VOID_BLOCK_TAGS = {"br", "hr"}  # break the text but never enclose it
+_CHROME_TAGS = {"nav", "footer", "aside"}  # site chrome, not page content
+_HTML_TYPES = {"text/html", "application/xhtml+xml"}
+_TEXT_TYPES = {"text/plain"}
+_META_CHARSET_RE = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?\s*([A-Za-z0-9_.:-]+)""", re.I)
+
+
+class UnsupportedContentError(ValueError):
+    """The URL does not point at an HTML or plain-text page."""
+
+    def __init__(self, url: str, content_type: str):
+        self.content_type = content_type.split(";", 1)[0].strip().lower() or "binary content"
+        super().__init__(f"{url} is not a web page ({self.content_type})")
+
+
+@dataclass
+class TextBlock:
+    text: str
+    link_chars: int = 0  # characters inside <a> elements
+    tag: str = ""
+    chrome: bool = False  # inside <nav>/<footer>/<aside>
+
+
+@dataclass
+class FetchedPage:
+    url: str
+    content_type: str
+    encoding: str
+    bytes_read: int = 0
+    truncated: bool = False
+    blocks: List[TextBlock] = field(default_factory=list)
+
+    @property
+    def text(self) -> str:
+        return "\n".join(b.text for b in self.blocks)
+
+
+class _TextCollector(HTMLParser):
+    """Incremental visible-text extractor; sets `.full` once `max_chars` is reached."""
 
-    soup = BeautifulSoup(response.content, "html.parser")
+    def __init__(self, max_chars: int):
+        super().__init__(convert_charrefs=True)
+        self.max_chars = max_chars
+        self.blocks: List[TextBlock] = []
+        self.chars = 0
+        self.full = False
+        self._buf: List[str] = []
+        self._link_chars = 0
+        self._skip_depth = 0
+        self._link_depth = 0
+        self._chrome_depth = 0
+        self._open: List[str] = []  # enclosing block tags, innermost last
+        self._tag = ""
 
-    # Remove script and style
-    for script in soup(["script", "style"]):
-        script.decompose()
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag in _BLOCK_TAGS:
+            self._flush()
+            if tag not in _VOID_BLOCK_TAGS:
+                self._open.append(tag)
+                self._tag = tag
+            if tag in _CHROME_TAGS:
+                self._chrome_depth += 1
+        elif tag == "a":
+            self._link_depth += 1
 
-    text = soup.get_text(separator="\n")
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag in _BLOCK_TAGS:
+            self._flush()
+            if tag in self._open:
+                # also closes anything left open inside it (<li> without </li>...)
+                del self._open[len(self._open) - 1 - self._open[::-1].index(tag):]
+            # text after </h2> belongs to the enclosing block, not the heading
+            self._tag = self._open[-1] if self._open else "p"
+            if tag in _CHROME_TAGS:
+                self._chrome_depth = max(0, self._chrome_depth - 1)
+        elif tag == "a":
+            self._link_depth = max(0, self._link_depth - 1)
 
-    # Clean empty lines/whitespace
-    lines = [line.strip() for line in text.splitlines()]
-    cleaned_text = "\n".join(line for line in lines if line)
+    def handle_data(self, data):
+        if self._skip_depth or self.full:
+            return
+        self._buf.append(data)
+        if self._link_depth:
+            self._link_chars += len(data.strip())
 
-    return cleaned_text
+    def _flush(self):
+        text = " ".join("".join(self._buf).split())
+        if text and not self.full:
+            self.blocks.append(
+                TextBlock(text, min(self._link_chars, len(text)), self._tag, self._chrome_depth > 0)
+            )
+            self.chars += len(text) + 1
+            self.full = self.chars >= self.max_chars
+        self._buf = []
+        self._link_chars = 0
+
+    def close(self):
+        super().close()
+        self._flush()
+
+
+def _sniff_kind(content_type: str, head: bytes) -> Optional[str]:
+    """"html", "text" or None (not a page) from the header and first bytes."""
+    mime = content_type.split(";", 1)[0].strip().lower()
+    if mime in _HTML_TYPES:
+        return "html"
+    if mime in _TEXT_TYPES:
+        return "text"
+    if mime and mime not in ("application/octet-stream", "binary/octet-stream"):
+        return None  # pdf, video, images, archives, json...
+    sample = head[:SNIFF_BYTES].lstrip().lower()
+    if sample.startswith((b"<!doctype html", b"<html", b"<head", b"<body")) or b"<html" in sample:
+        return "html"
+    if b"\x00" in sample or sample.startswith(b"%pdf"):
+        return None
+    return "text"
+
+
+def _detect_charset(content_type: str, head: bytes) -> str:
+    """BOM, then the Content-Type charset, then <meta charset>, else UTF-8."""
+    if head.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    if head.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return "utf-16"
+    candidates = []
+    m = re.search(r"charset\s*=\s*[\"']?([\w.:-]+)", content_type or "", re.I)
+    if m:
+        candidates.append(m.group(1))
+    m = _META_CHARSET_RE.search(head[:SNIFF_BYTES])
+    if m:
+        candidates.append(m.group(1).decode("ascii", "ignore"))
+    for name in candidates:
+        try:
+            return codecs.lookup(name).name
+        except LookupError:
+            continue
+    return "utf-8"
+
+
+def fetch_page(url: str, max_bytes: int = WEB_MAX_BYTES, max_chars: int = WEB_MAX_CHARS,
+               timeout_s: float = WEB_FETCH_TIMEOUT_SECONDS) -> FetchedPage:
+    deadline = time.monotonic() + timeout_s
+    with requests.get(url, stream=True, timeout=(10, timeout_s)) as response:
+        response.raise_for_status()
+        content_type = response.headers.get("Content-Type", "")
+        chunks = response.iter_content(CHUNK_BYTES)
+        head = next(chunks, b"")
+
+        kind = _sniff_kind(content_type, head)
+        if kind is None:
+            raise UnsupportedContentError(url, content_type)
+
+        page = FetchedPage(url=url, content_type=content_type, encoding=_detect_charset(content_type, head))
+        decoder = codecs.getincrementaldecoder(page.encoding)(errors="replace")
+        collector = _TextCollector(max_chars) if kind == "html" else None
+        plain: List[str] = []
+
+        for chunk in chain([head], chunks):
+            page.bytes_read += len(chunk)
+            text = decoder.decode(chunk)
+            if collector is not None:
+                collector.feed(text)
+                done = collector.full
+            else:
+                plain.append(text)
+                done = sum(len(t) for t in plain) >= max_chars
+            if done or page.bytes_read >= max_bytes:
+                # don't read on to find out: leaving the `with` closes the
+                # connection with the rest unread. Without Content-Encoding,
+                # Content-Length tells whether the cutoff hit the last chunk.
+                length = response.headers.get("Content-Length", "")
+                exact = length.isdigit() and not response.headers.get("Content-Encoding")
+                page.truncated = page.bytes_read < int(length) if exact else True
+                break
+            if time.monotonic() >= deadline:
+                page.truncated = True  # out of time: don't wait on another read
+                break
+        else:
+            tail = decoder.decode(b"", final=True)
+            if collector is not None:
+                collector.feed(tail)
+            else:
+                plain.append(tail)
+
+    if collector is not None:
+        collector.close()
+        page.blocks = collector.blocks
+    else:
+        lines = (line.strip() for line in "".join(plain)[:max_chars].splitlines())
+        page.blocks = [TextBlock(line) for line in lines if line]
+    return page
+
+
+def extract_text_from_url(url):
+    return fetch_page(url).text
@@ -0,0 +1,106 @@
+# backend/website/shaping.py
+"""
+Shape extracted website text before it goes into the summary prompt.
+
+1. Drop repeated blocks (menus and CTAs that appear on every section).
+2. Drop boilerplate: cookie/consent banners, legal and copyright lines,
+   sign-in and "skip to content" links, and link-heavy blocks from
+   <nav>/<footer>/<aside>.
+3. Score the remaining blocks by content density (words, share of non-link
+   text) with a boost for text the summary schema asks about (services,
+   audience, testimonials, offers...), and keep the best-scoring blocks that
+   fit WEB_TOKEN_BUDGET, in their original page order.
+
+Steps 1–2 only remove noise; on a typical page that is a few percent of the
+text. The size cut comes from step 3: any page longer than WEB_TOKEN_BUDGET
+is trimmed to it, dropping its least informative blocks first
+(`python -m benchmarks.bench_shaping` shows both on a realistic page).
+"""
+import re
+from typing import List, Sequence, Tuple
+
+from config.config import WEB_TOKEN_BUDGET
+from backend.model_router import estimate_tokens
+from backend.website.extract import TextBlock
+
+HEADING_TAGS = {"title", "h1", "h2", "h3", "h4", "h5", "h6"}
+
+_BOILERPLATE_RE = re.compile(
+    r"\bcookies? (policy|settings|preferences|consent|notice)\b|\b(this (web)?site|we) uses? cookies\b"
+    r"|\baccept (all )?cookies\b|\bmanage (consent|preferences)\b|\bconsent (preferences|settings)\b|\bgdpr\b"
+    r"|\ball rights reserved\b|©|\(c\)\s*\d{4}|\bprivacy (policy|notice)\b|\bterms (of (use|service)|and conditions)\b"
+    r"|\bterms & conditions\b|\bskip to (main )?content\b|\bsign (in|out)\b|\blog ?(in|out)\b"
+    r"|\bsubscribe to (our )?newsletter\b|\bfollow us\b|\bback to top\b|\bpowered by\b",
+    re.I,
+)
+# Words that map onto sections of the website summary schema
+_SCHEMA_HINTS_RE = re.compile(
+    r"\b(about|mission|vision|founded|we (help|are|offer|provide)|our (team|story|clients)"
+    r"|services?|products?|solutions?|pricing|plans?|offers?|discounts?|free trial|guarantee"
+    r"|testimonials?|reviews?|rated|customers|clients|case stud(y|ies)|trusted by"
+    r"|for (businesses|teams|families|startups|agencies)|unique|why (choose|us))\b",
+    re.I,
+)
+
+
+def _normalise(text: str) -> str:
+    return re.sub(r"\W+", " ", text.lower()).strip()
+
+
+def _is_boilerplate(block: TextBlock) -> bool:
+    words = len(block.text.split())
+    link_density = block.link_chars / max(1, len(block.text))
+    if words <= 12 and _BOILERPLATE_RE.search(block.text):
+        return True
+    if block.chrome and (link_density > 0.3 or words < 8):
+        return True
+    # menus / tag clouds outside <nav>
+    return link_density > 0.6 and block.tag not in HEADING_TAGS
+
+
+def _score(block: TextBlock) -> float:
+    words = len(block.text.split())
+    link_density = block.link_chars / max(1, len(block.text))
+    score = min(words, 80) * (1.0 - link_density)
+    if block.tag in HEADING_TAGS:
+        score += 25.0  # section structure helps the model fill the schema
+    if _SCHEMA_HINTS_RE.search(block.text):
+        score *= 1.5
+    if block.chrome:
+        score *= 0.3
+    return score
+
+
+def clean_blocks(blocks: Sequence[TextBlock]) -> List[TextBlock]:
+    """Steps 1–2: de-duplicate and drop boilerplate, keeping page order."""
+    seen = set()
+    out: List[TextBlock] = []
+    for block in blocks:
+        key = _normalise(block.text)
+        if not key or key in seen:
+            continue
+        seen.add(key)
+        if not _is_boilerplate(block):
+            out.append(block)
+    return out
+
+
+def fit_to_budget(blocks: Sequence[TextBlock], token_budget: int) -> List[TextBlock]:
+    """Step 3: best-scoring blocks within `token_budget`, back in page order."""
+    costs = [estimate_tokens(b.text) + 1 for b in blocks]
+    if token_budget <= 0 or sum(costs) <= token_budget:
+        return list(blocks)
+    ranked: List[Tuple[float, int]] = sorted(
+        ((_score(b), i) for i, b in enumerate(blocks)), key=lambda t: (-t[0], t[1])
+    )
+    keep, used = [], 0
+    for _score_value, i in ranked:
+        if used + costs[i] <= token_budget:
+            keep.append(i)
+            used += costs[i]
+    return [blocks[i] for i in sorted(keep)]
+
+
+def shape_page_text(blocks: Sequence[TextBlock], token_budget: int = WEB_TOKEN_BUDGET) -> str:
+    """Cleaned, budget-fitted page text for the website summary prompt."""
+    return "\n".join(b.text for b in fit_to_budget(clean_blocks(blocks), token_budget))
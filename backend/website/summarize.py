@@ -3,7 +3,10 @@ import re
 from typing import Optional
 
 import openai
-from config.config import OPENAI_KEY, OPENAI_MODEL
+from config.config import OPENAI_KEY, OPENAI_STREAMING
+from backend.llm_stream import stream_json_completion
+from backend.model_router import run_routed
+from backend.ledger import chat_usage
 
 openai.api_key = OPENAI_KEY
 
@@ -51,7 +54,7 @@ def _try_json_loads(s: str) -> dict:
     return json.loads(s3)
 
 
-def summarize_with_openai(webpage_text: str) -> dict:
+def summarize_with_openai(webpage_text: str, on_section=None) -> dict:
     prompt = f"""
 You are a professional business analyst. Analyze the following website content and return **ONLY valid JSON**.
 
@@ -105,17 +108,43 @@ Analyze this content:
 \"\"\"{webpage_text}\"\"\"    
 """
 
+    messages = [
+        {
+            "role": "system",
+            "content": "You are a careful data formatter who always returns valid JSON.",
+        },
+        {"role": "user", "content": prompt},
+    ]
+
+    def _call(model, timeout):
+        with chat_usage("website_summary", model, messages) as usage:
+            if OPENAI_STREAMING:
+                result = stream_json_completion(
+                    model,
+                    messages,
+                    expected_keys=("title", "sections"),
+                    on_member=on_section,
+                    deadline_s=timeout,
+                    request_timeout=timeout,
+                )
+                usage["completion_text"] = json.dumps(result)
+                return result
+            response = openai.ChatCompletion.create(
+                model=model,
+                messages=messages,
+                request_timeout=timeout,
+            )
+            usage.update(response.get("usage") or {})
+            return response
+
     try:
-        response = openai.ChatCompletion.create(
-            model=OPENAI_MODEL,
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are a careful data formatter who always returns valid JSON.",
-                },
-                {"role": "user", "content": prompt},
-            ],
-        )
+        result = run_routed("website", prompt, _call)
+        if OPENAI_STREAMING:
+            result.setdefault("title", "Website Summary")
+            result.setdefault("sections", [])
+            return result
+
+        response = result
 
         raw_text = response["choices"][0]["message"]["content"].strip().strip("`")
         if raw_text.lower().startswith("json"):
@@ -0,0 +1,84 @@
+# benchmarks/bench_docx_render.py
+"""
+Micro-benchmark: per-row .docx render time.
+
+    python -m benchmarks.bench_docx_render --iterations 50
+
+"naive" rebuilds a fresh Document() per variant (the previous approach);
+"single-pass" is backend.audio.doc_generator.generate_docx_variants.
+"""
+import argparse
+import io
+import os
+import statistics
+import sys
+import time
+
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+from docx import Document  # noqa: E402
+
+from backend.audio.doc_generator import ACTION_SECTION_TITLES, MODES, generate_docx_variants  # noqa: E402
+from benchmarks.fakes import MEETING_SUMMARY  # noqa: E402
+
+
+def _naive_render(summary, company, meeting_date, mode):
+    doc = Document()
+    if mode == "full":
+        doc.add_heading(f"{company} Meeting Notes", level=0)
+        doc.add_paragraph(f"Date: {meeting_date}").alignment = 2
+    else:
+        doc.add_heading(f"{company} - {'MoM' if mode == 'mom' else 'Action Points'}", level=0)
+    if mode in ("full", "mom"):
+        doc.add_heading("1. Minutes of the Meeting (MoM)", level=1)
+        for point in summary["mom"]:
+            doc.add_paragraph(point, style="List Bullet")
+    if mode == "full":
+        doc.add_heading("2. To-Do List", level=1)
+        for task in summary["todo_list"]:
+            doc.add_paragraph(task, style="List Bullet")
+    if mode in ("full", "action"):
+        doc.add_heading("3. Action Points / Action Plan", level=1)
+        for key, title in ACTION_SECTION_TITLES.items():
+            doc.add_heading(title, level=2)
+            for item in summary["action_plan"].get(key, []):
+                doc.add_paragraph(item, style="List Bullet")
+    out = io.BytesIO()
+    doc.save(out)
+    return out
+
+
+def _time(fn, iterations: int):
+    samples = []
+    for _ in range(iterations):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return statistics.median(samples) * 1000, max(samples) * 1000
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--iterations", type=int, default=30)
+    ap.add_argument("--scale", type=int, default=1, help="multiply bullet counts")
+    args = ap.parse_args(argv)
+
+    summary = {
+        "mom": MEETING_SUMMARY["mom"] * args.scale,
+        "todo_list": MEETING_SUMMARY["todo_list"] * args.scale,
+        "action_plan": {k: v * args.scale for k, v in MEETING_SUMMARY["action_plan"].items()},
+    }
+
+    generate_docx_variants(summary, "Client A", "01-01-2025")  # warm the template cache
+    naive = _time(lambda: [_naive_render(summary, "Client A", "01-01-2025", m) for m in MODES], args.iterations)
+    single = _time(lambda: generate_docx_variants(summary, "Client A", "01-01-2025"), args.iterations)
+
+    print(f"{'renderer':>12} | {'median ms/row':>14} | {'max ms/row':>10}")
+    print(f"{'naive':>12} | {naive[0]:>14.2f} | {naive[1]:>10.2f}")
+    print(f"{'single-pass':>12} | {single[0]:>14.2f} | {single[1]:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,120 @@
+# benchmarks/bench_engines.py
+"""
+Transcription engine routing with fake engines (TRANSCRIBE_ENGINE=fake).
+
+    python -m benchmarks.bench_engines --chunks 16 --concurrency 2 --delay 0.2
+
+"saturation": chunks arrive at once; the primary engine runs at most its
+concurrency cap and, once TRANSCRIBE_OVERFLOW_QUEUE callers are waiting,
+the overflow engine takes chunks. Compared against primary-only routing.
+"429": the primary's first call is rate-limited; that chunk overflows and
+the primary stays out of the rotation while it cools down.
+
+Exits non-zero if the routing does not behave as described.
+"""
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+from benchmarks.harness import BenchProfiles, install_fakes  # noqa: E402
+
+OVERFLOW_NAME = "fake-overflow"
+
+
+def _chunks(n: int, kb: int):
+    directory = tempfile.mkdtemp(prefix="fms_bench_engines_")
+    paths = []
+    for i in range(n):
+        path = os.path.join(directory, f"chunk_{i}.mp3")
+        with open(path, "wb") as f:
+            f.write(os.urandom(kb * 1024))
+        paths.append(path)
+    return paths
+
+
+def _run(engines, primary, overflow, paths, parallel: bool) -> float:
+    engines._engines.clear()
+    engines.register_engine(primary)
+    if overflow is not None:
+        engines.register_engine(overflow)
+    engines.TRANSCRIBE_ENGINE = primary.name
+    engines.TRANSCRIBE_OVERFLOW_ENGINE = overflow.name if overflow is not None else ""
+    errors = []
+
+    def _one(path):
+        try:
+            engines.transcribe_chunk(path)
+        except Exception as e:
+            errors.append(e)
+
+    t0 = time.perf_counter()
+    if parallel:
+        threads = [threading.Thread(target=_one, args=(p,)) for p in paths]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    else:
+        for p in paths:
+            _one(p)
+    if errors:
+        raise RuntimeError(f"{len(errors)} chunk(s) failed: {errors[0]}")
+    return time.perf_counter() - t0
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--chunks", type=int, default=12)
+    ap.add_argument("--concurrency", type=int, default=2, help="cap for each fake engine")
+    ap.add_argument("--delay", type=float, default=0.2, help="seconds per fake transcription")
+    ap.add_argument("--chunk-kb", type=int, default=64)
+    args = ap.parse_args(argv)
+
+    install_fakes(BenchProfiles())
+    from backend.audio import engines
+
+    engines.TRANSCRIBE_OVERFLOW_QUEUE = 1
+    engines.TRANSCRIBE_LOCAL_MAX_SECONDS = 0
+    paths = _chunks(args.chunks, args.chunk_kb)
+    rows = []
+    failures = []
+
+    alone = engines.FakeEngine(args.concurrency, args.delay)
+    alone_s = _run(engines, alone, None, paths, parallel=True)
+    rows.append(("primary only", alone_s, alone.calls, 0, alone.peak_active))
+
+    primary = engines.FakeEngine(args.concurrency, args.delay)
+    overflow = engines.FakeEngine(args.concurrency, args.delay, name=OVERFLOW_NAME)
+    both_s = _run(engines, primary, overflow, paths, parallel=True)
+    rows.append(("saturation", both_s, primary.calls, overflow.calls, primary.peak_active))
+    if primary.peak_active > args.concurrency:
+        failures.append(f"primary ran {primary.peak_active} chunks at once (cap {args.concurrency})")
+    if not overflow.calls:
+        failures.append("a saturated primary never overflowed")
+
+    limited = engines.FakeEngine(args.concurrency, args.delay, rate_limited_calls=1)
+    spare = engines.FakeEngine(args.concurrency, args.delay, name=OVERFLOW_NAME)
+    limited_s = _run(engines, limited, spare, paths, parallel=False)
+    rows.append(("429", limited_s, limited.calls, spare.calls, limited.peak_active))
+    if limited.calls != 1 or spare.calls != len(paths):
+        failures.append(
+            f"after a 429 the primary took {limited.calls - 1} more chunk(s) while cooling down"
+        )
+
+    print(f"{'scenario':>14} | {'elapsed_s':>9} | {'primary':>7} | {'overflow':>8} | {'peak':>4}")
+    for name, elapsed, p_calls, o_calls, peak in rows:
+        print(f"{name:>14} | {elapsed:>9.3f} | {p_calls:>7} | {o_calls:>8} | {peak:>4}")
+    for f in failures:
+        print(f"❌ {f}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
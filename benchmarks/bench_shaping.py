@@ -0,0 +1,69 @@
+# benchmarks/bench_shaping.py
+"""
+Website text shaping on a realistic page (benchmarks.fixtures.agency_page_html).
+
+    python -m benchmarks.bench_shaping --sections 24 --budget 6000
+
+Reports tokens before shaping, after de-duplication + boilerplate removal,
+and after the WEB_TOKEN_BUDGET cut. Also checks that the boilerplate
+patterns remove exactly the page's consent, legal and sign-in lines and
+keep content that only mentions cookies, plans, consent or logging;
+exits non-zero otherwise.
+"""
+import argparse
+import os
+import sys
+
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+if _ROOT not in sys.path:
+    sys.path.insert(0, _ROOT)
+
+from benchmarks.fixtures import AGENCY_PAGE_BOILERPLATE, AGENCY_PAGE_KEEP, agency_page_html  # noqa: E402
+from benchmarks.harness import BenchProfiles, install_fakes  # noqa: E402
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--sections", type=int, default=24)
+    ap.add_argument("--budget", type=int, default=6000, help="token budget (WEB_TOKEN_BUDGET default)")
+    args = ap.parse_args(argv)
+
+    install_fakes(BenchProfiles())
+    from backend.model_router import estimate_tokens
+    from backend.website.extract import _TextCollector
+    from backend.website.shaping import _BOILERPLATE_RE, clean_blocks, fit_to_budget
+
+    collector = _TextCollector(10 ** 9)
+    collector.feed(agency_page_html(args.sections))
+    collector.close()
+    blocks = collector.blocks
+    cleaned = clean_blocks(blocks)
+    shaped = fit_to_budget(cleaned, args.budget)
+
+    def tokens(bs):
+        return estimate_tokens("\n".join(b.text for b in bs))
+
+    raw_t, clean_t, shaped_t = tokens(blocks), tokens(cleaned), tokens(shaped)
+    print(f"{'stage':>22} | {'blocks':>6} | {'tokens':>7} | {'of raw':>6}")
+    for name, bs, t in (("raw", blocks, raw_t), ("dedup + boilerplate", cleaned, clean_t),
+                        (f"budget {args.budget}", shaped, shaped_t)):
+        print(f"{name:>22} | {len(bs):>6} | {t:>7} | {t / max(raw_t, 1):>6.0%}")
+
+    failures = []
+    kept = {b.text for b in cleaned}
+    pattern_hits = {b.text for b in blocks if len(b.text.split()) <= 12 and _BOILERPLATE_RE.search(b.text)}
+    for text in sorted(pattern_hits - set(AGENCY_PAGE_BOILERPLATE)):
+        failures.append(f"boilerplate pattern matched content: {text!r}")
+    for text in AGENCY_PAGE_BOILERPLATE:
+        if text in kept:
+            failures.append(f"boilerplate survived: {text!r}")
+    for text in AGENCY_PAGE_KEEP:
+        if text not in kept:
+            failures.append(f"content dropped: {text!r}")
+    for f in failures:
+        print(f"❌ {f}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
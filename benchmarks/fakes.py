@@ -0,0 +1,583 @@
+# benchmarks/fakes.py
+"""
+Local stand-ins for Google Sheets, Google Drive, Whisper, chat completions
+and target websites. Every fake takes a `FaultProfile` so latency, random
+errors and 429 rate-limit responses can be injected deterministically.
+"""
+import io
+import json
+import random
+import re
+import shutil
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+import httplib2
+import openai
+import requests
+from googleapiclient.errors import HttpError
+from openai.openai_object import OpenAIObject
+
+
+@dataclass
+class FaultProfile:
+    latency_s: float = 0.0
+    jitter_s: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+
+
+class _Faults:
+    """Shared latency / fault injection; `kind` picks the exception family."""
+
+    def __init__(self, profile: FaultProfile, kind: str, seed: int = 0):
+        self.profile = profile
+        self.kind = kind
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.errors = 0
+        self.rate_limited = 0
+        self.enabled = True  # False while the harness seeds / inspects state
+
+    def hit(self, latency_scale: float = 1.0) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self.calls += 1
+            roll = self._rng.random()
+            jitter = self._rng.uniform(0, self.profile.jitter_s) if self.profile.jitter_s else 0.0
+        delay = self.profile.latency_s * latency_scale + jitter
+        if delay > 0:
+            time.sleep(delay)
+        if roll < self.profile.rate_limit_rate:
+            with self._lock:
+                self.rate_limited += 1
+            raise self._error(429, "rate limited")
+        if roll < self.profile.rate_limit_rate + self.profile.error_rate:
+            with self._lock:
+                self.errors += 1
+            raise self._error(500, "injected failure")
+
+    def _error(self, status: int, msg: str) -> Exception:
+        if self.kind == "google":
+            return HttpError(httplib2.Response({"status": status}), msg.encode("utf-8"))
+        if self.kind == "openai":
+            if status == 429:
+                return openai.error.RateLimitError(msg)
+            return openai.error.APIError(msg)
+        resp = requests.Response()
+        resp.status_code = status
+        return requests.HTTPError(f"{status} {msg}", response=resp)
+
+    def stats(self) -> Dict[str, int]:
+        return {"calls": self.calls, "errors": self.errors, "rate_limited": self.rate_limited}
+
+
+# ------------------------------------------------------------------------------
+# Google Sheets
+# ------------------------------------------------------------------------------
+class FakeWorksheet:
+    """In-memory gspread.Worksheet subset used by the frontend and backend."""
+
+    def __init__(
+        self,
+        title: str,
+        rows: Optional[List[List[str]]],
+        faults: _Faults,
+        on_write: Optional[Callable[[], None]] = None,
+        spreadsheet: Optional["FakeSpreadsheet"] = None,
+        sheet_id: int = 0,
+    ):
+        self.title = title
+        self.id = sheet_id
+        self.spreadsheet = spreadsheet
+        self._rows: List[List[str]] = [list(r) for r in (rows or [])]
+        self._faults = faults
+        self._on_write = on_write
+        self._lock = threading.Lock()
+
+    def _touch(self) -> None:
+        if self._on_write:
+            self._on_write()
+
+    # reads
+    def get_all_values(self, **kwargs) -> List[List[str]]:
+        self._faults.hit()
+        with self._lock:
+            return [list(r) for r in self._rows]
+
+    def get_all_records(self, **kwargs) -> List[dict]:
+        values = self.get_all_values()
+        if not values:
+            return []
+        headers = values[0]
+        return [dict(zip(headers, r + [""] * (len(headers) - len(r)))) for r in values[1:]]
+
+    def row_values(self, row: int, **kwargs) -> List[str]:
+        self._faults.hit()
+        with self._lock:
+            return list(self._rows[row - 1]) if 0 < row <= len(self._rows) else []
+
+    def col_values(self, col: int, **kwargs) -> List[str]:
+        self._faults.hit()
+        with self._lock:
+            return [r[col - 1] if len(r) >= col else "" for r in self._rows]
+
+    # writes
+    def update_cell(self, row: int, col: int, value) -> None:
+        self._faults.hit()
+        self._touch()
+        with self._lock:
+            while len(self._rows) < row:
+                self._rows.append([])
+            target = self._rows[row - 1]
+            target.extend([""] * (col - len(target)))
+            target[col - 1] = value
+
+    def update(self, range_name=None, values=None, **kwargs) -> None:
+        self._faults.hit()
+        self._touch()
+        m = re.match(r"([A-Z]+)(\d+)", str(range_name or "A1"))
+        col = _col_to_index(m.group(1)) if m else 1
+        start = int(m.group(2)) if m else 1
+        with self._lock:
+            for offset, new_row in enumerate(values or []):
+                idx = start - 1 + offset
+                while len(self._rows) <= idx:
+                    self._rows.append([])
+                target = self._rows[idx]
+                target.extend([""] * (col - 1 + len(new_row) - len(target)))
+                target[col - 1 : col - 1 + len(new_row)] = list(new_row)
+
+    def append_rows(self, rows: List[List[str]], **kwargs) -> dict:
+        self._faults.hit()
+        self._touch()
+        with self._lock:
+            first = len(self._rows) + 1
+            self._rows.extend(list(r) for r in rows)
+            last = len(self._rows)
+        return {"updates": {"updatedRange": f"{self.title}!A{first}:Z{last}", "updatedRows": len(rows)}}
+
+    def append_row(self, row: List[str], **kwargs) -> dict:
+        return self.append_rows([row], **kwargs)
+
+    def delete_rows(self, start_index: int, end_index: Optional[int] = None) -> None:
+        self._faults.hit()
+        self._touch()
+        end_index = end_index or start_index
+        with self._lock:
+            del self._rows[start_index - 1 : end_index]
+
+    @property
+    def row_count(self) -> int:
+        with self._lock:
+            return len(self._rows)
+
+
+def _col_to_index(letters: str) -> int:
+    n = 0
+    for ch in letters:
+        n = n * 26 + (ord(ch) - 64)
+    return n
+
+
+class FakeSpreadsheet:
+    def __init__(self, key: str, faults: _Faults):
+        self.id = key
+        self._faults = faults
+        self._tabs: Dict[str, FakeWorksheet] = {}
+        self._version = 1
+        self._modified = time.time()
+        self._version_lock = threading.Lock()
+
+    def _bump(self) -> None:
+        with self._version_lock:
+            self._version += 1
+            self._modified = time.time()
+
+    def drive_meta(self) -> dict:
+        """Drive metadata for the spreadsheet file (version moves on every write)."""
+        with self._version_lock:
+            return {
+                "id": self.id,
+                "mimeType": "application/vnd.google-apps.spreadsheet",
+                "version": str(self._version),
+                "modifiedTime": time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(self._modified))
+                + f".{int(self._modified * 1000) % 1000:03d}Z",
+            }
+
+    def worksheet(self, title: str) -> FakeWorksheet:
+        if title not in self._tabs:
+            self._tabs[title] = FakeWorksheet(
+                title, [], self._faults, on_write=self._bump, spreadsheet=self, sheet_id=len(self._tabs)
+            )
+        return self._tabs[title]
+
+    def batch_update(self, body: dict) -> dict:
+        """Only `deleteDimension` (ROWS) requests, applied in order."""
+        self._faults.hit()
+        by_id = {ws.id: ws for ws in self._tabs.values()}
+        for req in body.get("requests", []):
+            rng = req["deleteDimension"]["range"]
+            ws = by_id[rng["sheetId"]]
+            with ws._lock:
+                del ws._rows[rng["startIndex"] : rng["endIndex"]]
+            self._bump()
+        return {"replies": [{} for _ in body.get("requests", [])]}
+
+    def add_worksheet(self, title: str, rows: int = 0, cols: int = 0) -> FakeWorksheet:
+        return self.worksheet(title)
+
+    @property
+    def sheet1(self) -> FakeWorksheet:
+        if not self._tabs:
+            return self.worksheet("Sheet1")
+        return next(iter(self._tabs.values()))
+
+
+class FakeSheetsClient:
+    """Stands in for `gspread.authorize(...)` / `gspread.service_account(...)`."""
+
+    def __init__(self, profile: FaultProfile, seed: int = 0):
+        self.faults = _Faults(profile, "google", seed)
+        self._books: Dict[str, FakeSpreadsheet] = {}
+        self._lock = threading.Lock()
+
+    def open_by_key(self, key: str) -> FakeSpreadsheet:
+        with self._lock:
+            if key not in self._books:
+                self._books[key] = FakeSpreadsheet(key, self.faults)
+            return self._books[key]
+
+
+# ------------------------------------------------------------------------------
+# Google Drive
+# ------------------------------------------------------------------------------
+class FakeDrive:
+    """
+    In-memory Drive: files keyed by ID with name, parents, bytes and md5.
+    `download_file_from_drive_url` replaces the one in backend/drive_ops.py;
+    `upload_session()` stands in for the upload engine's AuthorizedSession and
+    `service()` mimics the discovery client for metadata calls and the
+    Changes API feed (every `put` is one change).
+    """
+
+    def __init__(self, profile: FaultProfile, seed: int = 0, bytes_per_second: float = 0.0):
+        self.faults = _Faults(profile, "google", seed)
+        self.bytes_per_second = bytes_per_second
+        self._files: Dict[str, dict] = {}
+        self._external: Dict[str, Callable[[], dict]] = {}
+        self._changes: List[str] = []  # file IDs in change order; page token = index
+        self._lock = threading.Lock()
+        self.bytes_down = 0
+        self.bytes_up = 0
+
+    def _transfer_delay(self, n: int) -> None:
+        if self.bytes_per_second > 0:
+            time.sleep(n / self.bytes_per_second)
+
+    def put(self, name: str, data: bytes, parent: str = "root", mime: str = "application/octet-stream") -> str:
+        import hashlib
+
+        file_id = uuid.uuid4().hex[:20]
+        with self._lock:
+            self._files[file_id] = {
+                "id": file_id,
+                "name": name,
+                "parents": [parent],
+                "mimeType": mime,
+                "size": str(len(data)),
+                "md5Checksum": hashlib.md5(data).hexdigest(),
+                "modifiedTime": time.strftime("%Y-%m-%dT%H:%M:%S.000Z", time.gmtime()),
+                "data": data,
+            }
+            self._changes.append(file_id)
+        return file_id
+
+    def register_meta(self, file_id: str, provider: Callable[[], dict]) -> None:
+        """Serve metadata for a file that lives elsewhere (e.g. a fake spreadsheet)."""
+        with self._lock:
+            self._external[file_id] = provider
+
+    def meta(self, file_id: str) -> dict:
+        with self._lock:
+            f = self._files.get(file_id)
+            provider = self._external.get(file_id)
+            if f is None and provider is not None:
+                return provider()
+            if f is None:
+                raise HttpError(httplib2.Response({"status": 404}), b"not found")
+            return {k: v for k, v in f.items() if k != "data"}
+
+    # drive_ops replacements
+    def download_file_from_drive_url(self, drive_url: str, dest_path: str, max_retries: int = 5) -> None:
+        m = re.search(r"/file/d/([^/]+)/", drive_url or "")
+        file_id = m.group(1) if m else drive_url
+        self.faults.hit()
+        with self._lock:
+            data = self._files[file_id]["data"]
+            self.bytes_down += len(data)
+        self._transfer_delay(len(data))
+        with open(dest_path, "wb") as fh:
+            shutil.copyfileobj(io.BytesIO(data), fh)
+
+    def upload_session(self) -> "FakeUploadSession":
+        return FakeUploadSession(self)
+
+    def service(self) -> "FakeDriveService":
+        return FakeDriveService(self)
+
+
+def _http_response(status: int, headers: Optional[dict] = None, body: Optional[dict] = None) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = status
+    resp.headers.update(headers or {})
+    resp._content = json.dumps(body).encode("utf-8") if body is not None else b""
+    return resp
+
+
+class FakeUploadSession:
+    """
+    Drive's resumable upload protocol (POST opens a session, PUT chunks with
+    Content-Range, 308 + Range for partial commits) for backend/upload_engine.py.
+    Injected faults come back as HTTP statuses, with nothing committed.
+    """
+
+    _sessions: Dict[str, dict] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, drive: FakeDrive):
+        self._drive = drive
+
+    def _fault(self) -> Optional[requests.Response]:
+        try:
+            self._drive.faults.hit(0.2)
+        except HttpError as e:
+            return _http_response(e.resp.status)
+        return None
+
+    def post(self, url, params=None, json=None, headers=None, **kwargs) -> requests.Response:
+        failed = self._fault()
+        if failed is not None:
+            return failed
+        uri = f"https://fake.googleapis.com/upload/{uuid.uuid4().hex}"
+        with self._lock:
+            self._sessions[uri] = {
+                "meta": dict(json or {}),
+                "mime": (headers or {}).get("X-Upload-Content-Type", "application/octet-stream"),
+                "data": bytearray(),
+            }
+        return _http_response(200, {"Location": uri})
+
+    def put(self, uri, data=b"", headers=None, **kwargs) -> requests.Response:
+        failed = self._fault()
+        if failed is not None:
+            return failed
+        with self._lock:
+            upload = self._sessions.get(uri)
+        if upload is None:
+            return _http_response(404)
+        m = re.match(r"bytes (?:(\d+)-\d+|\*)/(\d+)", (headers or {}).get("Content-Range", ""))
+        start, total = (int(m.group(1)) if m.group(1) else None), int(m.group(2))
+        if start is not None:
+            if start != len(upload["data"]):
+                return _http_response(400)
+            self._drive._transfer_delay(len(data))
+            upload["data"].extend(data)
+            with self._drive._lock:
+                self._drive.bytes_up += len(data)
+        committed = len(upload["data"])
+        if committed < total:
+            return _http_response(308, {"Range": f"bytes=0-{committed - 1}"} if committed else {})
+        with self._lock:
+            self._sessions.pop(uri, None)
+        meta = upload["meta"]
+        parent = (meta.get("parents") or ["root"])[0]
+        file_id = self._drive.put(meta.get("name", "upload"), bytes(upload["data"]), parent,
+                                  meta.get("mimeType", upload["mime"]))
+        return _http_response(200, body={"id": file_id, "name": meta.get("name", "upload")})
+
+
+class _Exec:
+    def __init__(self, fn):
+        self._fn = fn
+
+    def execute(self, **kwargs):
+        return self._fn()
+
+
+class FakeDriveService:
+    """Subset of the Drive v3 discovery client (metadata and changes only)."""
+
+    def __init__(self, drive: FakeDrive):
+        self._drive = drive
+
+    def files(self) -> "FakeDriveService":
+        return self
+
+    def get(self, fileId: str, fields: str = "", **kwargs) -> _Exec:
+        def _run():
+            self._drive.faults.hit(0.1)
+            return self._drive.meta(fileId)
+        return _Exec(_run)
+
+    def list(self, q: str = "", fields: str = "", pageToken: Optional[str] = None, **kwargs) -> _Exec:
+        def _run():
+            self._drive.faults.hit(0.1)
+            m = re.search(r"'([^']+)' in parents", q or "")
+            with self._drive._lock:
+                files = [
+                    {k: v for k, v in f.items() if k != "data"}
+                    for f in self._drive._files.values()
+                    if not m or m.group(1) in f["parents"]
+                ]
+            return {"files": files}
+        return _Exec(_run)
+
+    def changes(self) -> "FakeDriveChanges":
+        return FakeDriveChanges(self._drive)
+
+
+class FakeDriveChanges:
+    """Drive v3 `changes()` resource over FakeDrive's change log."""
+
+    def __init__(self, drive: FakeDrive):
+        self._drive = drive
+
+    def getStartPageToken(self, **kwargs) -> _Exec:
+        def _run():
+            self._drive.faults.hit(0.1)
+            with self._drive._lock:
+                return {"startPageToken": str(len(self._drive._changes))}
+        return _Exec(_run)
+
+    def list(self, pageToken: str, pageSize: int = 100, **kwargs) -> _Exec:
+        def _run():
+            self._drive.faults.hit(0.1)
+            start = int(pageToken)
+            with self._drive._lock:
+                ids = self._drive._changes[start:start + pageSize]
+                end = start + len(ids)
+                more = end < len(self._drive._changes)
+                files = [{k: v for k, v in self._drive._files[i].items() if k != "data"} for i in ids]
+            resp = {"changes": [{"fileId": f["id"], "removed": False, "file": f} for f in files]}
+            if more:
+                resp["nextPageToken"] = str(end)
+            else:
+                resp["newStartPageToken"] = str(end)
+            return resp
+        return _Exec(_run)
+
+
+# ------------------------------------------------------------------------------
+# OpenAI
+# ------------------------------------------------------------------------------
+MEETING_SUMMARY = {
+    "mom": [f"Discussed campaign item {i} and agreed next milestone." for i in range(1, 9)],
+    "todo_list": [f"Agency to deliver draft {i} by Friday." for i in range(1, 5)],
+    "action_plan": {
+        "decision_made": ["Shift budget towards search campaigns."],
+        "key_services_to_promote": ["SEO", "Paid search", "Landing pages"],
+        "target_geography": ["Mumbai", "Pune"],
+        "budget_and_timeline": ["INR 2L per month starting next week."],
+        "lead_management_strategy": ["Route leads to CRM within 5 minutes."],
+        "next_steps_and_ownership": ["Client to share creatives — marketing lead."],
+    },
+}
+
+WEBSITE_SUMMARY = {
+    "title": "Example Co",
+    "sections": [
+        {"heading": h, "content": "\n".join(f"- **Point** {i} about {h.lower()}" for i in range(1, 7))}
+        for h in (
+            "Purpose", "Target Audience", "About the Company", "Company Information",
+            "Unique Selling Proposition (USP)", "Reviews/Testimonials",
+            "Products/Service Categories", "Offers",
+        )
+    ],
+}
+
+
+class FakeOpenAI:
+    """
+    Replaces `openai.Audio.transcribe` and `openai.ChatCompletion.create`.
+    Latency scales with input size so long meetings cost more, like the API.
+    """
+
+    def __init__(
+        self,
+        whisper_profile: FaultProfile,
+        chat_profile: FaultProfile,
+        seed: int = 0,
+        whisper_seconds_per_mb: float = 0.0,
+        chat_seconds_per_1k_tokens: float = 0.0,
+    ):
+        self.whisper_faults = _Faults(whisper_profile, "openai", seed)
+        self.chat_faults = _Faults(chat_profile, "openai", seed + 1)
+        self.whisper_seconds_per_mb = whisper_seconds_per_mb
+        self.chat_seconds_per_1k_tokens = chat_seconds_per_1k_tokens
+
+    def transcribe(self, model: str, file, **kwargs) -> OpenAIObject:
+        data = file.read()
+        self.whisper_faults.hit()
+        time.sleep(self.whisper_seconds_per_mb * len(data) / (1024 * 1024))
+        words = max(1, len(data) // 2048)
+        return OpenAIObject.construct_from({"text": " ".join(f"word{i % 97}" for i in range(words))})
+
+    def chat(self, model: str, messages: List[dict], **kwargs) -> OpenAIObject:
+        prompt = " ".join(str(m.get("content", "")) for m in messages)
+        self.chat_faults.hit()
+        time.sleep(self.chat_seconds_per_1k_tokens * (len(prompt) / 4) / 1000)
+        payload = WEBSITE_SUMMARY if "website content" in prompt.lower() else MEETING_SUMMARY
+        content = json.dumps(payload)
+        if kwargs.get("stream"):
+            return self._stream(content)
+        return OpenAIObject.construct_from({
+            "choices": [{"message": {"role": "assistant", "content": content}}],
+            "usage": {"prompt_tokens": len(prompt) // 4, "completion_tokens": len(content) // 4},
+        })
+
+
+    @staticmethod
+    def _stream(content: str, piece: int = 16):
+        for i in range(0, len(content), piece):
+            yield OpenAIObject.construct_from(
+                {"choices": [{"delta": {"content": content[i : i + piece]}, "index": 0}]}
+            )
+
+
+# ------------------------------------------------------------------------------
+# Target websites
+# ------------------------------------------------------------------------------
+class FakeWeb:
+    """Replaces `requests.get` for target websites with synthetic HTML pages."""
+
+    def __init__(self, profile: FaultProfile, seed: int = 0, page_kb: int = 200):
+        self.faults = _Faults(profile, "http", seed)
+        self.page_kb = page_kb
+
+    def page(self, url: str) -> bytes:
+        nav = "".join(f"<li><a href='/p{i}'>Menu {i}</a></li>" for i in range(20))
+        para = "<p>We help clients grow with campaigns, analytics and design work. </p>"
+        body = para * max(1, (self.page_kb * 1024) // len(para))
+        html = (
+            f"<html><head><title>{url}</title><style>p{{}}</style></head>"
+            f"<body><nav><ul>{nav}</ul></nav><main>{body}</main>"
+            "<footer>© Example Co. All rights reserved. Cookie policy.</footer></body></html>"
+        )
+        return html.encode("utf-8")
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        self.faults.hit()
+        resp = requests.Response()
+        resp.status_code = 200
+        resp.url = url
+        resp.headers["Content-Type"] = "text/html; charset=utf-8"
+        resp._content = self.page(url)
+        resp.raw = io.BytesIO(resp._content)
+        resp.encoding = "utf-8"
+        return resp
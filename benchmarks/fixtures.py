@@ -0,0 +1,146 @@
+# benchmarks/fixtures.py
+"""Synthetic audio files and Main-sheet rows for the benchmark harness."""
+import io
+import math
+import struct
+import wave
+from datetime import datetime, timedelta
+from typing import List
+
+from pytz import timezone
+
+MAIN_HEADERS = [
+    "Timestamp", "Meeting Date", "Client Name", "Meeting Type", "Submitted By",
+    "Email ID", "Meeting Audio", "Website Link", "Meeting Summary",
+    "Website Summary", "MoM Summary", "Action Points Summary", "Status",
+]
+
+OUTPUT_HEADERS = [
+    "Timestamp", "Task ID", "Task Description", "Employee Name", "Employee Email ID",
+    "Target Date", "Priority", "Approval Needed", "Client Name", "Department",
+    "Assigned Name", "Assigned Email ID", "Comments", "Source Link", "Checkbox",
+    "Timestamp", "Status",
+]
+
+
+def synthetic_wav(seconds: float, sample_rate: int = 8000, freq: float = 440.0) -> bytes:
+    """Mono 16-bit sine tone — small, decodable by pydub/ffmpeg."""
+    frames = int(seconds * sample_rate)
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(sample_rate)
+        step = 2 * math.pi * freq / sample_rate
+        w.writeframes(b"".join(struct.pack("<h", int(8000 * math.sin(i * step))) for i in range(frames)))
+    return buf.getvalue()
+
+
+def main_rows(
+    audio_links: List[List[str]],
+    clients: List[str],
+    website_every: int = 2,
+    meeting_types=("Regular", "Kickstart"),
+) -> List[List[str]]:
+    """One "Processing" row per entry of `audio_links`, oldest first."""
+    now = datetime.now(timezone("Asia/Kolkata"))
+    rows = []
+    for i, links in enumerate(audio_links):
+        client = clients[i % len(clients)]
+        submitted = now - timedelta(minutes=len(audio_links) - i)
+        rows.append([
+            submitted.strftime("%Y-%m-%d %H:%M:%S"),
+            submitted.strftime("%d-%m-%Y"),
+            client,
+            meeting_types[i % len(meeting_types)],
+            "Bench User",
+            "bench@example.com",
+            ", ".join(links),
+            f"https://{client.lower().replace(' ', '-')}.example.com" if website_every and i % website_every == 0 else "",
+            "", "", "", "",
+            "Processing",
+        ])
+    return rows
+
+
+# A realistic small-business site for the website shaping checks: varied
+# prose, site chrome, a consent banner and a legal footer, plus content
+# that merely mentions cookies, plans or logging in.
+AGENCY_PAGE_BOILERPLATE = [
+    "We use cookies to improve your experience on our site.",
+    "Accept all cookies",
+    "Manage preferences",
+    "Skip to main content",
+    "Log in",
+    "Sign in to the client portal",
+    "Privacy policy",
+    "Terms of service",
+    "© 2026 Northwind Bakery & Catering. All rights reserved.",
+    "Subscribe to our newsletter",
+]
+AGENCY_PAGE_KEEP = [
+    "Fresh cookies daily",
+    "Our planning service for weddings and small teams",
+    "Planet-friendly packaging on every order",
+    "Guests sign consent forms for allergen-free menus",
+    "Staff log their temperature checks every morning",
+]
+
+_SERVICES = [
+    ("Wedding catering", "Tasting sessions, seasonal menus and a dedicated coordinator on the day"),
+    ("Corporate lunches", "Boxed lunches and buffets delivered before noon across the city centre"),
+    ("Celebration cakes", "Layered sponges, sugar flowers and custom lettering for birthdays and anniversaries"),
+    ("Bread subscriptions", "Sourdough, rye and seeded loaves dropped off twice a week"),
+    ("Baking classes", "Weekend workshops on laminated doughs, pastry and decorating for beginners"),
+    ("Event pastry tables", "Petit fours, tarts and macarons styled to match the venue"),
+    ("Gluten-free range", "A separate kitchen line for coeliac-safe breads and desserts"),
+    ("Wholesale", "Daily bakes for cafés and hotels, with standing orders and invoicing"),
+]
+_DETAILS = [
+    "Orders placed by Thursday are ready for the weekend.",
+    "Every menu is built around what local farms have that week.",
+    "Our pastry team trained in Lyon and Copenhagen before joining us.",
+    "Delivery vans are refrigerated and tracked, so you always know the arrival time.",
+    "Prices include set-up and collection of stands, linen and serving ware.",
+    "We can scale from twenty guests to six hundred without changing the menu.",
+    "Dietary requirements are labelled on every tray and confirmed a week ahead.",
+    "Repeat clients get priority on bank-holiday dates, which book out months early.",
+    "Flour comes from a mill forty miles away that we have worked with since 2011.",
+    "A coordinator visits the venue beforehand to plan power, water and access.",
+]
+_REVIEWS = [
+    ("Priya S.", "The cake was the talk of the wedding and the team handled a last-minute guest change calmly."),
+    ("Tom R.", "We have used them for our Friday office lunch for three years and never had a late delivery."),
+    ("Hannah L.", "The gluten-free loaves are the first ones my daughter has actually enjoyed."),
+    ("Marco D.", "Their wholesale croissants doubled our morning sales within a month."),
+]
+
+
+def agency_page_html(sections: int = 24) -> str:
+    """Bakery & catering site, roughly 10k tokens of text at the default size."""
+    nav = "".join(f'<li><a href="/{slug}">{slug.title()}</a></li>'
+                  for slug in ("home", "menus", "weddings", "corporate", "classes", "about", "contact"))
+    body = []
+    for i in range(sections):
+        name, blurb = _SERVICES[i % len(_SERVICES)]
+        body.append(f"<section><h2>{name} — option {i + 1}</h2><p>{blurb}.</p>")
+        for j in range(4):
+            detail = " ".join(_DETAILS[(i + j + k) % len(_DETAILS)] for k in range(3 + (i + j) % 4))
+            body.append(f"<p>{detail} Package {i + 1}.{j + 1} starts at £{12 + i * 3 + j} per guest.</p>")
+        who, quote = _REVIEWS[i % len(_REVIEWS)]
+        body.append(f"<blockquote>“{quote}” — {who}, client since {2015 + i % 9}</blockquote>")
+        body.append(f'<p><a href="/menus/{i}">See the full menu</a></p></section>')
+    keep = "".join(f"<p>{t}</p>" for t in AGENCY_PAGE_KEEP)
+    consent, accept, manage, skip, login, portal, privacy, terms, copyright_line, newsletter = AGENCY_PAGE_BOILERPLATE
+    return (
+        "<!doctype html><html><head><title>Northwind Bakery &amp; Catering</title></head><body>"
+        f'<div class="consent"><p>{consent}</p><button>{accept}</button><button>{manage}</button></div>'
+        f'<a href="#main">{skip}</a><header><a href="/login">{login}</a></header><nav><ul>{nav}</ul></nav>'
+        "<main><h1>About us</h1><p>Northwind is a family bakery and events caterer founded in 2009. "
+        "We help couples, offices and cafés serve food people remember, baked the same morning.</p>"
+        f"{keep}{''.join(body)}"
+        f'<div><a href="/portal">{portal}</a></div></main>'
+        f'<footer><p><a href="/privacy">{privacy}</a></p><p><a href="/terms">{terms}</a></p>'
+        f"<p>{copyright_line}</p><p>{newsletter}</p></footer>"
+        "</body></html>"
+    )
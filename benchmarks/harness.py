@@ -0,0 +1,190 @@
+# benchmarks/harness.py
+"""
+Wires the fakes into the real code paths. `install_fakes()` must run before
+anything imports `config.config`: it points the Google/OpenAI/HTTP client
+constructors at the in-memory stand-ins, then imports the backend so
+`backend.main.process_rows` / `process_row` run unmodified against them.
+"""
+import os
+import sys
+import tempfile
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Dict, List
+
+from benchmarks.fakes import FakeDrive, FakeOpenAI, FakeSheetsClient, FakeWeb, FaultProfile
+from benchmarks.fixtures import MAIN_HEADERS, OUTPUT_HEADERS, main_rows, synthetic_wav
+
+_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+BENCH_SHEET_ID = "bench-main"
+BENCH_OUTPUT_ID = "bench-output"
+BENCH_INTAKE_FOLDER_ID = "bench-regular"
+
+
+@dataclass
+class BenchProfiles:
+    sheets: FaultProfile = field(default_factory=lambda: FaultProfile(latency_s=0.15, jitter_s=0.05))
+    drive: FaultProfile = field(default_factory=lambda: FaultProfile(latency_s=0.3, jitter_s=0.1))
+    whisper: FaultProfile = field(default_factory=lambda: FaultProfile(latency_s=1.0, jitter_s=0.5))
+    chat: FaultProfile = field(default_factory=lambda: FaultProfile(latency_s=2.0, jitter_s=1.0))
+    web: FaultProfile = field(default_factory=lambda: FaultProfile(latency_s=0.4, jitter_s=0.2))
+    drive_bytes_per_second: float = 50 * 1024 * 1024
+    whisper_seconds_per_mb: float = 0.5
+    chat_seconds_per_1k_tokens: float = 0.05
+    seed: int = 7
+
+
+@dataclass
+class Fakes:
+    sheets: FakeSheetsClient
+    drive: FakeDrive
+    openai: FakeOpenAI
+    web: FakeWeb
+
+    def _all_faults(self):
+        return [self.sheets.faults, self.drive.faults, self.openai.whisper_faults,
+                self.openai.chat_faults, self.web.faults]
+
+    @contextmanager
+    def quiet(self):
+        """Disable latency/fault injection for harness bookkeeping calls."""
+        for f in self._all_faults():
+            f.enabled = False
+        try:
+            yield
+        finally:
+            for f in self._all_faults():
+                f.enabled = True
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        return {
+            "sheets": self.sheets.faults.stats(),
+            "drive": self.drive.faults.stats(),
+            "whisper": self.openai.whisper_faults.stats(),
+            "chat": self.openai.chat_faults.stats(),
+            "web": self.web.faults.stats(),
+        }
+
+
+def install_fakes(profiles: BenchProfiles) -> Fakes:
+    if "config.config" in sys.modules:
+        raise RuntimeError("install_fakes() must run before config.config is imported.")
+
+    # Same import roots as `python backend/main.py` (repo root + backend/).
+    for path in (_ROOT, os.path.join(_ROOT, "backend")):
+        if path not in sys.path:
+            sys.path.insert(0, path)
+
+    os.environ.update({
+        "GOOGLE_SHEET_ID": BENCH_SHEET_ID,
+        "OUTPUT_SHEET_ID": BENCH_OUTPUT_ID,
+        "OUTPUT_SHEET_TAB": "Sheet1",
+        "GOOGLE_SA_JSON": '{"type": "service_account", "benchmark": true}',
+        "SPANS_JSONL_PATH": os.environ.get("SPANS_JSONL_PATH", ""),
+        "OUTPUT_SPILL_PATH": os.path.join(tempfile.gettempdir(), "fms_bench_todos.spill.jsonl"),
+        "CHECKPOINT_DIR": tempfile.mkdtemp(prefix="fms_bench_ckpt_"),
+        # fresh per run: saved routing history would otherwise carry over between runs
+        "ROUTER_STATS_PATH": os.path.join(tempfile.mkdtemp(prefix="fms_bench_router_"), "router_stats.json"),
+        "LEDGER_PATH": os.environ.get("LEDGER_PATH", ""),
+        "REGULAR_FOLDER_ID": BENCH_INTAKE_FOLDER_ID,
+        "KICKSTART_FOLDER_ID": "bench-kickstart",
+        "PREFETCH_STATE_PATH": "",
+        "PREFETCH_CACHE_DIR": tempfile.mkdtemp(prefix="fms_bench_transcripts_"),
+    })
+
+    import gspread
+    import googleapiclient.discovery
+    import openai
+    import requests
+    from google.oauth2.service_account import Credentials
+
+    fakes = Fakes(
+        sheets=FakeSheetsClient(profiles.sheets, profiles.seed),
+        drive=FakeDrive(profiles.drive, profiles.seed, profiles.drive_bytes_per_second),
+        openai=FakeOpenAI(
+            profiles.whisper,
+            profiles.chat,
+            profiles.seed,
+            whisper_seconds_per_mb=profiles.whisper_seconds_per_mb,
+            chat_seconds_per_1k_tokens=profiles.chat_seconds_per_1k_tokens,
+        ),
+        web=FakeWeb(profiles.web, profiles.seed),
+    )
+
+    # Client constructors used at import time by config/config.py
+    Credentials.from_service_account_info = classmethod(lambda cls, info, **kw: object())
+    gspread.authorize = lambda *a, **kw: fakes.sheets
+    gspread.service_account = lambda *a, **kw: fakes.sheets
+    googleapiclient.discovery.build = lambda *a, **kw: fakes.drive.service()
+
+    # OpenAI + target websites
+    openai.Audio.transcribe = staticmethod(lambda *a, **kw: fakes.openai.transcribe(**kw))
+    openai.ChatCompletion.create = staticmethod(lambda *a, **kw: fakes.openai.chat(**kw))
+    requests.get = fakes.web.get
+
+    with fakes.quiet():
+        _seed_sheets(fakes.sheets)
+    # the daemon's change probe reads the spreadsheet's Drive version
+    fakes.drive.register_meta(BENCH_SHEET_ID, fakes.sheets.open_by_key(BENCH_SHEET_ID).drive_meta)
+
+    # Downloads go through backend/drive_ops.py; uploads run the real upload
+    # engine against the fake resumable endpoint.
+    import backend.drive_ops as drive_ops
+    import backend.processor as processor
+    import backend.upload_engine as upload_engine
+
+    for module in (drive_ops, processor):
+        module.download_file_from_drive_url = fakes.drive.download_file_from_drive_url
+    upload_engine._session = lambda credentials=None: fakes.drive.upload_session()
+    return fakes
+
+
+def _seed_sheets(sheets: FakeSheetsClient) -> None:
+    book = sheets.open_by_key(BENCH_SHEET_ID)
+    book.worksheet("Main").update("A1", [MAIN_HEADERS])
+    book.worksheet("Dropdown").update("A1", [["Bench User", "", "", "bench@example.com", "", "Client A"]])
+    sheets.open_by_key(BENCH_OUTPUT_ID).worksheet("Sheet1").update("A1", [OUTPUT_HEADERS])
+
+
+def seed_rows(
+    fakes: Fakes,
+    n_rows: int,
+    clients: List[str],
+    audio_seconds: float,
+    files_per_row: int = 1,
+    shared_audio_every: int = 0,
+) -> List[int]:
+    """
+    Reset the Main tab to `n_rows` "Processing" rows backed by synthetic audio
+    in the fake Drive. Returns their sheet row numbers.
+    """
+    with fakes.quiet():
+        return _seed_rows(fakes, n_rows, clients, audio_seconds, files_per_row, shared_audio_every)
+
+
+def _seed_rows(fakes, n_rows, clients, audio_seconds, files_per_row, shared_audio_every) -> List[int]:
+    main = fakes.sheets.open_by_key(BENCH_SHEET_ID).worksheet("Main")
+    if main.row_count > 1:
+        main.delete_rows(2, main.row_count)
+
+    audio = synthetic_wav(audio_seconds)
+    links: List[List[str]] = []
+    shared_link = None
+    for i in range(n_rows):
+        row_links = []
+        for j in range(files_per_row):
+            if shared_audio_every and i % shared_audio_every == 0 and j == 0:
+                if shared_link is None:
+                    shared_link = _drive_link(fakes.drive.put("shared.wav", audio, BENCH_INTAKE_FOLDER_ID))
+                row_links.append(shared_link)
+                continue
+            name = f"{clients[i % len(clients)]}_01-01-2025_{j + 1}.wav"
+            row_links.append(_drive_link(fakes.drive.put(name, audio, BENCH_INTAKE_FOLDER_ID)))
+        links.append(row_links)
+
+    main.append_rows(main_rows(links, clients))
+    return list(range(2, 2 + n_rows))
+
+
+def _drive_link(file_id: str) -> str:
+    return f"https://drive.google.com/file/d/{file_id}/view"
@@ -0,0 +1,157 @@
+# benchmarks/run_throughput.py
+"""
+End-to-end throughput benchmark against local service fakes.
+
+    python -m benchmarks.run_throughput --rows 24 --concurrency 1,2,4,8
+    python -m benchmarks.run_throughput --chat-latency 4 --rate-limit-rate 0.05
+    python -m benchmarks.run_throughput --prefetch   # audio transcribed off the changes feed first
+
+Reports rows/minute, p50/p95 row latency, failures and peak memory for each
+concurrency level. Nothing leaves the machine: Drive, Sheets, Whisper, chat
+completions and target websites are all in-memory stand-ins.
+"""
+import argparse
+import json
+import resource
+import statistics
+import threading
+import time
+import tracemalloc
+from typing import Dict, List
+
+from benchmarks.fakes import FaultProfile
+from benchmarks.harness import BenchProfiles, install_fakes, seed_rows
+
+
+def _pct(values: List[float], q: int) -> float:
+    if not values:
+        return 0.0
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[q - 1]
+
+
+def run_level(fakes, concurrency: int, args) -> Dict[str, float]:
+    import backend.main as backend_main
+
+    prefetcher = None
+    if args.prefetch:
+        from backend.prefetch import ChangesFeed, Prefetcher
+        from backend.processor import prefetch_audio
+
+        feed = ChangesFeed(state_path="")
+        with fakes.quiet():
+            feed.poll()  # start the feed before the intake uploads below
+        prefetcher = Prefetcher(prefetch_audio, feed=feed, workers=concurrency)
+
+    seed_rows(
+        fakes,
+        args.rows,
+        clients=[f"Client {c}" for c in "ABCDEF"[: args.clients]],
+        audio_seconds=args.audio_seconds,
+        files_per_row=args.files_per_row,
+        shared_audio_every=args.shared_audio_every,
+    )
+    prefetch_s = 0.0
+    if prefetcher is not None:
+        t0 = time.perf_counter()
+        prefetcher.poll_once()
+        prefetcher.drain(timeout_s=3600)
+        prefetcher.stop()
+        prefetch_s = time.perf_counter() - t0
+    with fakes.quiet():
+        rows = backend_main.get_processing_rows()
+
+    latencies: List[float] = []
+    lock = threading.Lock()
+    real_process_row = backend_main.process_row
+
+    def timed_process_row(idx, row_values):
+        t0 = time.perf_counter()
+        try:
+            return real_process_row(idx, row_values)
+        finally:
+            with lock:
+                latencies.append(time.perf_counter() - t0)
+
+    backend_main.process_row = timed_process_row
+    if args.tracemalloc:
+        tracemalloc.start()
+    t0 = time.perf_counter()
+    try:
+        results = backend_main.process_rows(rows, concurrency=concurrency)
+    finally:
+        elapsed = time.perf_counter() - t0
+        backend_main.process_row = real_process_row
+        peak = tracemalloc.get_traced_memory()[1] if args.tracemalloc else 0
+        if args.tracemalloc:
+            tracemalloc.stop()
+
+    ok = sum(1 for r in results if r)
+    return {
+        "concurrency": concurrency,
+        "rows": len(rows),
+        "failed": len(rows) - ok,
+        "elapsed_s": round(elapsed, 3),
+        "rows_per_min": round(ok / elapsed * 60, 2) if elapsed else 0.0,
+        "p50_s": round(_pct(latencies, 50), 3),
+        "p95_s": round(_pct(latencies, 95), 3),
+        "py_peak_mb": round(peak / (1024 * 1024), 2),
+        "rss_max_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "prefetch_s": round(prefetch_s, 3),
+    }
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--rows", type=int, default=16)
+    ap.add_argument("--concurrency", default="1,2,4", help="comma-separated levels")
+    ap.add_argument("--clients", type=int, default=3)
+    ap.add_argument("--audio-seconds", type=float, default=60.0)
+    ap.add_argument("--files-per-row", type=int, default=1)
+    ap.add_argument("--shared-audio-every", type=int, default=0,
+                    help="every Nth row reuses one shared Drive audio file")
+    ap.add_argument("--sheets-latency", type=float, default=0.15)
+    ap.add_argument("--drive-latency", type=float, default=0.3)
+    ap.add_argument("--whisper-latency", type=float, default=1.0)
+    ap.add_argument("--chat-latency", type=float, default=2.0)
+    ap.add_argument("--web-latency", type=float, default=0.4)
+    ap.add_argument("--error-rate", type=float, default=0.0, help="applied to every fake")
+    ap.add_argument("--rate-limit-rate", type=float, default=0.0, help="429s, applied to every fake")
+    ap.add_argument("--seed", type=int, default=7)
+    ap.add_argument("--prefetch", action="store_true",
+                    help="transcribe the seeded audio from the Drive changes feed before rows are processed")
+    ap.add_argument("--no-tracemalloc", dest="tracemalloc", action="store_false")
+    ap.add_argument("--json-out", default="", help="also write results as JSON")
+    args = ap.parse_args(argv)
+
+    def _profile(latency: float) -> FaultProfile:
+        return FaultProfile(latency, latency / 2, args.error_rate, args.rate_limit_rate)
+
+    fakes = install_fakes(BenchProfiles(
+        sheets=_profile(args.sheets_latency),
+        drive=_profile(args.drive_latency),
+        whisper=_profile(args.whisper_latency),
+        chat=_profile(args.chat_latency),
+        web=_profile(args.web_latency),
+        seed=args.seed,
+    ))
+
+    from backend import cpu_pool
+
+    cpu_pool.warm_up()  # same as backend/main.py: fork workers before row threads start
+    results = [run_level(fakes, int(c), args) for c in args.concurrency.split(",") if c.strip()]
+
+    cols = ["concurrency", "rows", "failed", "elapsed_s", "rows_per_min", "p50_s", "p95_s", "py_peak_mb", "rss_max_mb", "prefetch_s"]
+    print("\n" + " | ".join(f"{c:>12}" for c in cols))
+    for r in results:
+        print(" | ".join(f"{r[c]:>12}" for c in cols))
+    print("\nfake service calls:", json.dumps(fakes.stats()))
+
+    if args.json_out:
+        with open(args.json_out, "w", encoding="utf-8") as f:
+            json.dump({"results": results, "calls": fakes.stats()}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 import os
 import json
+import tempfile
 import gspread
 from typing import Optional
 from google.oauth2.service_account import Credentials
@@ -56,6 +57,34 @@ def _load_creds_from_env_vars() -> Credentials:
         "or GOOGLE_SA_FILE (path to mounted secret file)."
     )
 
+def _parse_kv_floats(raw: str, cast=float) -> dict:
+    """ "a=1.5, b=2" -> {"a": 1.5, "b": 2.0} (bad pairs are skipped)."""
+    out = {}
+    for pair in (raw or "").split(","):
+        key, sep, value = pair.partition("=")
+        if sep:
+            try:
+                out[key.strip()] = cast(value)
+            except ValueError:
+                pass
+    return out
+
+
+def _parse_kv_ints(raw: str) -> dict:
+    """ "a=4, b=1" -> {"a": 4, "b": 1} (bad pairs, e.g. "a=1.5", are skipped)."""
+    return _parse_kv_floats(raw, cast=int)
+
+def _setting(name: str, default: str = "") -> str:
+    """
+    Optional tunable: read from st.secrets on Streamlit Cloud, else from env.
+    """
+    if RUNNING_IN_STREAMLIT_CLOUD and st is not None:
+        try:
+            return str(st.secrets.get(name, default))
+        except Exception:
+            return default
+    return os.getenv(name, default)
+
 # ------------------------------------------------------------------------------
 # Load config per environment
 # ------------------------------------------------------------------------------
@@ -111,6 +140,132 @@ else:
 if not GOOGLE_SHEET_ID:
     raise ValueError("GOOGLE_SHEET_ID is missing.")
 
+# ------------------------------------------------------------------------------
+# Tunables (optional; safe defaults)
+# ------------------------------------------------------------------------------
+# Intake uploads: files uploaded in parallel and bytes per resumable chunk.
+UPLOAD_CONCURRENCY = int(_setting("UPLOAD_CONCURRENCY", "4"))
+UPLOAD_CHUNK_MB = int(_setting("UPLOAD_CHUNK_MB", "5"))  # first chunk, before throughput is known
+# Upload engine (all Drive uploads): chunks sized to ~N seconds each, capped.
+UPLOAD_MAX_CHUNK_MB = int(_setting("UPLOAD_MAX_CHUNK_MB", "32"))
+UPLOAD_TARGET_CHUNK_SECONDS = float(_setting("UPLOAD_TARGET_CHUNK_SECONDS", "8"))
+UPLOAD_RETRIES = int(_setting("UPLOAD_RETRIES", "5"))  # consecutive failures without progress
+# Intake dedup: reuse a Drive file with the same MD5 instead of re-uploading.
+INTAKE_DEDUP = _setting("INTAKE_DEDUP", "1").strip().lower() in ("1", "true", "yes")
+INTAKE_MD5_INDEX_PATH = _setting("INTAKE_MD5_INDEX_PATH", "drive_md5_index.json")
+INTAKE_MD5_REFRESH_SECONDS = float(_setting("INTAKE_MD5_REFRESH_SECONDS", "30"))
+
+# Push trigger: frontend -> backend wake-up (empty URL disables it).
+BACKEND_TRIGGER_URL = _setting("BACKEND_TRIGGER_URL", "")
+TRIGGER_TOKEN = _setting("TRIGGER_TOKEN", "")
+TRIGGER_PORT = int(_setting("TRIGGER_PORT", os.getenv("PORT", "8080")))
+BACKEND_QUEUE_URL = _setting("BACKEND_QUEUE_URL", "") or (
+    BACKEND_TRIGGER_URL.rsplit("/trigger", 1)[0] + "/queue" if BACKEND_TRIGGER_URL else ""
+)
+
+# Intake admission control: warn / defer past a backlog, cap parallel submits.
+INTAKE_SOFT_BACKLOG = int(_setting("INTAKE_SOFT_BACKLOG", "10"))
+INTAKE_MAX_BACKLOG = int(_setting("INTAKE_MAX_BACKLOG", "25"))  # 0 = never defer
+INTAKE_MAX_ACTIVE_UPLOADS = int(_setting("INTAKE_MAX_ACTIVE_UPLOADS", "2"))
+INTAKE_SLOT_WAIT_SECONDS = float(_setting("INTAKE_SLOT_WAIT_SECONDS", "60"))
+INTAKE_AVG_ROW_MINUTES = float(_setting("INTAKE_AVG_ROW_MINUTES", "5"))
+INTAKE_QUEUE_CACHE_SECONDS = int(_setting("INTAKE_QUEUE_CACHE_SECONDS", "30"))
+
+# Backend worker: long-running daemon mode and its reconciliation poll.
+BACKEND_DAEMON = _setting("BACKEND_DAEMON", "").strip().lower() in ("1", "true", "yes")
+RECONCILE_INTERVAL_SECONDS = float(_setting("RECONCILE_INTERVAL_SECONDS", "300"))
+BACKEND_ROW_CONCURRENCY = int(_setting("BACKEND_ROW_CONCURRENCY", "1"))
+# Daemon poll: probe delay grows from MIN to MAX while idle, resets on work.
+DAEMON_POLL_MIN_SECONDS = float(_setting("DAEMON_POLL_MIN_SECONDS", "2"))
+DAEMON_POLL_MAX_SECONDS = float(_setting("DAEMON_POLL_MAX_SECONDS", "60"))
+
+# Telemetry: per-stage spans as JSON lines (empty disables the file export).
+SPANS_JSONL_PATH = _setting("SPANS_JSONL_PATH", "fms_spans.jsonl")
+
+# Output (To-Do) sheet writer: coalesced appends + crash-safe spill file.
+OUTPUT_FLUSH_INTERVAL_SECONDS = float(_setting("OUTPUT_FLUSH_INTERVAL_SECONDS", "30"))
+OUTPUT_FLUSH_MAX_ROWS = int(_setting("OUTPUT_FLUSH_MAX_ROWS", "50"))
+OUTPUT_SPILL_PATH = _setting("OUTPUT_SPILL_PATH", "output_todos.spill.jsonl")
+
+# Per-row stage checkpoints (empty disables resume).
+CHECKPOINT_DIR = _setting("CHECKPOINT_DIR", "checkpoints")
+
+# Process pool for CPU-bound stages (0 = run inline).
+CPU_POOL_WORKERS = int(_setting("CPU_POOL_WORKERS", str(os.cpu_count() or 1)))
+CPU_POOL_START_METHOD = _setting("CPU_POOL_START_METHOD", "fork")
+
+# Per-row scratch space (downloads, audio chunks, rendered docs).
+SCRATCH_DIR = _setting("SCRATCH_DIR", os.path.join(tempfile.gettempdir(), "fms_scratch"))
+SCRATCH_QUOTA_MB = int(_setting("SCRATCH_QUOTA_MB", "2048"))
+SCRATCH_RAM_DIR = _setting("SCRATCH_RAM_DIR", "")  # e.g. /dev/shm/fms_scratch
+SCRATCH_RAM_MAX_MB = int(_setting("SCRATCH_RAM_MAX_MB", "8"))
+
+# Chat completions: stream + parse JSON incrementally; request JSON mode.
+OPENAI_STREAMING = _setting("OPENAI_STREAMING", "1").strip().lower() in ("1", "true", "yes")
+OPENAI_JSON_MODE = _setting("OPENAI_JSON_MODE", "1").strip().lower() in ("1", "true", "yes")
+
+# Summary model routing (all default to OPENAI_MODEL; empty fallback = none).
+OPENAI_MODEL_FAST = _setting("OPENAI_MODEL_FAST", "") or OPENAI_MODEL
+OPENAI_MODEL_LONG = _setting("OPENAI_MODEL_LONG", "") or OPENAI_MODEL
+OPENAI_FALLBACK_MODEL = _setting("OPENAI_FALLBACK_MODEL", "")
+ROUTER_FAST_MAX_TOKENS = int(_setting("ROUTER_FAST_MAX_TOKENS", "4000"))
+ROUTER_LONG_MIN_TOKENS = int(_setting("ROUTER_LONG_MIN_TOKENS", "60000"))
+ROUTER_BUDGET_SECONDS = _parse_kv_floats(_setting("ROUTER_BUDGET_SECONDS", ""))  # "meeting=120,website=45"
+ROUTER_STATS_PATH = _setting("ROUTER_STATS_PATH", "router_stats.json")
+
+# Main-sheet archiving: Done rows older than N days move to an archive tab
+# (empty ARCHIVE_SHEET_ID = same spreadsheet; interval 0 = daemon never runs it).
+ARCHIVE_AFTER_DAYS = float(_setting("ARCHIVE_AFTER_DAYS", "30"))
+ARCHIVE_SHEET_ID = _setting("ARCHIVE_SHEET_ID", "")
+ARCHIVE_SHEET_TAB = _setting("ARCHIVE_SHEET_TAB", "Archive")
+ARCHIVE_MAX_ROWS = int(_setting("ARCHIVE_MAX_ROWS", "2000"))
+ARCHIVE_INTERVAL_SECONDS = float(_setting("ARCHIVE_INTERVAL_SECONDS", "21600"))
+
+# Website fetch: stop at a byte budget, enough text, or a total deadline.
+WEB_MAX_BYTES = int(_setting("WEB_MAX_BYTES", str(3 * 1024 * 1024)))
+WEB_MAX_CHARS = int(_setting("WEB_MAX_CHARS", "60000"))
+WEB_FETCH_TIMEOUT_SECONDS = float(_setting("WEB_FETCH_TIMEOUT_SECONDS", "20"))
+# Website prompt: page text is de-duplicated, de-boilerplated and cut to this.
+WEB_TOKEN_BUDGET = int(_setting("WEB_TOKEN_BUDGET", "6000"))  # 0 = no cap
+
+# Transcription engines ("openai" | "local" | "fake"), per-engine slots and
+# overflow routing (local needs the optional faster-whisper package).
+TRANSCRIBE_ENGINE = _setting("TRANSCRIBE_ENGINE", "openai").strip().lower()
+TRANSCRIBE_OVERFLOW_ENGINE = _setting("TRANSCRIBE_OVERFLOW_ENGINE", "local").strip().lower()
+TRANSCRIBE_CONCURRENCY = _parse_kv_ints(_setting("TRANSCRIBE_CONCURRENCY", "openai=4,local=1,fake=4"))
+TRANSCRIBE_OVERFLOW_QUEUE = int(_setting("TRANSCRIBE_OVERFLOW_QUEUE", "1"))
+TRANSCRIBE_LOCAL_MAX_SECONDS = float(_setting("TRANSCRIBE_LOCAL_MAX_SECONDS", "0"))
+TRANSCRIBE_COOLDOWN_SECONDS = float(_setting("TRANSCRIBE_COOLDOWN_SECONDS", "60"))
+LOCAL_WHISPER_MODEL = _setting("LOCAL_WHISPER_MODEL", "base")
+LOCAL_WHISPER_COMPUTE_TYPE = _setting("LOCAL_WHISPER_COMPUTE_TYPE", "int8")
+
+# Usage ledger (empty path disables) and optional prices for its report (USD).
+LEDGER_PATH = _setting("LEDGER_PATH", "fms_ledger.jsonl")
+PRICE_PER_1K_PROMPT_TOKENS = _parse_kv_floats(_setting("PRICE_PER_1K_PROMPT_TOKENS", ""))  # "model=0.00015"
+PRICE_PER_1K_COMPLETION_TOKENS = _parse_kv_floats(_setting("PRICE_PER_1K_COMPLETION_TOKENS", ""))
+PRICE_PER_AUDIO_MINUTE = _parse_kv_floats(_setting("PRICE_PER_AUDIO_MINUTE", "whisper-1=0.006"))
+
+# On-demand profiling: "cpu" | "mem" | "all" ("" = off), every Nth row/upload.
+PROFILE_MODE = _setting("PROFILE_MODE", "").strip().lower()
+PROFILE_DIR = _setting("PROFILE_DIR", "profiles")
+PROFILE_EVERY_N = int(_setting("PROFILE_EVERY_N", "1"))
+PROFILE_TOP_N = int(_setting("PROFILE_TOP_N", "30"))
+
+# Speculative prefetch: follow the intake folders through the Drive Changes
+# API and transcribe new audio before its row reaches "Processing".
+PREFETCH_AUDIO = _setting("PREFETCH_AUDIO", "1").strip().lower() in ("1", "true", "yes")
+PREFETCH_POLL_SECONDS = float(_setting("PREFETCH_POLL_SECONDS", "15"))
+PREFETCH_CONCURRENCY = int(_setting("PREFETCH_CONCURRENCY", "1"))
+PREFETCH_STATE_PATH = _setting("PREFETCH_STATE_PATH", "drive_changes_token.json")
+PREFETCH_CACHE_DIR = _setting("PREFETCH_CACHE_DIR", "transcript_cache")
+PREFETCH_CACHE_TTL_HOURS = float(_setting("PREFETCH_CACHE_TTL_HOURS", "72"))
+
+# Pending-row scheduler: SLA + weight per meeting type, cost and fairness.
+SLA_TARGETS_SECONDS = _parse_kv_floats(_setting("SLA_TARGETS_SECONDS", "Kickstart=1800,Regular=14400"))
+MEETING_TYPE_WEIGHTS = _parse_kv_floats(_setting("MEETING_TYPE_WEIGHTS", "Kickstart=3,Regular=1"))
+SCHEDULER_COST_MB_SCALE = float(_setting("SCHEDULER_COST_MB_SCALE", "100"))
+SCHEDULER_FAIRNESS_PENALTY = float(_setting("SCHEDULER_FAIRNESS_PENALTY", "0.5"))
+
 # ------------------------------------------------------------------------------
 # Shared clients (usable by frontend & backend)
 # ------------------------------------------------------------------------------
@@ -146,6 +301,85 @@ __all__ = [
     "OUTPUT_SHEET_ID",
     "OUTPUT_SHEET_TAB",
     "output_sheet",
+    # tunables
+    "UPLOAD_CONCURRENCY",
+    "UPLOAD_CHUNK_MB",
+    "UPLOAD_MAX_CHUNK_MB",
+    "UPLOAD_TARGET_CHUNK_SECONDS",
+    "UPLOAD_RETRIES",
+    "INTAKE_DEDUP",
+    "INTAKE_MD5_INDEX_PATH",
+    "INTAKE_MD5_REFRESH_SECONDS",
+    "BACKEND_TRIGGER_URL",
+    "TRIGGER_TOKEN",
+    "BACKEND_QUEUE_URL",
+    "INTAKE_SOFT_BACKLOG",
+    "INTAKE_MAX_BACKLOG",
+    "INTAKE_MAX_ACTIVE_UPLOADS",
+    "INTAKE_SLOT_WAIT_SECONDS",
+    "INTAKE_AVG_ROW_MINUTES",
+    "INTAKE_QUEUE_CACHE_SECONDS",
+    "TRIGGER_PORT",
+    "BACKEND_DAEMON",
+    "RECONCILE_INTERVAL_SECONDS",
+    "BACKEND_ROW_CONCURRENCY",
+    "DAEMON_POLL_MIN_SECONDS",
+    "DAEMON_POLL_MAX_SECONDS",
+    "ARCHIVE_AFTER_DAYS",
+    "ARCHIVE_SHEET_ID",
+    "ARCHIVE_SHEET_TAB",
+    "ARCHIVE_MAX_ROWS",
+    "ARCHIVE_INTERVAL_SECONDS",
+    "WEB_MAX_BYTES",
+    "WEB_MAX_CHARS",
+    "WEB_FETCH_TIMEOUT_SECONDS",
+    "WEB_TOKEN_BUDGET",
+    "TRANSCRIBE_ENGINE",
+    "TRANSCRIBE_OVERFLOW_ENGINE",
+    "TRANSCRIBE_CONCURRENCY",
+    "TRANSCRIBE_OVERFLOW_QUEUE",
+    "TRANSCRIBE_LOCAL_MAX_SECONDS",
+    "TRANSCRIBE_COOLDOWN_SECONDS",
+    "LOCAL_WHISPER_MODEL",
+    "LOCAL_WHISPER_COMPUTE_TYPE",
+    "LEDGER_PATH",
+    "PRICE_PER_1K_PROMPT_TOKENS",
+    "PRICE_PER_1K_COMPLETION_TOKENS",
+    "PRICE_PER_AUDIO_MINUTE",
+    "PROFILE_MODE",
+    "PROFILE_DIR",
+    "PROFILE_EVERY_N",
+    "PROFILE_TOP_N",
+    "PREFETCH_AUDIO",
+    "PREFETCH_POLL_SECONDS",
+    "PREFETCH_CONCURRENCY",
+    "PREFETCH_STATE_PATH",
+    "PREFETCH_CACHE_DIR",
+    "PREFETCH_CACHE_TTL_HOURS",
+    "SPANS_JSONL_PATH",
+    "OUTPUT_FLUSH_INTERVAL_SECONDS",
+    "OUTPUT_FLUSH_MAX_ROWS",
+    "OUTPUT_SPILL_PATH",
+    "CHECKPOINT_DIR",
+    "CPU_POOL_WORKERS",
+    "CPU_POOL_START_METHOD",
+    "SCRATCH_DIR",
+    "SCRATCH_QUOTA_MB",
+    "SCRATCH_RAM_DIR",
+    "SCRATCH_RAM_MAX_MB",
+    "OPENAI_STREAMING",
+    "OPENAI_JSON_MODE",
+    "OPENAI_MODEL_FAST",
+    "OPENAI_MODEL_LONG",
+    "OPENAI_FALLBACK_MODEL",
+    "ROUTER_FAST_MAX_TOKENS",
+    "ROUTER_LONG_MIN_TOKENS",
+    "ROUTER_BUDGET_SECONDS",
+    "ROUTER_STATS_PATH",
+    "SLA_TARGETS_SECONDS",
+    "MEETING_TYPE_WEIGHTS",
+    "SCHEDULER_COST_MB_SCALE",
+    "SCHEDULER_FAIRNESS_PENALTY",
     # scopes / clients
     "GOOGLE_DRIVE_SCOPES",
     "SCOPES",
@@ -1,26 +1,34 @@
 # app.py
-import sys, os, io, ssl, time
+import sys, os, io, threading
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import BinaryIO, List, Tuple
 
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 import datetime as dt
 import streamlit as st
 from pytz import timezone
-from ssl import SSLEOFError
-from googleapiclient.http import MediaIoBaseUpload
-from googleapiclient.errors import HttpError
 from config.config import (
     sheet,
     dropdown_sheet,
     REGULAR_FOLDER_ID,
     KICKSTART_FOLDER_ID,
-    drive_service,
+    UPLOAD_CONCURRENCY,
+    INTAKE_DEDUP,
+    INTAKE_MAX_ACTIVE_UPLOADS,
+    INTAKE_SLOT_WAIT_SECONDS,
+    INTAKE_QUEUE_CACHE_SECONDS,
 )
 from utils.sheet_client import (
     get_client_list,
     get_employee_email_map,
     append_main_row_in_order,
 )
+from utils.drive_client import upload_stream_to_drive
+from utils.upload_dedup import stream_md5, get_md5_index
+from utils.trigger_client import notify_backend
+from backend.profiling import profiled
+from utils.admission import queue_status, admission_decision, format_eta, UploadSlots
 from utils.validators import is_valid_url
 
 st.set_page_config(
@@ -123,51 +131,119 @@ st.selectbox(
 st.text_input("✉️ Email ID", key="email_id", disabled=True)
 
 
-def robust_upload_to_drive_with_progress(
-    data: bytes, filename: str, parent_folder_id: str
-) -> str:
-    stream = io.BytesIO(data)
-    stream.seek(0)
-    file_metadata = {"name": filename, "parents": [parent_folder_id]}
-
-    media = MediaIoBaseUpload(
-        stream,
-        mimetype="application/octet-stream",
-        resumable=True,
-        chunksize=5 * 1024 * 1024,
+@st.cache_data(ttl=INTAKE_QUEUE_CACHE_SECONDS, show_spinner=False)
+def _cached_queue_status(_main_ws) -> dict:
+    return queue_status(_main_ws)
+
+
+@st.cache_resource
+def _upload_slots() -> UploadSlots:
+    return UploadSlots(INTAKE_MAX_ACTIVE_UPLOADS)
+
+
+try:
+    backlog = _cached_queue_status(sheet)
+except Exception:
+    backlog = None  # admission is advisory; never block intake on the probe
+
+decision = admission_decision(backlog) if backlog else "accept"
+if backlog:
+    backlog_msg = (
+        f"📬 Queue: {backlog['depth']} meeting(s) waiting · "
+        f"new submissions ready in {format_eta(backlog.get('eta_s'))}"
     )
+    if decision == "defer":
+        st.error(f"{backlog_msg}. The backlog is full — please submit again a bit later.")
+    elif decision == "warn":
+        st.warning(f"{backlog_msg}. The backlog is high, so expect a longer wait.")
+    else:
+        st.info(backlog_msg)
 
-    progress = st.progress(0, text=f"Starting upload for {filename}...")
-    retries = 5
 
-    for attempt in range(1, retries + 1):
+def _stream_size(f) -> int:
+    size = getattr(f, "size", None)
+    if size is None:
+        f.seek(0, io.SEEK_END)
+        size = f.tell()
+        f.seek(0)
+    return int(size)
+
+
+def _upload_or_reuse(
+    stream: BinaryIO, filename: str, parent_folder_id: str, size: int, on_progress, reused: List[str]
+) -> str:
+    """Reuse an identical file already in the folder (by MD5); otherwise upload it."""
+    with profiled("intake_upload", filename):
+        return _upload_or_reuse_inner(stream, filename, parent_folder_id, size, on_progress, reused)
+
+
+def _upload_or_reuse_inner(
+    stream: BinaryIO, filename: str, parent_folder_id: str, size: int, on_progress, reused: List[str]
+) -> str:
+    md5 = None
+    if INTAKE_DEDUP:
         try:
-            request = drive_service.files().create(
-                body=file_metadata,
-                media_body=media,
-                fields="id",
-                supportsAllDrives=True,
+            md5 = stream_md5(stream)
+            existing = get_md5_index().lookup(parent_folder_id, md5, size)
+            if existing:
+                on_progress(size)
+                reused.append(filename)
+                return existing
+        except Exception as e:
+            print(f"⚠️ Dedup lookup failed for {filename}, uploading instead: {e}")
+    file_id = upload_stream_to_drive(stream, filename, parent_folder_id, on_progress)
+    if md5:
+        get_md5_index().add(parent_folder_id, md5, file_id, size)
+    return file_id
+
+
+def upload_files_with_progress(
+    files: List[Tuple[BinaryIO, str]], parent_folder_id: str
+) -> List[str]:
+    """
+    Upload (stream, filename) pairs concurrently, streaming each one in chunks
+    from its file object, with one combined progress bar. Files already in the
+    folder (same MD5) are reused instead of re-uploaded. Returns file IDs in
+    input order. Peak extra memory ≈ UPLOAD_CONCURRENCY × UPLOAD_MAX_CHUNK_MB.
+    """
+    sizes = [_stream_size(stream) for stream, _ in files]
+    total = max(sum(sizes), 1)
+    sent = [0] * len(files)
+    reused: List[str] = []
+    lock = threading.Lock()
+
+    def _on_progress(i: int):
+        def _cb(done: int):
+            with lock:
+                sent[i] = min(done, sizes[i])
+        return _cb
+
+    progress = st.progress(0, text=f"Starting upload of {len(files)} file(s)...")
+    workers = max(1, min(UPLOAD_CONCURRENCY, len(files)))
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(
+                _upload_or_reuse, stream, filename, parent_folder_id, sizes[i], _on_progress(i), reused
+            )
+            for i, (stream, filename) in enumerate(files)
+        ]
+        pending = set(futures)
+        while pending:
+            _, pending = wait(pending, timeout=0.25)
+            with lock:
+                done_bytes = sum(sent)
+            percent = min(int(done_bytes * 100 / total), 100)
+            finished = len(futures) - len(pending)
+            progress.progress(
+                percent,
+                text=f"Uploading {len(files)} file(s)... {percent}% ({finished}/{len(files)} done)",
             )
+        file_ids = [f.result() for f in futures]
 
-            response = None
-            while response is None:
-                status, response = request.next_chunk()
-                if status:
-                    percent = int(status.progress() * 100)
-                    progress.progress(
-                        percent, text=f"Uploading {filename}... {percent}%"
-                    )
-            progress.progress(100, text=f"Upload complete ✅ ({filename})")
-            return response["id"]
-
-        except (HttpError, SSLEOFError, ssl.SSLError, ConnectionError) as e:
-            if attempt < retries:
-                wait = 2**attempt
-                progress.progress(0, text=f"Retrying in {wait}s due to error: {e}")
-                time.sleep(wait)
-                stream.seek(0)
-                continue
-            raise RuntimeError(f"❌ Upload failed after {retries} attempts: {e}")
+    progress.progress(100, text=f"Upload complete ✅ ({len(files)} file(s))")
+    if reused:
+        st.info(f"♻️ Already on Drive, reused without re-uploading: {', '.join(reused)}")
+    return file_ids
 
 
 with st.form("intake_form"):
@@ -207,31 +283,47 @@ if submitted:
         st.error("Please enter a valid Website Link.")
         st.stop()
 
-    ist = timezone("Asia/Kolkata")
-    timestamp = dt.datetime.now(ist).strftime("%Y-%m-%d %H:%M:%S")
-    meeting_date_str = meeting_date.strftime("%d-%m-%Y")
+    if decision == "defer":
+        st.error("⏳ The processing queue is full right now. Nothing was uploaded — please try again shortly.")
+        st.stop()
 
+    # Admission: only INTAKE_MAX_ACTIVE_UPLOADS submissions upload at once
+    slots = _upload_slots()
+    with st.spinner("Waiting for an upload slot..."):
+        got_slot = slots.acquire(timeout=INTAKE_SLOT_WAIT_SECONDS)
+    if not got_slot:
+        st.error("⏳ Too many uploads in progress. Nothing was uploaded — please try again shortly.")
+        st.stop()
+
+    slot_held = True
     try:
+        ist = timezone("Asia/Kolkata")
+        timestamp = dt.datetime.now(ist).strftime("%Y-%m-%d %H:%M:%S")
+        meeting_date_str = meeting_date.strftime("%d-%m-%Y")
+
         parent_folder = (
             REGULAR_FOLDER_ID
             if meeting_type.lower() == "regular"
             else KICKSTART_FOLDER_ID
         )
 
-        uploaded_links = []
+        safe_client_name = client_name.replace("/", "-").replace("\\", "-").strip()
+        uploads = []
         for idx, f in enumerate(audio_files, start=1):
-            file_bytes = f.read()
             # derive extension from each uploaded file
             ext = f.name.split(".")[-1]
-            safe_client_name = client_name.replace("/", "-").replace("\\", "-").strip()
             # Disambiguate filenames when multiple files are uploaded
             suffix = f"_{idx}" if len(audio_files) > 1 else ""
             filename = f"{safe_client_name}_{meeting_date_str}{suffix}.{ext}"
-
-            file_id = robust_upload_to_drive_with_progress(
-                file_bytes, filename, parent_folder
-            )
-            uploaded_links.append(f"https://drive.google.com/file/d/{file_id}/view")
+            uploads.append((f, filename))
+
+        file_ids = upload_files_with_progress(uploads, parent_folder)
+        # The slot only covers the upload; free it before the sheet append
+        slots.release()
+        slot_held = False
+        uploaded_links = [
+            f"https://drive.google.com/file/d/{file_id}/view" for file_id in file_ids
+        ]
 
         # Build the comma-separated string wrapped in parentheses: (link, link)
         meeting_audio_links_cell = f"{', '.join(uploaded_links)}"
@@ -251,7 +343,9 @@ if submitted:
             "",
             "Processing",
         ]
-        append_main_row_in_order(sheet, row)
+        row_idx = append_main_row_in_order(sheet, row)
+        notify_backend(row_idx)
+        _cached_queue_status.clear()
 
         st.markdown(
             """
@@ -314,4 +408,7 @@ if submitted:
             )
 
     except Exception as e:
-        st.error(f"Failed: {e}")
\ No newline at end of file
+        st.error(f"Failed: {e}")
+    finally:
+        if slot_held:
+            slots.release()
\ No newline at end of file
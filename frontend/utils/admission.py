@@ -0,0 +1,90 @@
+import threading
+from typing import Optional
+
+import requests
+
+from config.config import (
+    BACKEND_QUEUE_URL,
+    TRIGGER_TOKEN,
+    BACKEND_ROW_CONCURRENCY,
+    INTAKE_SOFT_BACKLOG,
+    INTAKE_MAX_BACKLOG,
+    INTAKE_AVG_ROW_MINUTES,
+)
+
+STATUS_COL = 13  # "Status" column in the Main tab (M)
+
+
+def queue_status(main_ws) -> dict:
+    """
+    Backlog as seen from intake: {"depth", "in_flight", "eta_s", "source"}.
+    Asks the backend's /queue endpoint first; falls back to counting
+    "Processing" rows in the sheet (one column read) with a static ETA.
+    """
+    if BACKEND_QUEUE_URL:
+        headers = {"X-Trigger-Token": TRIGGER_TOKEN} if TRIGGER_TOKEN else {}
+        try:
+            resp = requests.get(BACKEND_QUEUE_URL, headers=headers, timeout=2)
+            if resp.ok:
+                data = resp.json()
+                if "depth" in data:
+                    data["source"] = "backend"
+                    return data
+        except (requests.RequestException, ValueError):
+            pass
+
+    statuses = main_ws.col_values(STATUS_COL)[1:]
+    depth = sum(1 for s in statuses if (s or "").strip().lower() == "processing")
+    workers = max(1, BACKEND_ROW_CONCURRENCY)
+    return {
+        "depth": depth,
+        "in_flight": None,
+        "eta_s": (depth + 1) * INTAKE_AVG_ROW_MINUTES * 60 / workers,
+        "source": "sheet",
+    }
+
+
+def admission_decision(status: dict) -> str:
+    """"accept", "warn" (soft backlog exceeded) or "defer" (hard limit hit)."""
+    depth = int(status.get("depth") or 0)
+    if INTAKE_MAX_BACKLOG and depth >= INTAKE_MAX_BACKLOG:
+        return "defer"
+    if INTAKE_SOFT_BACKLOG and depth >= INTAKE_SOFT_BACKLOG:
+        return "warn"
+    return "accept"
+
+
+def format_eta(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "unknown"
+    minutes = int(round(seconds / 60))
+    if minutes < 1:
+        return "under a minute"
+    if minutes < 60:
+        return f"~{minutes} min"
+    return f"~{minutes // 60} h {minutes % 60:02d} min"
+
+
+class UploadSlots:
+    """
+    Process-wide cap on submissions uploading at once, shared by every
+    Streamlit session so a burst can't saturate Drive bandwidth.
+    """
+
+    def __init__(self, limit: int):
+        self.limit = max(1, limit)
+        self._sem = threading.BoundedSemaphore(self.limit)
+        self._lock = threading.Lock()
+        self.active = 0
+
+    def acquire(self, timeout: float) -> bool:
+        if not self._sem.acquire(timeout=timeout):
+            return False
+        with self._lock:
+            self.active += 1
+        return True
+
+    def release(self) -> None:
+        with self._lock:
+            self.active -= 1
+        self._sem.release()
@@ -1,10 +1,9 @@
-import io
-import ssl
-import time
-from googleapiclient.http import MediaIoBaseUpload
+from typing import BinaryIO, Callable, Optional
+
 from googleapiclient.errors import HttpError
-from ssl import SSLEOFError
-from config.config import drive_service
+from config.config import drive_service, UPLOAD_RETRIES
+from backend.telemetry import span
+from backend.upload_engine import upload_bytes, upload_stream
 
 
 def _assert_folder_accessible(folder_id: str) -> None:
@@ -19,54 +18,28 @@ def _assert_folder_accessible(folder_id: str) -> None:
         ) from e
 
 
-def upload_binary_to_drive(data: bytes, filename: str, parent_folder_id: str, retries: int = 5) -> str:
+def upload_binary_to_drive(data: bytes, filename: str, parent_folder_id: str, retries: int = UPLOAD_RETRIES) -> str:
     _assert_folder_accessible(parent_folder_id)
+    file_metadata = {"name": filename, "parents": [parent_folder_id]}
+    return upload_bytes(data, file_metadata, retries=retries)["id"]
 
-    stream = io.BytesIO(data)
-    stream.seek(0)
-
-    file_metadata = {
-        "name": filename,
-        "parents": [parent_folder_id],
-    }
-
-    media = MediaIoBaseUpload(
-        stream,
-        mimetype="application/octet-stream",
-        resumable=True,
-        chunksize=5 * 1024 * 1024,
-    )
 
-    for attempt in range(1, retries + 1):
-        try:
-            created = (
-                drive_service.files()
-                .create(
-                    body=file_metadata,
-                    media_body=media,
-                    fields="id",
-                    supportsAllDrives=True,
-                )
-                .execute()
-            )
-            return created["id"]
-        
-        except (HttpError, SSLEOFError, ssl.SSLError, ConnectionError) as e:
-            if attempt < retries:
-                wait = 2**attempt
-                print(f"⚠️ Upload failed (attempt {attempt}/{retries}): {e}")
-                print(f"⏳ Retrying in {wait} seconds...")
-                time.sleep(wait)
-                stream.seek(0)
-                
-                media = MediaIoBaseUpload(
-                    stream,
-                    mimetype="application/octet-stream",
-                    resumable=True,
-                    chunksize=5 * 1024 * 1024,
-                )
-                continue
-            raise RuntimeError(f"❌ Upload failed after {retries} attempts: {e}")
+def upload_stream_to_drive(
+    stream: BinaryIO,
+    filename: str,
+    parent_folder_id: str,
+    on_progress: Optional[Callable[[int], None]] = None,
+    retries: int = UPLOAD_RETRIES,
+) -> str:
+    """
+    Resumable upload straight from a seekable file object (e.g. Streamlit's
+    UploadedFile) — only one chunk is read into memory at a time.
+    Safe to call from worker threads; `on_progress` receives bytes committed so far.
+    """
+    file_metadata = {"name": filename, "parents": [parent_folder_id]}
+    with span("intake_upload", file=filename) as sp:
+        sp["bytes"] = getattr(stream, "size", None)
+        return upload_stream(stream, file_metadata, on_progress=on_progress, retries=retries)["id"]
 
 
 def ensure_file_web_link(file_id: str) -> str:
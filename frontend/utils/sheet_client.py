@@ -1,4 +1,7 @@
-from typing import Dict, List
+import re
+from typing import Dict, List, Optional
+
+_UPDATED_ROW_RE = re.compile(r"![A-Z]+(\d+)")
 
 
 def get_client_list(dropdown_ws) -> List[str]:
@@ -19,5 +22,9 @@ def get_employee_email_map(dropdown_ws) -> Dict[str, str]:
     return out
 
 
-def append_main_row_in_order(main_ws, row: List[str]) -> None:
-    main_ws.append_row(row, value_input_option="USER_ENTERED")
\ No newline at end of file
+def append_main_row_in_order(main_ws, row: List[str]) -> Optional[int]:
+    """Append the row; returns its 1-based sheet row number when reported."""
+    resp = main_ws.append_row(row, value_input_option="USER_ENTERED")
+    updated = ((resp or {}).get("updates") or {}).get("updatedRange", "")
+    m = _UPDATED_ROW_RE.search(updated)
+    return int(m.group(1)) if m else None
@@ -0,0 +1,20 @@
+import requests
+
+from config.config import BACKEND_TRIGGER_URL, TRIGGER_TOKEN
+
+
+def notify_backend(row_idx) -> bool:
+    """
+    Best-effort wake-up for the backend worker. Never raises: if the backend
+    is unreachable the row is still picked up by its reconciliation poll.
+    """
+    if not BACKEND_TRIGGER_URL:
+        return False
+    headers = {"X-Trigger-Token": TRIGGER_TOKEN} if TRIGGER_TOKEN else {}
+    try:
+        resp = requests.post(
+            BACKEND_TRIGGER_URL, json={"row": row_idx}, headers=headers, timeout=3
+        )
+        return resp.ok
+    except requests.RequestException:
+        return False
@@ -0,0 +1,127 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from typing import BinaryIO, Dict, Optional
+
+from googleapiclient.errors import HttpError
+
+from config.config import drive_service, INTAKE_MD5_INDEX_PATH, INTAKE_MD5_REFRESH_SECONDS
+
+HASH_CHUNK_BYTES = 1024 * 1024
+
+
+def stream_md5(stream: BinaryIO) -> str:
+    """MD5 of a seekable file object, read in 1 MB chunks; rewinds it afterwards."""
+    digest = hashlib.md5()
+    stream.seek(0)
+    for block in iter(lambda: stream.read(HASH_CHUNK_BYTES), b""):
+        digest.update(block)
+    stream.seek(0)
+    return digest.hexdigest()
+
+
+class DriveMd5Index:
+    """
+    md5Checksum -> file ID for each intake folder, persisted to a small JSON
+    file and refreshed incrementally: each refresh only lists files modified
+    since the newest `modifiedTime` already seen in that folder.
+    """
+
+    def __init__(self, path: str = INTAKE_MD5_INDEX_PATH, refresh_seconds: float = INTAKE_MD5_REFRESH_SECONDS):
+        self.path = path
+        self.refresh_seconds = refresh_seconds
+        self._lock = threading.Lock()
+        self._folders: Dict[str, dict] = {}  # folder -> {"since": str, "files": {md5: {id, size}}}
+        self._refreshed_at: Dict[str, float] = {}
+        self._load()
+
+    # persistence
+    def _load(self) -> None:
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._folders = json.load(f)
+        except (OSError, ValueError):
+            self._folders = {}
+
+    def _save(self) -> None:
+        if not self.path:
+            return
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._folders, f)
+        os.replace(tmp, self.path)
+
+    # refresh
+    def _refresh(self, folder_id: str) -> None:
+        entry = self._folders.setdefault(folder_id, {"since": "", "files": {}})
+        query = f"'{folder_id}' in parents and trashed = false"
+        if entry["since"]:
+            query += f" and modifiedTime >= '{entry['since']}'"
+        page_token = None
+        while True:
+            resp = drive_service.files().list(
+                q=query,
+                fields="nextPageToken, files(id, md5Checksum, size, modifiedTime)",
+                pageSize=1000,
+                pageToken=page_token,
+                supportsAllDrives=True,
+                includeItemsFromAllDrives=True,
+            ).execute()
+            for f in resp.get("files", []):
+                if f.get("md5Checksum"):
+                    entry["files"][f["md5Checksum"]] = {"id": f["id"], "size": int(f.get("size") or 0)}
+                entry["since"] = max(entry["since"], f.get("modifiedTime", ""))
+            page_token = resp.get("nextPageToken")
+            if not page_token:
+                break
+        self._refreshed_at[folder_id] = time.monotonic()
+        self._save()
+
+    def _still_there(self, file_id: str, md5: str) -> bool:
+        try:
+            meta = drive_service.files().get(
+                fileId=file_id, fields="id, md5Checksum, trashed", supportsAllDrives=True
+            ).execute()
+        except HttpError:
+            return False
+        return meta.get("md5Checksum") == md5 and not meta.get("trashed")
+
+    # public
+    def lookup(self, folder_id: str, md5: str, size: int) -> Optional[str]:
+        """File ID of an identical file already in `folder_id`, if any."""
+        with self._lock:
+            last = self._refreshed_at.get(folder_id)
+            if last is None or time.monotonic() - last >= self.refresh_seconds:
+                self._refresh(folder_id)
+            hit = self._folders.get(folder_id, {}).get("files", {}).get(md5)
+        if not hit or (size and hit.get("size") and hit["size"] != size):
+            return None
+        if self._still_there(hit["id"], md5):
+            return hit["id"]
+        with self._lock:
+            self._folders.get(folder_id, {}).get("files", {}).pop(md5, None)
+            self._save()
+        return None
+
+    def add(self, folder_id: str, md5: str, file_id: str, size: int) -> None:
+        """Record a fresh upload so an immediate resubmit hits without a refresh."""
+        with self._lock:
+            entry = self._folders.setdefault(folder_id, {"since": "", "files": {}})
+            entry["files"][md5] = {"id": file_id, "size": size}
+            self._save()
+
+
+_index: Optional[DriveMd5Index] = None
+_index_lock = threading.Lock()
+
+
+def get_md5_index() -> DriveMd5Index:
+    global _index
+    with _index_lock:
+        if _index is None:
+            _index = DriveMd5Index()
+        return _index